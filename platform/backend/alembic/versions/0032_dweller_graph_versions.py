@@ -0,0 +1,111 @@
+"""add per-world dweller graph versions and edge version stamps
+
+Adds platform_dweller_graph_versions (one counter per world) and stamps each
+platform_dweller_relationships row with its world_id and the graph version at
+which it last changed. Existing relationships are backfilled with the world of
+dweller_a and version 0.
+
+Revision ID: 0032
+Revises: 0031
+Create Date: 2026-03-02 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0032"
+down_revision: Union[str, None] = "0031"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    )
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": index_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not table_exists("platform_dweller_graph_versions"):
+        op.create_table(
+            "platform_dweller_graph_versions",
+            sa.Column("world_id", sa.UUID(), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+            sa.ForeignKeyConstraint(["world_id"], ["platform_worlds.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("world_id"),
+        )
+
+    table = "platform_dweller_relationships"
+    if not column_exists(table, "world_id"):
+        op.add_column(table, sa.Column("world_id", sa.UUID(), nullable=True))
+        op.create_foreign_key(
+            "fk_dweller_rel_world",
+            table,
+            "platform_worlds",
+            ["world_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+        op.execute(
+            """
+            UPDATE platform_dweller_relationships r
+            SET world_id = d.world_id
+            FROM platform_dwellers d
+            WHERE d.id = r.dweller_a_id AND r.world_id IS NULL
+            """
+        )
+    if not column_exists(table, "graph_version"):
+        op.add_column(table, sa.Column(
+            "graph_version", sa.BigInteger(), nullable=False, server_default="0"
+        ))
+    if not index_exists("idx_dweller_rel_world_version"):
+        op.create_index(
+            "idx_dweller_rel_world_version",
+            table,
+            ["world_id", "graph_version"],
+        )
+
+
+def downgrade() -> None:
+    table = "platform_dweller_relationships"
+    if index_exists("idx_dweller_rel_world_version"):
+        op.drop_index("idx_dweller_rel_world_version", table_name=table)
+    if column_exists(table, "graph_version"):
+        op.drop_column(table, "graph_version")
+    if column_exists(table, "world_id"):
+        op.drop_constraint("fk_dweller_rel_world", table, type_="foreignkey")
+        op.drop_column(table, "world_id")
+    if table_exists("platform_dweller_graph_versions"):
+        op.drop_table("platform_dweller_graph_versions")
@@ -0,0 +1,102 @@
+"""add story acclaim_rank and keyset indexes for story listings
+
+The engagement sort (acclaimed first, then reaction_count, created_at, id)
+previously ordered by a CASE over status with no supporting index. A stored
+generated acclaim_rank column makes the sort all-DESC so one composite index
+serves both the ORDER BY and the row-value keyset predicate.
+
+reaction_count is backfilled and made NOT NULL so row comparisons never see
+NULLs.
+
+Revision ID: 0033
+Revises: 0032
+Create Date: 2026-03-03 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0033"
+down_revision: Union[str, None] = "0032"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    )
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": index_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    table = "platform_stories"
+
+    op.execute("UPDATE platform_stories SET reaction_count = 0 WHERE reaction_count IS NULL")
+    op.alter_column(table, "reaction_count", nullable=False, server_default="0")
+
+    if not column_exists(table, "acclaim_rank"):
+        op.add_column(table, sa.Column(
+            "acclaim_rank",
+            sa.Integer(),
+            sa.Computed("CASE WHEN status = 'ACCLAIMED' THEN 1 ELSE 0 END", persisted=True),
+            nullable=False,
+        ))
+
+    if not index_exists("story_engagement_idx"):
+        op.create_index(
+            "story_engagement_idx",
+            table,
+            [
+                sa.text("acclaim_rank DESC"),
+                sa.text("reaction_count DESC"),
+                sa.text("created_at DESC"),
+                sa.text("id DESC"),
+            ],
+        )
+    if not index_exists("story_world_engagement_idx"):
+        op.create_index(
+            "story_world_engagement_idx",
+            table,
+            [
+                "world_id",
+                sa.text("acclaim_rank DESC"),
+                sa.text("reaction_count DESC"),
+                sa.text("created_at DESC"),
+                sa.text("id DESC"),
+            ],
+        )
+    if not index_exists("story_world_recent_idx"):
+        op.create_index(
+            "story_world_recent_idx",
+            table,
+            ["world_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        )
+
+
+def downgrade() -> None:
+    table = "platform_stories"
+    for index_name in ("story_world_recent_idx", "story_world_engagement_idx", "story_engagement_idx"):
+        if index_exists(index_name):
+            op.drop_index(index_name, table_name=table)
+    if column_exists(table, "acclaim_rank"):
+        op.drop_column(table, "acclaim_rank")
+    op.alter_column(table, "reaction_count", nullable=True)
@@ -0,0 +1,52 @@
+"""add reaction counter shards
+
+Holds pending reaction-count deltas when the sharded counter mode is enabled
+(REACTION_COUNTER_SHARDS > 0). Rows are folded into platform_worlds.reaction_counts
+and platform_stories.reaction_count by a background loop and then deleted.
+
+Revision ID: 0034
+Revises: 0033
+Create Date: 2026-03-04 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0034"
+down_revision: Union[str, None] = "0033"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not table_exists("platform_reaction_counter_shards"):
+        op.create_table(
+            "platform_reaction_counter_shards",
+            sa.Column("target_type", sa.String(20), nullable=False),
+            sa.Column("target_id", sa.UUID(), nullable=False),
+            sa.Column("reaction_type", sa.String(20), nullable=False),
+            sa.Column("shard", sa.Integer(), nullable=False),
+            sa.Column("delta", sa.Integer(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("target_type", "target_id", "reaction_type", "shard"),
+        )
+
+
+def downgrade() -> None:
+    if table_exists("platform_reaction_counter_shards"):
+        op.drop_table("platform_reaction_counter_shards")
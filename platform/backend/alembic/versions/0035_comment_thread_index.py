@@ -0,0 +1,45 @@
+"""add covering index for threaded comment listings
+
+GET /social/comments pages over a target's comments in (created_at, id)
+order, excluding deleted ones. The composite index lets that listing and its
+keyset predicate be served without a sort.
+
+Revision ID: 0035
+Revises: 0034
+Create Date: 2026-03-05 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0035"
+down_revision: Union[str, None] = "0034"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": index_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not index_exists("comment_target_thread_idx"):
+        op.create_index(
+            "comment_target_thread_idx",
+            "platform_comments",
+            ["target_type", "target_id", "is_deleted", "created_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    if index_exists("comment_target_thread_idx"):
+        op.drop_index("comment_target_thread_idx", table_name="platform_comments")
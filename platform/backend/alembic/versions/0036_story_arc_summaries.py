@@ -0,0 +1,52 @@
+"""persist story arc summaries
+
+Arc summaries were generated with an LLM call while serving GET /arcs and
+cached per process. They are now stored on platform_story_arcs and refreshed
+by a background job; summary_source fingerprints the first and latest story
+the summary was written from.
+
+Revision ID: 0036
+Revises: 0035
+Create Date: 2026-03-06 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0036"
+down_revision: Union[str, None] = "0035"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    table = "platform_story_arcs"
+    if not column_exists(table, "summary"):
+        op.add_column(table, sa.Column("summary", sa.Text(), nullable=True))
+    if not column_exists(table, "summary_source"):
+        op.add_column(table, sa.Column("summary_source", sa.String(64), nullable=True))
+    if not column_exists(table, "summary_updated_at"):
+        op.add_column(table, sa.Column("summary_updated_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    table = "platform_story_arcs"
+    for column in ("summary_updated_at", "summary_source", "summary"):
+        if column_exists(table, column):
+            op.drop_column(table, column)
@@ -0,0 +1,93 @@
+"""add approximate nearest-neighbour indexes on embedding columns
+
+Similarity checks (find_similar_proposals / find_similar_worlds, aspect
+duplicate detection, proposal search, arc assignment) did sequential cosine
+scans. This adds pgvector ANN indexes with cosine ops on:
+
+    platform_proposals.premise_embedding
+    platform_worlds.premise_embedding
+    platform_aspects.premise_embedding
+    platform_stories.content_embedding
+
+Build parameters are read from the environment at migration time:
+
+    VECTOR_INDEX_TYPE          hnsw (default) or ivfflat
+    VECTOR_HNSW_M              HNSW graph degree (default 16)
+    VECTOR_HNSW_EF_CONSTRUCTION  HNSW build candidate list (default 64)
+    VECTOR_IVFFLAT_LISTS       IVFFlat list count (default 100)
+
+Search-time parameters (hnsw.ef_search / ivfflat.probes) are set per query by
+utils.embeddings.set_vector_search_params. Skipped if pgvector is unavailable.
+
+Revision ID: 0037
+Revises: 0036
+Create Date: 2026-03-07 12:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0037"
+down_revision: Union[str, None] = "0036"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_INDEXES = [
+    ("idx_proposals_premise_embedding_ann", "platform_proposals", "premise_embedding"),
+    ("idx_worlds_premise_embedding_ann", "platform_worlds", "premise_embedding"),
+    ("idx_aspects_premise_embedding_ann", "platform_aspects", "premise_embedding"),
+    ("idx_stories_content_embedding_ann", "platform_stories", "content_embedding"),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    )
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": index_name},
+    )
+    return result.fetchone() is not None
+
+
+def _index_method() -> str:
+    index_type = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()
+    if index_type == "ivfflat":
+        lists = int(os.getenv("VECTOR_IVFFLAT_LISTS", "100"))
+        return f"ivfflat ({{column}} vector_cosine_ops) WITH (lists = {lists})"
+    m = int(os.getenv("VECTOR_HNSW_M", "16"))
+    ef_construction = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+    return f"hnsw ({{column}} vector_cosine_ops) WITH (m = {m}, ef_construction = {ef_construction})"
+
+
+def upgrade() -> None:
+    method = _index_method()
+    for index_name, table, column in VECTOR_INDEXES:
+        if not column_exists(table, column) or index_exists(index_name):
+            continue
+        op.execute(
+            f"CREATE INDEX {index_name} ON {table} USING {method.format(column=column)}"
+        )
+
+
+def downgrade() -> None:
+    for index_name, _, _ in VECTOR_INDEXES:
+        if index_exists(index_name):
+            op.execute(f"DROP INDEX {index_name}")
@@ -0,0 +1,52 @@
+"""add persistent embedding cache
+
+Stores text embeddings keyed by sha256(model + text) so repeated inputs —
+agent discovery queries, re-submitted proposals, backfills — are served
+without calling the embedding API. Read through an in-process LRU in
+utils.embeddings.
+
+Revision ID: 0038
+Revises: 0037
+Create Date: 2026-03-08 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0038"
+down_revision: Union[str, None] = "0037"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not table_exists("platform_embedding_cache"):
+        op.create_table(
+            "platform_embedding_cache",
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            sa.Column("model", sa.String(64), nullable=False),
+            sa.Column("embedding", sa.ARRAY(sa.Float()), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.PrimaryKeyConstraint("content_hash"),
+        )
+
+
+def downgrade() -> None:
+    if table_exists("platform_embedding_cache"):
+        op.drop_table("platform_embedding_cache")
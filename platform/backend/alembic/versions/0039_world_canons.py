@@ -0,0 +1,55 @@
+"""add materialized world canon documents
+
+One row per world holding the serialized canon (world fields + approved
+aspects) served by GET /aspects/worlds/{world_id}/canon and the world_canon
+block of dweller state/context. Rebuilt when canon changes; version feeds the
+ETag. Rows are created lazily on first read.
+
+Revision ID: 0039
+Revises: 0038
+Create Date: 2026-03-09 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0039"
+down_revision: Union[str, None] = "0038"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not table_exists("platform_world_canons"):
+        op.create_table(
+            "platform_world_canons",
+            sa.Column("world_id", sa.UUID(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+            sa.Column("document", postgresql.JSONB(), nullable=False),
+            sa.Column("source_fingerprint", sa.String(32), nullable=False),
+            sa.Column("built_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.ForeignKeyConstraint(["world_id"], ["platform_worlds.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("world_id"),
+        )
+
+
+def downgrade() -> None:
+    if table_exists("platform_world_canons"):
+        op.drop_table("platform_world_canons")
@@ -0,0 +1,146 @@
+"""partition platform_feed_events by month with a composite keyset index
+
+The feed pages on (created_at, id) DESC, but the table only had single-column
+indexes and grew without bound. This rebuilds it as a RANGE (created_at)
+partitioned table:
+
+- primary key (id, created_at), as partitioned tables require
+- feed_events_created_at_id_idx on (created_at DESC, id DESC), replacing
+  feed_events_created_at_idx
+- one partition per month from the oldest existing row through two months
+  ahead, plus a DEFAULT partition for anything outside those ranges
+
+Existing rows are copied over and the old table is dropped. Later partitions
+and retention are handled at runtime by utils.feed_partitions.
+
+Revision ID: 0040
+Revises: 0039
+Create Date: 2026-03-10 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0040"
+down_revision: Union[str, None] = "0039"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "platform_feed_events"
+LEGACY = "platform_feed_events_legacy"
+MONTHS_AHEAD = 2
+
+COLUMNS = "id, event_type, created_at, payload, world_id, agent_id, dweller_id, story_id"
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table AND table_schema = 'public'"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def is_partitioned(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_table(partitioned: bool) -> None:
+    op.execute(f"""
+        CREATE TABLE {TABLE} (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            event_type TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            payload JSONB NOT NULL,
+            world_id UUID REFERENCES platform_worlds(id) ON DELETE CASCADE,
+            agent_id UUID REFERENCES platform_users(id) ON DELETE SET NULL,
+            dweller_id UUID REFERENCES platform_dwellers(id) ON DELETE CASCADE,
+            story_id UUID REFERENCES platform_stories(id) ON DELETE CASCADE,
+            PRIMARY KEY ({"id, created_at" if partitioned else "id"})
+        ){" PARTITION BY RANGE (created_at)" if partitioned else ""}
+    """)
+
+
+def _create_indexes(keyset: bool) -> None:
+    if keyset:
+        op.execute(f"CREATE INDEX feed_events_created_at_id_idx ON {TABLE} (created_at DESC, id DESC)")
+    else:
+        op.execute(f"CREATE INDEX feed_events_created_at_idx ON {TABLE} (created_at DESC)")
+    op.execute(f"CREATE INDEX feed_events_event_type_idx ON {TABLE} (event_type)")
+    op.execute(
+        f"CREATE INDEX feed_events_world_id_idx ON {TABLE} (world_id) WHERE world_id IS NOT NULL"
+    )
+
+
+def _move_aside() -> None:
+    """Rename the current table out of the way, freeing its index names."""
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+    op.execute(f"ALTER TABLE {LEGACY} RENAME CONSTRAINT {TABLE}_pkey TO {LEGACY}_pkey")
+    for index in (
+        "feed_events_created_at_idx",
+        "feed_events_created_at_id_idx",
+        "feed_events_event_type_idx",
+        "feed_events_world_id_idx",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def upgrade() -> None:
+    if not table_exists(TABLE) or is_partitioned(TABLE):
+        return
+
+    _move_aside()
+    _create_table(partitioned=True)
+    _create_indexes(keyset=True)
+
+    conn = op.get_bind()
+    oldest = conn.execute(sa.text(f"SELECT min(created_at) FROM {LEGACY}")).scalar()
+    now = datetime.now(timezone.utc)
+    month = _add_months(oldest or now, 0)
+    last = _add_months(now, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY}")
+    op.execute(f"DROP TABLE {LEGACY}")
+
+
+def downgrade() -> None:
+    if not table_exists(TABLE) or not is_partitioned(TABLE):
+        return
+
+    _move_aside()
+    _create_table(partitioned=False)
+    _create_indexes(keyset=False)
+    # Only attached partitions come back; archived ones stay as they are
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY}")
+    op.execute(f"DROP TABLE {LEGACY} CASCADE")
@@ -0,0 +1,88 @@
+"""add materialized per-agent activity counters
+
+One row per user in platform_agent_stats, incremented by the write paths
+(utils.agent_stats) and periodically reconciled, so heartbeat completion
+tracking, nudges and agent listings read one row instead of counting each
+table. Backfilled here from the source tables.
+
+Revision ID: 0041
+Revises: 0040
+Create Date: 2026-03-11 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0041"
+down_revision: Union[str, None] = "0040"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counter column -> count per user (u.id) from the source tables
+COUNTERS = {
+    "stories_written": "SELECT count(*) FROM platform_stories s WHERE s.author_id = u.id",
+    "stories_reviewed": "SELECT count(*) FROM platform_story_reviews r WHERE r.reviewer_id = u.id",
+    "proposals_validated": "SELECT count(*) FROM platform_validations v WHERE v.agent_id = u.id",
+    "aspects_validated": "SELECT count(*) FROM platform_aspect_validations v WHERE v.agent_id = u.id",
+    "dwellers_created": "SELECT count(*) FROM platform_dwellers d WHERE d.created_by = u.id",
+    "actions_taken": "SELECT count(*) FROM platform_dweller_actions a WHERE a.actor_id = u.id",
+    "worlds_proposed": "SELECT count(*) FROM platform_proposals p WHERE p.agent_id = u.id",
+    "aspects_proposed": "SELECT count(*) FROM platform_aspects a WHERE a.agent_id = u.id",
+    "events_proposed": "SELECT count(*) FROM platform_world_events e WHERE e.proposed_by = u.id",
+    "unresponded_reviews": (
+        "SELECT count(*) FROM platform_story_reviews r "
+        "JOIN platform_stories s ON s.id = r.story_id "
+        "WHERE s.author_id = u.id AND r.author_responded = false"
+    ),
+    "worlds_created": (
+        "SELECT count(*) FROM platform_proposals p "
+        "WHERE p.agent_id = u.id AND p.status = 'APPROVED'"
+    ),
+    "dwellers_inhabited": "SELECT count(*) FROM platform_dwellers d WHERE d.inhabited_by = u.id",
+}
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table"
+        ),
+        {"table": table_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if table_exists("platform_agent_stats"):
+        return
+
+    op.create_table(
+        "platform_agent_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        *(
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+            for column in COUNTERS
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["platform_users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    columns = ", ".join(COUNTERS)
+    counts = ", ".join(f"({query})" for query in COUNTERS.values())
+    op.execute(
+        f"INSERT INTO platform_agent_stats (user_id, {columns}) "
+        f"SELECT u.id, {counts} FROM platform_users u"
+    )
+
+
+def downgrade() -> None:
+    if table_exists("platform_agent_stats"):
+        op.drop_table("platform_agent_stats")
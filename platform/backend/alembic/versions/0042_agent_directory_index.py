@@ -0,0 +1,44 @@
+"""add keyset index for the agent directory
+
+GET /agents pages agents by (coalesce(last_active_at, created_at), id)
+descending with a cursor instead of OFFSET. The partial expression index
+over agent rows serves that order and the keyset predicate without a sort.
+
+Revision ID: 0042
+Revises: 0041
+Create Date: 2026-03-12 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0042"
+down_revision: Union[str, None] = "0041"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+        {"name": index_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not index_exists("user_agent_activity_idx"):
+        op.execute(
+            "CREATE INDEX user_agent_activity_idx ON platform_users "
+            "(coalesce(last_active_at, created_at) DESC, id DESC) WHERE type = 'AGENT'"
+        )
+
+
+def downgrade() -> None:
+    if index_exists("user_agent_activity_idx"):
+        op.drop_index("user_agent_activity_idx", table_name="platform_users")
@@ -0,0 +1,55 @@
+"""store idempotent middleware responses as compressed bytes
+
+IdempotencyMiddleware used to re-parse every response body as JSON to store
+it in response_body and re-serialize it on replay. It now stores the body
+bytes zlib-compressed in response_blob, with the original content type, and
+replays them unchanged. response_body stays for the actions endpoints and
+for rows written before this revision.
+
+Revision ID: 0043
+Revises: 0042
+Create Date: 2026-03-13 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0043"
+down_revision: Union[str, None] = "0042"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "platform_idempotency_keys"
+COLUMNS = [
+    ("response_blob", sa.LargeBinary()),
+    ("response_content_type", sa.String(255)),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    for name, type_ in COLUMNS:
+        if not column_exists(TABLE, name):
+            op.add_column(TABLE, sa.Column(name, type_, nullable=True))
+
+
+def downgrade() -> None:
+    for name, _ in reversed(COLUMNS):
+        if column_exists(TABLE, name):
+            op.drop_column(TABLE, name)
@@ -14,12 +14,10 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import exists, or_, select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from utils.deterministic import deterministic_uuid4
 from db import (
     get_db,
     User,
@@ -27,7 +25,6 @@ from db import (
     Dweller,
     World,
     WorldEvent,
-    WorldEventPropagation,
     ActionCompositionQueue,
     IdempotencyKey,
 )
@@ -39,11 +36,14 @@ from services.action_resilience import (
     create_action_record,
     get_recent_idempotency_record,
     parse_stored_idempotency_response,
-    prune_expired_idempotency_keys,
 )
+from services.action_queue_worker import ACTION_QUEUE_CHANNEL
 from .auth import get_current_user
+from utils.agent_stats import bump_agent_stats
 from utils.deployment import get_forced_deployment_status, get_retry_after_seconds
+from utils.event_propagation import propagate_world_event
 from utils.notifications import create_notification
+from utils.pg_listen import notify
 from schemas.actions import (
     GetActionResponse,
     ConfirmImportanceResponse,
@@ -262,6 +262,8 @@ async def compose_action(
         next_attempt_at=utc_now(),
     )
     db.add(queue_item)
+    # Wakes the queue worker once this commits
+    await notify(db, ACTION_QUEUE_CHANNEL)
 
     try:
         await db.commit()
@@ -323,8 +325,6 @@ async def submit_action(
     if key is not None:
         _validate_idempotency_key(key)
 
-    await prune_expired_idempotency_keys(db)
-
     idempotency_record: IdempotencyKey | None = None
     if key is not None:
         existing_any_endpoint = await db.get(IdempotencyKey, key)
@@ -673,6 +673,7 @@ async def escalate_to_event(
     )
     db.add(event)
     await db.flush()
+    await bump_agent_stats(db, current_user.id, events_proposed=1)
     action.escalation_status = "accepted"
 
     # Note: The action-to-event link is stored via WorldEvent.origin_action_id
@@ -697,35 +698,15 @@ async def escalate_to_event(
             },
         )
 
-    # Propagate world event to all dwellers' core memories inline (same transaction)
-    dwellers_result = await db.execute(
-        select(Dweller)
-        .where(Dweller.world_id == event.world_id)
-        .order_by(Dweller.created_at.asc(), Dweller.id.asc())
+    # Propagate world event to all dwellers' core memories inline (same
+    # transaction), as one set-based statement
+    await propagate_world_event(
+        db,
+        event_id=event.id,
+        world_id=event.world_id,
+        fact_text=_format_world_event_core_memory(event),
+        propagated_at=utc_now(),
     )
-    propagation_dwellers = dwellers_result.scalars().all()
-    fact_text = _format_world_event_core_memory(event)
-    propagated_at = utc_now()
-
-    for dw in propagation_dwellers:
-        propagation_stmt = (
-            pg_insert(WorldEventPropagation.__table__)
-            .values(
-                id=deterministic_uuid4(),
-                world_event_id=event.id,
-                dweller_id=dw.id,
-                propagated_at=propagated_at,
-            )
-            .on_conflict_do_nothing(index_elements=["world_event_id", "dweller_id"])
-            .returning(WorldEventPropagation.id)
-        )
-        inserted_id = (await db.execute(propagation_stmt)).scalar_one_or_none()
-        if inserted_id is None:
-            continue
-        core_memories = list(dw.core_memories or [])
-        if fact_text not in core_memories:
-            core_memories.append(fact_text)
-            dw.core_memories = core_memories
 
     await db.commit()
     await db.refresh(event)
@@ -1,10 +1,11 @@
 """Admin-only endpoints."""
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db import GuidanceComplianceSignal, Story, StoryWritingGuidance, User, get_db
 from utils.clock import now as utc_now
 from utils.errors import agent_error
+from utils.profiling import (
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_SECONDS,
+    SamplingProfiler,
+    get_profile,
+    list_profiles,
+    loop_watchdog_metrics,
+    profile_for,
+    profiling_window_busy,
+)
 
 from .auth import get_admin_user, get_current_user
 
@@ -284,3 +295,79 @@ async def get_story_writing_guidance_analytics(
         "least_followed_rule": least_followed_rule,
         "most_impactful_rule": most_impactful_rule,
     }
+
+
+def _profile_download(profiler: SamplingProfiler, fmt: str) -> Response:
+    """A profile as a file: speedscope JSON, or collapsed stacks for flamegraph.pl."""
+    filename = f"profile-{profiler.id[:12]}"
+    if fmt == "collapsed":
+        return PlainTextResponse(
+            profiler.collapsed(),
+            headers={"Content-Disposition": f'attachment; filename="{filename}.collapsed.txt"'},
+        )
+    return JSONResponse(
+        profiler.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'},
+    )
+
+
+@router.post("/profiling/profile", responses={200: {"description": "Sampled profile of the event loop"}})
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1, le=100),
+    format: Literal["speedscope", "collapsed"] = Query("speedscope"),
+    _admin: User = Depends(get_admin_user),
+) -> Response:
+    """Sample the event loop of this process for `seconds` and return the profile.
+
+    Open speedscope files at https://www.speedscope.app; collapsed stacks feed
+    flamegraph.pl. Only one timed profile runs per process at a time.
+    """
+    if profiling_window_busy():
+        raise HTTPException(
+            status_code=409,
+            detail=agent_error(
+                error="A profile is already being recorded",
+                how_to_fix="Wait for the running profile to finish, then retry.",
+            ),
+        )
+    profiler = await profile_for(seconds, interval_ms=interval_ms)
+    return _profile_download(profiler, format)
+
+
+@router.get("/profiling/profiles", responses={200: {"description": "Recent profiles"}})
+async def list_recorded_profiles(
+    _admin: User = Depends(get_admin_user),
+) -> dict[str, Any]:
+    """Profiles kept in this process: timed loop profiles and X-Profile requests."""
+    return {"profiles": list_profiles()}
+
+
+@router.get("/profiling/profiles/{profile_id}", responses={200: {"description": "Recorded profile"}})
+async def download_profile(
+    profile_id: str,
+    format: Literal["speedscope", "collapsed"] = Query("speedscope"),
+    _admin: User = Depends(get_admin_user),
+) -> Response:
+    """Download a recorded profile (e.g. the X-Profile-Id of a profiled request)."""
+    profiler = get_profile(profile_id)
+    if profiler is None:
+        raise HTTPException(
+            status_code=404,
+            detail=agent_error(
+                error="Profile not found",
+                how_to_fix=(
+                    "Profiles live in the memory of the instance that recorded them, and only "
+                    "the most recent are kept. List them via GET /api/admin/profiling/profiles."
+                ),
+            ),
+        )
+    return _profile_download(profiler, format)
+
+
+@router.get("/profiling/loop", responses={200: {"description": "Event-loop lag and recent stalls"}})
+async def get_event_loop_stalls(
+    _admin: User = Depends(get_admin_user),
+) -> dict[str, Any]:
+    """Loop watchdog report: lag percentiles and the stacks of recent blocking callbacks."""
+    return {"watchdog": loop_watchdog_metrics(include_stacks=True)}
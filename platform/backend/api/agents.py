@@ -6,69 +6,84 @@ This module provides public visibility into agent activity and contributions.
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db, User, UserType, Proposal, Validation, Aspect, AspectValidation, Dweller
-from db.models import ProposalStatus, AspectStatus, ValidationVerdict
+from db import get_db, AgentStats, User, UserType, Proposal, Validation, Aspect, AspectValidation, Dweller
+from db.models import AspectStatus, ValidationVerdict
 from schemas.agents import AgentListResponse, AgentProfileResponse
+from utils.agent_stats import get_agent_stats, get_agent_stats_many
+from utils.keyset import decode_cursor, encode_cursor, parse_timestamp
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
+# Public directory responses may be cached briefly by clients and CDNs
+AGENT_DIRECTORY_CACHE_SECONDS = 30
+# Directory stat -> platform_agent_stats column
+AGENT_DIRECTORY_STATS = {
+    "proposals": "worlds_proposed",
+    "worlds_created": "worlds_created",
+    "validations": "proposals_validated",
+    "dwellers": "dwellers_inhabited",
+}
+
 
 @router.get("", response_model=AgentListResponse)
 async def list_agents(
-    limit: int = 20,
-    offset: int = 0,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    offset: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """
     List all registered agents.
 
-    Returns agents ordered by most recently active.
+    Returns agents ordered by most recently active (signup time for agents
+    that haven't acted yet). Page with next_cursor. Contribution counts come
+    from the materialized per-agent stats, so a page is one query however
+    many agents it holds.
     """
-    # Count total agents
-    total_query = select(func.count(User.id)).where(User.type == UserType.AGENT)
-    total = await db.scalar(total_query) or 0
+    total = await db.scalar(select(func.count(User.id)).where(User.type == UserType.AGENT)) or 0
 
-    # Get agents
+    # Last activity, or signup for agents that never acted (user_agent_activity_idx)
+    activity = func.coalesce(User.last_active_at, User.created_at)
     query = (
-        select(User)
+        select(User, activity.label("activity"), *(
+            AgentStats.__table__.c[column] for column in AGENT_DIRECTORY_STATS.values()
+        ))
+        .outerjoin(AgentStats, AgentStats.user_id == User.id)
         .where(User.type == UserType.AGENT)
-        .order_by(User.last_active_at.desc().nullslast(), User.created_at.desc(), User.id.desc())
-        .offset(offset)
-        .limit(limit)
     )
-    result = await db.execute(query)
-    agents = result.scalars().all()
-
-    # Get contribution counts for each agent
-    agent_data = []
-    for agent in agents:
-        # Quick count of proposals
-        proposals_count = await db.scalar(
-            select(func.count(Proposal.id)).where(Proposal.agent_id == agent.id)
-        ) or 0
-
-        # Quick count of approved proposals (worlds created)
-        worlds_count = await db.scalar(
-            select(func.count(Proposal.id)).where(
-                Proposal.agent_id == agent.id,
-                Proposal.status == ProposalStatus.APPROVED
+    if cursor:
+        values = decode_cursor(cursor, parse_timestamp, UUID)
+        if values is None:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "Invalid pagination cursor",
+                    "cursor": cursor,
+                    "how_to_fix": "Pass the next_cursor value from the previous response unchanged, or omit cursor for the first page.",
+                },
             )
-        ) or 0
+        query = query.where(tuple_(activity, User.id) < tuple_(*values))
+    elif offset:
+        query = query.offset(offset)
+    rows = (await db.execute(query.order_by(activity.desc(), User.id.desc()).limit(limit + 1))).all()
 
-        # Quick count of validations
-        validations_count = await db.scalar(
-            select(func.count(Validation.id)).where(Validation.agent_id == agent.id)
-        ) or 0
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].activity, rows[-1].User.id) if has_more else None
 
-        # Quick count of dwellers inhabited
-        dwellers_count = await db.scalar(
-            select(func.count(Dweller.id)).where(Dweller.inhabited_by == agent.id)
-        ) or 0
+    # Agents without a stats row yet get one computed now
+    missing = [row.User.id for row in rows if row.worlds_proposed is None]
+    computed = await get_agent_stats_many(db, missing) if missing else {}
 
+    agent_data = []
+    for row in rows:
+        agent = row.User
+        stats = computed.get(agent.id) or row._mapping
         agent_data.append({
             "id": str(agent.id),
             "username": f"@{agent.username}",
@@ -76,18 +91,15 @@ async def list_agents(
             "avatar_url": agent.avatar_url,
             "created_at": agent.created_at.isoformat(),
             "last_active_at": agent.last_active_at.isoformat() if agent.last_active_at else None,
-            "stats": {
-                "proposals": proposals_count,
-                "worlds_created": worlds_count,
-                "validations": validations_count,
-                "dwellers": dwellers_count,
-            }
+            "stats": {key: stats[column] or 0 for key, column in AGENT_DIRECTORY_STATS.items()},
         })
 
+    response.headers["Cache-Control"] = f"public, max-age={AGENT_DIRECTORY_CACHE_SECONDS}"
     return {
         "agents": agent_data,
         "total": total,
-        "has_more": offset + limit < total,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
     }
 
 
@@ -193,11 +205,7 @@ async def get_agent_profile(
     recent_aspects = recent_aspects_result.scalars().all()
 
     # Count dwellers currently inhabited
-    dwellers_inhabited_query = select(func.count(Dweller.id)).where(
-        Dweller.inhabited_by == agent_id
-    )
-    dwellers_inhabited_result = await db.execute(dwellers_inhabited_query)
-    dwellers_inhabited = dwellers_inhabited_result.scalar() or 0
+    dwellers_inhabited = (await get_agent_stats(db, agent_id))["dwellers_inhabited"]
 
     # Get list of inhabited dwellers
     inhabited_dwellers_query = (
@@ -25,7 +25,8 @@ import os
 from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
 
 # Test mode allows self-validation - disable in production
 TEST_MODE_ENABLED = os.getenv("DSF_TEST_MODE_ENABLED", "false").lower() == "true"
@@ -38,9 +39,11 @@ from sqlalchemy.orm import selectinload
 from db import get_db, User, World, Aspect, AspectValidation, DwellerAction, Dweller
 from db.models import AspectStatus, ValidationVerdict
 from .auth import get_current_user
+from utils.agent_stats import bump_agent_stats
 from utils.dedup import check_recent_duplicate
 from utils.notifications import notify_aspect_validated
 from utils.simulation import buggify, buggify_delay
+from utils.world_canon import get_world_canon_entry, rebuild_world_canon
 from guidance import (
     make_guidance_response,
     TIMEOUT_HIGH_IMPACT,
@@ -364,6 +367,7 @@ async def create_aspect(
         status=AspectStatus.DRAFT,
     )
     db.add(aspect)
+    await bump_agent_stats(db, current_user.id, aspects_proposed=1)
     await db.commit()
     await db.refresh(aspect)
 
@@ -459,6 +463,7 @@ async def submit_aspect(
     try:
         from utils.embeddings import (
             generate_embedding,
+            nearest_neighbours,
             SIMILARITY_THRESHOLD_GLOBAL,
         )
         from sqlalchemy import text
@@ -471,28 +476,17 @@ async def submit_aspect(
         # Only check for similar aspects if not forcing
         if not force:
             # Check for similar approved aspects in this world
-            result = await db.execute(
-                text("""
-                    SELECT
-                        a.id, a.title, a.premise, a.aspect_type,
-                        1 - (a.premise_embedding <=> CAST(:embedding AS vector)) as similarity
-                    FROM platform_aspects a
-                    WHERE a.world_id = :world_id
-                    AND a.status = 'approved'
-                    AND a.premise_embedding IS NOT NULL
-                    AND a.id != :aspect_id
-                    AND 1 - (a.premise_embedding <=> CAST(:embedding AS vector)) > :threshold
-                    ORDER BY similarity DESC
-                    LIMIT 5
-                """),
-                {
-                    "embedding": str(embedding),
-                    "world_id": str(aspect.world_id),
-                    "aspect_id": str(aspect_id),
-                    "threshold": SIMILARITY_THRESHOLD_GLOBAL,
-                }
+            rows = await nearest_neighbours(
+                db,
+                table="platform_aspects",
+                column="premise_embedding",
+                select_columns="id, title, premise, aspect_type",
+                embedding=embedding,
+                threshold=SIMILARITY_THRESHOLD_GLOBAL,
+                limit=5,
+                where="world_id = :world_id AND status = 'APPROVED' AND id != :aspect_id",
+                params={"world_id": str(aspect.world_id), "aspect_id": str(aspect_id)},
             )
-            rows = result.fetchall()
 
             if rows:
                 similar_aspects = [
@@ -501,7 +495,7 @@ async def submit_aspect(
                         "title": row.title,
                         "premise": row.premise[:200] + "..." if len(row.premise) > 200 else row.premise,
                         "type": row.aspect_type,
-                        "similarity": round(row.similarity, 3),
+                        "similarity": round(1 - row.distance, 3),
                     }
                     for row in rows
                 ]
@@ -953,6 +947,7 @@ async def test_approve_aspect(
         updated_canon_summary=request.updated_canon_summary,
     )
     db.add(validation)
+    await bump_agent_stats(db, current_user.id, aspects_validated=1)
 
     response_data: dict[str, Any] = {
         "aspect_id": str(aspect_id),
@@ -992,6 +987,8 @@ async def test_approve_aspect(
                     "timeline_updated": False,
                 }
 
+        await rebuild_world_canon(db, aspect.world_id)
+
         # Notify aspect owner
         try:
             await notify_aspect_validated(db, aspect, validation)
@@ -1010,8 +1007,9 @@ async def test_approve_aspect(
 @router.get("/worlds/{world_id}/canon", response_model=WorldCanonResponse)
 async def get_world_canon(
     world_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> dict[str, Any]:
+) -> Response:
     """
     Get the full canon for a world.
 
@@ -1038,41 +1036,22 @@ async def get_world_canon(
 
     FOR DWELLERS: This is your reality. You live in the canon_summary, not
     alongside it. You cannot contradict the causal_chain or scientific_basis.
-    """
-    world = await db.get(World, world_id)
 
-    if not world:
+    CACHING: The canon is precomputed and only changes when aspects or events
+    are approved. The response carries an ETag (and `version`); send it back
+    as `If-None-Match` to get a 304 when nothing changed.
+    """
+    canon = await get_world_canon_entry(db, world_id)
+    if canon is None:
         raise HTTPException(status_code=404, detail="World not found")
 
-    # Get approved aspects
-    aspects_query = select(Aspect).where(
-        Aspect.world_id == world_id,
-        Aspect.status == AspectStatus.APPROVED,
-    ).order_by(Aspect.created_at, Aspect.id)
-    aspects_result = await db.execute(aspects_query)
-    aspects = aspects_result.scalars().all()
-
-    return {
-        "world_id": str(world_id),
-        "name": world.name,
-        "year_setting": world.year_setting,
-        # The summary - maintained by integrators
-        "canon_summary": world.canon_summary or world.premise,
-        # Original foundation
-        "premise": world.premise,
-        "causal_chain": world.causal_chain,
-        "scientific_basis": world.scientific_basis,
-        # Structural elements
-        "regions": world.regions,
-        # All integrated aspects
-        "approved_aspects": [
-            {
-                "id": str(a.id),
-                "type": a.aspect_type,
-                "title": a.title,
-                "premise": a.premise,
-                "content": a.content,
-            }
-            for a in aspects
-        ],
-    }
+    headers = {"ETag": canon.etag, "X-Canon-Version": str(canon.version), "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == canon.etag:
+        return Response(status_code=304, headers=headers)
+    if canon.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=canon.gzip_body,
+            media_type="application/json",
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+    return Response(content=canon.body, media_type="application/json", headers=headers)
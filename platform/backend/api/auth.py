@@ -266,6 +266,14 @@ async def get_optional_user(
         return None
 
 
+def is_admin_key(key: str | None) -> bool:
+    """Whether key is one of the configured admin API keys."""
+    allowed_admin_keys = {configured for configured in ADMIN_API_KEYS if configured}
+    if ADMIN_API_KEY:
+        allowed_admin_keys.add(ADMIN_API_KEY.strip())
+    return bool(key) and key in allowed_admin_keys
+
+
 async def get_admin_user(
     x_api_key: str | None = Header(None),
     authorization: str | None = Header(None),
@@ -286,11 +294,7 @@ async def get_admin_user(
             ),
         )
 
-    allowed_admin_keys = {configured for configured in ADMIN_API_KEYS if configured}
-    if ADMIN_API_KEY:
-        allowed_admin_keys.add(ADMIN_API_KEY.strip())
-
-    if not allowed_admin_keys or key not in allowed_admin_keys:
+    if not is_admin_key(key):
         raise HTTPException(
             status_code=403,
             detail=agent_error(
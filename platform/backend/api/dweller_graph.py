@@ -1,24 +1,27 @@
 """Dweller relationship graph API.
 
 GET /api/dwellers/graph — returns nodes and edges for D3 visualization.
+GET /api/dwellers/graph/changes — edges changed since a graph version.
 No auth required (read-only, public data).
 """
 
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from schemas.dwellers import DwellerGraphResponse
-from utils.relationship_service import get_dweller_graph
+from schemas.dwellers import DwellerGraphChangesResponse, DwellerGraphResponse
+from utils.relationship_service import get_dweller_graph_changes, get_dweller_graph_json
 
 router = APIRouter(prefix="/dwellers", tags=["dwellers"])
 
 
 @router.get("/graph", response_model=DwellerGraphResponse)
 async def dweller_graph(
+    request: Request,
     world_id: Optional[UUID] = Query(None, description="Filter to a single world"),
     min_weight: int = Query(1, ge=1, description="Minimum total interaction count to include edge"),
     db: AsyncSession = Depends(get_db),
@@ -35,6 +38,10 @@ async def dweller_graph(
     - `world_id`: restrict to one world (optional)
     - `min_weight`: only include edges with at least this total interaction count (default 1)
 
+    The payload is cached per graph version and carries an ETag; send
+    `If-None-Match` to get a 304 when nothing changed. With `world_id`, keep
+    `version` and poll `/dwellers/graph/changes?since_version=...` for deltas.
+
     Response shape:
     ```json
     {
@@ -47,8 +54,36 @@ async def dweller_graph(
           "threads": 4, "last_interaction": "2026-02-18T...", "stories": ["uuid"]
         }
       ],
-      "clusters": [{"id": 0, "label": "str", "dweller_ids": ["uuid"], "world_id": "uuid"}]
+      "clusters": [{"id": 0, "label": "str", "dweller_ids": ["uuid"], "world_id": "uuid"}],
+      "version": "42"
     }
     ```
     """
-    return await get_dweller_graph(db, world_id=world_id, min_weight=min_weight)
+    body, version = await get_dweller_graph_json(db, world_id=world_id, min_weight=min_weight)
+    etag = f'"{world_id or "all"}-{min_weight}-{version}"'
+    headers = {"ETag": etag, "X-Graph-Version": version}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/graph/changes", response_model=DwellerGraphChangesResponse)
+async def dweller_graph_changes(
+    world_id: UUID = Query(..., description="World whose graph to diff"),
+    since_version: int = Query(0, ge=0, description="Graph version the client already holds"),
+    min_weight: int = Query(1, ge=1, description="Minimum total interaction count to include edge"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return edges in a world that changed after `since_version`.
+
+    Each relationship write bumps the world's graph version and stamps the
+    edges it touched. Clients holding a graph at version N call this with
+    `since_version=N`, merge the returned edges by (source, target), and keep
+    the returned `version` for the next poll. Nodes are included for the
+    endpoints of changed edges. If `full_refresh_required` is true, refetch
+    `/dwellers/graph`.
+    """
+    return await get_dweller_graph_changes(
+        db, world_id=world_id, since_version=since_version, min_weight=min_weight
+    )
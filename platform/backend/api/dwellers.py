@@ -83,10 +83,14 @@ from schemas.dwellers import (
     PendingEventsResponse,
 )
 from services.arc_detection import detect_open_arcs
+from utils.agent_stats import bump_agent_stats
 from utils.dedup import check_recent_duplicate
 from utils.errors import agent_error
+from utils.json_response import trusted_response
 from utils.feed_events import emit_feed_event
 from utils.nudge import build_nudge
+from utils.relationship_service import bump_graph_version
+from utils.world_canon import get_world_canon_entry, rebuild_world_canon
 from utils.name_validation import check_name_quality
 from guidance import (
     make_guidance_response,
@@ -129,7 +133,7 @@ async def _generate_portrait_background(
     dweller_id: str, dweller_data: dict, world_data: dict, image_prompt: str | None = None
 ) -> None:
     """Background task: generate portrait for a dweller and persist the URL."""
-    from db.database import SessionLocal
+    from db.database import BackgroundSessionLocal
     from services.art_generation import generate_dweller_portrait
 
     portrait_url = await generate_dweller_portrait(dweller_id, dweller_data, world_data, image_prompt=image_prompt)
@@ -137,10 +141,11 @@ async def _generate_portrait_background(
         return
 
     try:
-        async with SessionLocal() as db:
+        async with BackgroundSessionLocal() as db:
             dweller = await db.get(Dweller, UUID(dweller_id))
             if dweller:
                 dweller.portrait_url = portrait_url
+                await bump_graph_version(db, dweller.world_id)
                 await db.commit()
     except Exception:
         logger.exception(f"Failed to persist portrait_url for dweller {dweller_id}")
@@ -537,6 +542,7 @@ async def add_region(
 
     # SQLAlchemy needs a new list to detect the change
     world.regions = world.regions + [new_region]
+    await rebuild_world_canon(db, world.id)
     await db.commit()
 
     # Notify agents when world becomes inhabitable (first region added)
@@ -760,8 +766,10 @@ async def create_dweller(
     )
     db.add(dweller)
 
-    # Update world dweller count
+    # Update world dweller count; new node invalidates cached graph payloads
     world.dweller_count = world.dweller_count + 1
+    await bump_graph_version(db, world_id)
+    await bump_agent_stats(db, current_user.id, dwellers_created=1)
 
     try:
         await db.commit()
@@ -1088,6 +1096,7 @@ async def claim_dweller(
     dweller.is_available = False
     dweller.last_action_at = now  # Start session timer
     dweller.inhabited_until = now + timedelta(hours=24)  # Initial 24h lease
+    await bump_agent_stats(db, current_user.id, dwellers_inhabited=1)
 
     await db.commit()
 
@@ -1136,6 +1145,7 @@ async def release_dweller(
     # Release
     dweller.inhabited_by = None
     dweller.is_available = True
+    await bump_agent_stats(db, current_user.id, dwellers_inhabited=-1)
 
     await db.commit()
 
@@ -1215,6 +1225,9 @@ async def get_dweller_state(
     recent_episodes = dweller.episodic_memories[-working_size:] if dweller.episodic_memories else []
     episodes_in_archive = max(0, total_episodes - working_size)
 
+    canon = await get_world_canon_entry(db, dweller.world_id)
+    world_canon = canon.world_canon_block()
+
     # Get other dwellers in the world for awareness
     other_dwellers_query = (
         select(Dweller)
@@ -1229,22 +1242,10 @@ async def get_dweller_state(
         "dweller_id": str(dweller_id),
         # === WORLD CANON ===
         # This is the hard canon - validated structure you must respect
-        "world_canon": {
-            "id": str(dweller.world_id),
-            "name": dweller.world.name,
-            "year_setting": dweller.world.year_setting,
-            # Canon summary: maintained by integrators when aspects are approved
-            # Falls back to premise if no aspects have been integrated yet
-            "canon_summary": dweller.world.canon_summary or dweller.world.premise,
-            # Original premise
-            "premise": dweller.world.premise,
-            # Causal chain: how we got here
-            "causal_chain": dweller.world.causal_chain,
-            # Scientific basis: the grounding
-            "scientific_basis": dweller.world.scientific_basis,
-            # Regions: validated locations with cultural context
-            "regions": dweller.world.regions,
-        },
+        # Served from the materialized canon (utils.world_canon): id, name,
+        # year_setting, canon_summary (falls back to premise), premise,
+        # causal_chain, scientific_basis, regions, version
+        "world_canon": world_canon,
         # === YOUR PERSONA ===
         "persona": {
             "name": dweller.name,
@@ -1662,22 +1663,16 @@ async def get_action_context(
         for event, _ in world_fact_rows
     ]
 
+    canon = await get_world_canon_entry(db, dweller.world_id)
+    world_canon = canon.world_canon_block()
+
     await db.commit()
 
     return {
         "context_token": str(context_token),
         "expires_in_minutes": 60,
         "delta": delta,  # NEW: what's changed since last action
-        "world_canon": {
-            "id": str(dweller.world_id),
-            "name": dweller.world.name,
-            "year_setting": dweller.world.year_setting,
-            "canon_summary": dweller.world.canon_summary or dweller.world.premise,
-            "premise": dweller.world.premise,
-            "causal_chain": dweller.world.causal_chain,
-            "scientific_basis": dweller.world.scientific_basis,
-            "regions": dweller.world.regions,
-        },
+        "world_canon": world_canon,
         "persona": {
             "name": dweller.name,
             "role": dweller.role,
@@ -2035,6 +2030,7 @@ async def take_action(
     )
     db.add(action)
     await db.flush()  # Get the action ID
+    await bump_agent_stats(db, current_user.id, actions_taken=1)
 
     # Create episodic memory (FULL history, never truncated)
     from utils.clock import now as utc_now
@@ -2308,7 +2304,7 @@ async def get_full_memory(
     if include_episodes:
         episodes = dweller.episodic_memories[-episode_limit:] if dweller.episodic_memories else []
 
-    return {
+    return trusted_response({
         "dweller_id": str(dweller_id),
         "dweller_name": dweller.name,
         "memory": {
@@ -2318,7 +2314,7 @@ async def get_full_memory(
             "total_episodes": len(dweller.episodic_memories) if dweller.episodic_memories else 0,
             "relationship_memories": dweller.relationship_memories,
         },
-    }
+    }, GetFullMemoryResponse)
 
 
 class CoreMemoryUpdate(BaseModel):
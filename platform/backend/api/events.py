@@ -22,9 +22,11 @@ from sqlalchemy.orm import selectinload
 from db import get_db, User, World, WorldEvent
 from db.models import WorldEventStatus, WorldEventOrigin
 from .auth import get_current_user
+from utils.agent_stats import bump_agent_stats
 from utils.dedup import check_recent_duplicate
 from utils.notifications import create_notification
 from utils.simulation import buggify, buggify_delay
+from utils.world_canon import rebuild_world_canon
 from guidance import (
     make_guidance_response,
     TIMEOUT_HIGH_IMPACT,
@@ -170,6 +172,7 @@ async def create_event(
         status=WorldEventStatus.PENDING,
     )
     db.add(event)
+    await bump_agent_stats(db, current_user.id, events_proposed=1)
     await db.commit()
     await db.refresh(event)
 
@@ -261,6 +264,7 @@ async def approve_event(
     world = await db.get(World, event.world_id)
     if world:
         world.canon_summary = request.canon_update
+        await rebuild_world_canon(db, world.id)
 
     # Notify proposer
     if event.proposed_by != current_user.id:
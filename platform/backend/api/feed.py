@@ -6,17 +6,17 @@ One connection, one query, sub-50ms cold loads.
 
 import json
 import logging
-from contextlib import nullcontext
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID as _UUID
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db, FeedEvent
+from observability import span
 from utils.clock import now as utc_now
 
 logger = logging.getLogger(__name__)
@@ -29,14 +29,57 @@ except ImportError:
     _logfire_available = False
 
 
-def _span(name: str):
-    """Return a logfire span if available, otherwise a no-op context manager."""
-    if _logfire_available:
-        return logfire.span(name)
-    return nullcontext()
+router = APIRouter(prefix="/feed", tags=["feed"])
 
+# First look only this far back from the cursor (or now), so a page usually
+# touches just the newest partitions; older ones are read only to fill it.
+FEED_HOT_WINDOW = timedelta(days=31)
+
+
+def _parse_cursor(cursor: str | None) -> tuple[datetime, _UUID | None] | None:
+    """Parse "ISO_TIMESTAMP~UUID" (or legacy "|" / bare timestamp) cursors."""
+    if not cursor:
+        return None
+    try:
+        sep = "~" if "~" in cursor else "|" if "|" in cursor else None
+        if sep:
+            ts_part, id_part = cursor.split(sep, 1)
+            return datetime.fromisoformat(ts_part), _UUID(id_part)
+        return datetime.fromisoformat(cursor), None
+    except (ValueError, TypeError):
+        return None  # Ignore malformed cursor, return from beginning
+
+
+async def _fetch_feed_page(
+    db: AsyncSession,
+    cursor_key: tuple[datetime, _UUID | None] | None,
+    limit: int,
+) -> list[FeedEvent]:
+    """Newest-first page of feed events after the cursor."""
+    query = select(FeedEvent).order_by(FeedEvent.created_at.desc(), FeedEvent.id.desc())
+    if cursor_key is not None:
+        cursor_dt, cursor_id = cursor_key
+        if cursor_id is not None:
+            # Row-value keyset predicate: one range scan on (created_at, id) DESC.
+            # The plain created_at bound lets the planner prune newer partitions.
+            query = query.where(
+                tuple_(FeedEvent.created_at, FeedEvent.id) < tuple_(cursor_dt, cursor_id),
+                FeedEvent.created_at <= cursor_dt,
+            )
+        else:
+            query = query.where(FeedEvent.created_at < cursor_dt)
+        hot_floor = cursor_dt - FEED_HOT_WINDOW
+    else:
+        hot_floor = utc_now() - FEED_HOT_WINDOW
 
-router = APIRouter(prefix="/feed", tags=["feed"])
+    events = list((await db.execute(
+        query.where(FeedEvent.created_at >= hot_floor).limit(limit)
+    )).scalars().all())
+    if len(events) < limit:
+        events += (await db.execute(
+            query.where(FeedEvent.created_at < hot_floor).limit(limit - len(events))
+        )).scalars().all()
+    return events
 
 
 @router.get("/stream", responses={200: {"description": "SSE stream of feed items", "content": {"text/event-stream": {}}}})
@@ -49,7 +92,7 @@ async def get_feed_stream(
     Get unified feed of all platform activity via Server-Sent Events.
 
     Reads from the denormalized `platform_feed_events` table.
-    One query, one connection, sub-50ms.
+    One connection, usually one index range scan over the newest partitions.
 
     SSE Events:
     - event: feed_items, data: {"items": [...], "partial": false}
@@ -59,36 +102,9 @@ async def get_feed_stream(
     async def event_generator():
         start_time = utc_now()
 
-        with _span("feed_stream_query"):
-            query = (
-                select(FeedEvent)
-                .order_by(FeedEvent.created_at.desc(), FeedEvent.id.desc())
-                .limit(limit)
-            )
-            if cursor:
-                try:
-                    # Cursor format: "ISO_TIMESTAMP~UUID" for stable keyset pagination
-                    # Also accepts legacy "|" separator for backwards compat
-                    sep = "~" if "~" in cursor else "|" if "|" in cursor else None
-                    if sep:
-                        ts_part, id_part = cursor.split(sep, 1)
-                        cursor_dt = datetime.fromisoformat(ts_part)
-                        cursor_id = _UUID(id_part)
-                        # Keyset pagination: (created_at < cursor) OR (created_at = cursor AND id < cursor_id)
-                        query = query.where(
-                            or_(
-                                FeedEvent.created_at < cursor_dt,
-                                and_(FeedEvent.created_at == cursor_dt, FeedEvent.id < cursor_id),
-                            )
-                        )
-                    else:
-                        cursor_dt = datetime.fromisoformat(cursor)
-                        query = query.where(FeedEvent.created_at < cursor_dt)
-                except (ValueError, TypeError):
-                    pass  # Ignore malformed cursor, return from beginning
-
-            result = await db.execute(query)
-            events = result.scalars().all()
+        with span("feed_stream_query"):
+            cursor_key = _parse_cursor(cursor)
+            events = await _fetch_feed_page(db, cursor_key, limit)
 
         items = []
         for event in events:
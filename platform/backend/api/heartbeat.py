@@ -42,17 +42,20 @@ from schemas.heartbeat import HeartbeatResponse
 
 from db import (
     get_db, User, Notification, NotificationStatus, Proposal, ProposalStatus,
-    Validation, World, Dweller, DwellerAction, Aspect, AspectStatus,
-    AspectValidation, ReviewFeedback, FeedbackItem, FeedbackItemStatus,
+    Validation, World, Dweller, DwellerAction,
+    ReviewFeedback, FeedbackItem, FeedbackItemStatus,
     WorldEvent, WorldEventPropagation,
 )
 from db.models import WorldEventOrigin, WorldEventStatus
 from .auth import get_current_user
+from utils.agent_stats import bump_agent_stats
 from utils.progression import build_completion_tracking, build_progression_prompts, build_pipeline_status
 from utils.nudge import build_nudge
 from utils.world_signals import build_world_signals
 from utils.errors import agent_error
 from utils.notifications import create_notification
+from utils.shared_cache import shared
+from utils.validation_queue import get_validation_queue, get_world_count
 from utils.clock import now as utc_now
 from utils.activity import (
     MAX_EXPECTED_CYCLE_HOURS,
@@ -70,6 +73,8 @@ limiter = Limiter(key_func=get_remote_address)
 MAX_ACTIVE_PROPOSALS = 3
 ESCALATION_EXPIRY_DAYS = 7
 COMMUNITY_NOMINATION_LIMIT = 5
+# Shared candidates fetched, so filtering out the caller's own rarely runs short
+COMMUNITY_NOMINATION_CANDIDATES = COMMUNITY_NOMINATION_LIMIT * 4
 
 WORLD_SCALE_HINTS = {
     "world", "region", "city", "nation", "system", "council", "policy", "infrastructure",
@@ -90,19 +95,9 @@ async def build_activity_digest(
     if not since:
         since = utc_now() - timedelta(hours=24)
 
-    # Count new proposals needing validation (that user hasn't validated)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    new_proposals = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(Proposal.created_at > since)
-        .where(Proposal.status == ProposalStatus.VALIDATING)
-        .where(Proposal.agent_id != user_id)  # Not own proposals
-        .where(Proposal.id.notin_(validated_subq))  # Not already validated
-    )
+    # Count new proposals needing validation (not own, not already validated)
+    queue = await get_validation_queue(db)
+    new_proposals = len(queue.proposals_to_validate(user_id, since=since))
 
     # Count validations received on user's proposals
     validations_received = await db.scalar(
@@ -207,21 +202,8 @@ async def build_suggested_actions(
         })
 
     # 3. Review proposals needing critical review (you haven't reviewed yet)
-    reviewed_subq = (
-        select(ReviewFeedback.content_id)
-        .where(ReviewFeedback.reviewer_id == user_id, ReviewFeedback.content_type == "proposal")
-        .scalar_subquery()
-    )
-    proposals_to_review = await db.execute(
-        select(Proposal.id, Proposal.name)
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(reviewed_subq),
-        )
-        .limit(3)
-    )
-    for row in proposals_to_review:
+    queue = await get_validation_queue(db)
+    for row in queue.proposals_to_review(user_id)[:3]:
         actions.append({
             "action": "review_proposal",
             "priority": 3,
@@ -419,29 +401,19 @@ async def build_importance_calibration(
     }
 
 
-async def build_escalation_queue(
+async def _query_community_nominations(
     db: AsyncSession,
     *,
-    user_id: UUID,
-) -> dict[str, Any]:
-    """Build nomination queue summary for heartbeat."""
+    limit: int,
+    exclude_actor_id: UUID | None = None,
+) -> list[tuple[UUID, dict[str, Any]]]:
+    """Nominated, not yet escalated actions, newest first, as (actor_id, item)."""
     not_escalated = ~exists().where(WorldEvent.origin_action_id == DwellerAction.id)
-
-    your_pending = await db.scalar(
-        select(func.count(DwellerAction.id))
-        .where(
-            DwellerAction.actor_id == user_id,
-            DwellerAction.escalation_status == "nominated",
-            not_escalated,
-        )
-    ) or 0
-
-    community_result = await db.execute(
+    query = (
         select(DwellerAction, Dweller.name, World.name)
         .join(Dweller, DwellerAction.dweller_id == Dweller.id)
         .join(World, Dweller.world_id == World.id)
         .where(
-            DwellerAction.actor_id != user_id,
             DwellerAction.escalation_status == "nominated",
             DwellerAction.escalation_eligible.is_(True),
             not_escalated,
@@ -451,13 +423,16 @@ async def build_escalation_queue(
             DwellerAction.created_at.desc(),
             DwellerAction.id.desc(),
         )
-        .limit(COMMUNITY_NOMINATION_LIMIT)
+        .limit(limit)
     )
+    if exclude_actor_id is not None:
+        query = query.where(DwellerAction.actor_id != exclude_actor_id)
 
-    community_nominations = []
-    for action, dweller_name, world_name in community_result.all():
+    nominations = []
+    for action, dweller_name, world_name in (await db.execute(query)).all():
         nominated_at = action.nominated_at or action.created_at
-        community_nominations.append(
+        nominations.append((
+            action.actor_id,
             {
                 "action_id": str(action.id),
                 "dweller_name": dweller_name,
@@ -465,12 +440,46 @@ async def build_escalation_queue(
                 "summary": action.content[:200],
                 "importance": action.importance,
                 "nominated_at": nominated_at.isoformat(),
-            }
+            },
+        ))
+    return nominations
+
+
+async def build_escalation_queue(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+) -> dict[str, Any]:
+    """Build nomination queue summary for heartbeat."""
+    not_escalated = ~exists().where(WorldEvent.origin_action_id == DwellerAction.id)
+
+    your_pending = await db.scalar(
+        select(func.count(DwellerAction.id))
+        .where(
+            DwellerAction.actor_id == user_id,
+            DwellerAction.escalation_status == "nominated",
+            not_escalated,
         )
+    ) or 0
+
+    # The newest nominations are the same for everyone: share them, then drop
+    # the caller's own. Only if that leaves too few is a per-user query needed.
+    candidates = await shared(
+        "community_nominations",
+        lambda: _query_community_nominations(db, limit=COMMUNITY_NOMINATION_CANDIDATES),
+        tables=(DwellerAction, WorldEvent, Dweller, World),
+    )
+    community = [item for actor_id, item in candidates if actor_id != user_id]
+    if len(community) < COMMUNITY_NOMINATION_LIMIT and len(candidates) == COMMUNITY_NOMINATION_CANDIDATES:
+        community = [
+            item for _, item in await _query_community_nominations(
+                db, limit=COMMUNITY_NOMINATION_LIMIT, exclude_actor_id=user_id
+            )
+        ]
 
     return {
         "your_nominations_pending": int(your_pending),
-        "community_nominations": community_nominations,
+        "community_nominations": [dict(item) for item in community[:COMMUNITY_NOMINATION_LIMIT]],
     }
 
 
@@ -743,24 +752,9 @@ async def heartbeat(
         n.status = NotificationStatus.READ
         n.read_at = now
 
-    # Get proposals waiting for validation (that this agent hasn't validated yet)
-    # Subquery to get proposal IDs this user has already validated
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-
-    pending_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != current_user.id,  # Can't validate own
-            Proposal.id.notin_(validated_subq),  # Haven't validated yet
-        )
-    )
-    pending_result = await db.execute(pending_proposals_query)
-    proposals_awaiting_validation = pending_result.scalar() or 0
+    # Get proposals waiting for validation (not own, not validated by this agent yet)
+    validation_queue = await get_validation_queue(db)
+    proposals_awaiting_validation = len(validation_queue.proposals_to_validate(current_user.id))
 
     # Get agent's own active proposals
     own_proposals_query = (
@@ -782,26 +776,10 @@ async def heartbeat(
     user_dweller_count = dweller_result.scalar() or 0
 
     # Get approved world count (for creating dwellers/aspects/stories)
-    approved_worlds_query = select(func.count(World.id))
-    approved_worlds_result = await db.execute(approved_worlds_query)
-    approved_world_count = approved_worlds_result.scalar() or 0
+    approved_world_count = await get_world_count(db)
 
     # Get aspects awaiting validation (that this agent hasn't validated yet)
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_aspects_query = (
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != current_user.id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    )
-    aspects_result = await db.execute(pending_aspects_query)
-    aspects_awaiting_validation = aspects_result.scalar() or 0
+    aspects_awaiting_validation = len(validation_queue.aspects_to_validate(current_user.id))
 
     # Build activity digest - what happened since last heartbeat
     activity_digest = await build_activity_digest(
@@ -1193,21 +1171,8 @@ async def post_heartbeat(
         n.read_at = now
 
     # Get counts for suggested actions (same as GET handler)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != current_user.id,
-            Proposal.id.notin_(validated_subq),
-        )
-    )
-    pending_result = await db.execute(pending_proposals_query)
-    proposals_awaiting_validation = pending_result.scalar() or 0
+    validation_queue = await get_validation_queue(db)
+    proposals_awaiting_validation = len(validation_queue.proposals_to_validate(current_user.id))
 
     own_proposals_query = (
         select(func.count(Proposal.id))
@@ -1226,25 +1191,9 @@ async def post_heartbeat(
     dweller_result = await db.execute(dweller_count_query)
     user_dweller_count = dweller_result.scalar() or 0
 
-    approved_worlds_query = select(func.count(World.id))
-    approved_worlds_result = await db.execute(approved_worlds_query)
-    approved_world_count = approved_worlds_result.scalar() or 0
+    approved_world_count = await get_world_count(db)
 
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_aspects_query = (
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != current_user.id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    )
-    aspects_result = await db.execute(pending_aspects_query)
-    aspects_awaiting_validation = aspects_result.scalar() or 0
+    aspects_awaiting_validation = len(validation_queue.aspects_to_validate(current_user.id))
 
     activity_digest = await build_activity_digest(
         db=db,
@@ -1500,6 +1449,7 @@ async def post_heartbeat(
             escalation_eligible=request_body.action.importance >= 0.8,
         )
         db.add(action)
+        await bump_agent_stats(db, current_user.id, actions_taken=1)
 
         # Update dweller's last action time
         dweller.last_action_at = now
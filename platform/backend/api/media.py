@@ -17,7 +17,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import (
@@ -89,11 +89,11 @@ class BackfillRequest(BaseModel):
 
 async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID, media_type: MediaType):
     """Background task that runs media generation, uploads to R2, and updates DB."""
-    from db.database import SessionLocal
+    from db.database import BackgroundSessionLocal
 
     # In DST simulation mode, skip real xAI/R2 calls and mark completed with stub URL
     if os.environ.get("DST_SIMULATION"):
-        async with SessionLocal() as db:
+        async with BackgroundSessionLocal() as db:
             gen = await db.get(MediaGeneration, generation_id)
             if gen:
                 gen.status = MediaGenerationStatus.COMPLETED
@@ -106,16 +106,26 @@ async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID
                 await db.commit()
         return
 
-    async with SessionLocal() as db:
-        gen = await db.get(MediaGeneration, generation_id)
-        if not gen:
-            logger.error(f"Generation {generation_id} not found")
+    async with BackgroundSessionLocal() as db:
+        # Claim the row: with several instances, process-pending/retry-stuck
+        # calls can queue the same generation more than once
+        claimed = await db.execute(
+            update(MediaGeneration)
+            .where(
+                MediaGeneration.id == generation_id,
+                MediaGeneration.status == MediaGenerationStatus.PENDING,
+            )
+            .values(status=MediaGenerationStatus.GENERATING, started_at=utc_now())
+            .returning(MediaGeneration.id)
+        )
+        if claimed.scalar_one_or_none() is None:
+            await db.rollback()
+            logger.info(f"Generation {generation_id} not found or already claimed")
             return
-
-        gen.status = MediaGenerationStatus.GENERATING
-        gen.started_at = utc_now()
         await db.commit()
 
+        gen = await db.get(MediaGeneration, generation_id)
+
         try:
             from media.generator import generate_image, generate_video
             from storage.r2 import upload_media
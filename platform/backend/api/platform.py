@@ -23,6 +23,7 @@ from db import (
     AspectStatus,
 )
 from .auth import get_current_user, get_admin_user
+from utils.shared_cache import shared
 
 # Import test mode setting from proposals
 TEST_MODE_ENABLED = os.getenv("DSF_TEST_MODE_ENABLED", "false").lower() == "true"
@@ -235,6 +236,21 @@ async def get_whats_new(
     }
 
 
+async def _count_platform_totals(db: AsyncSession) -> dict[str, int]:
+    """The /stats counts, in one round trip."""
+    def count(model, *conditions):
+        return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+
+    row = (await db.execute(select(
+        count(World, World.is_active == True).label("total_worlds"),
+        count(Proposal).label("total_proposals"),
+        count(Dweller, Dweller.is_active == True).label("total_dwellers"),
+        count(Dweller, and_(Dweller.inhabited_by != None, Dweller.is_active == True)).label("active_dwellers"),
+        count(User, User.type == "agent").label("total_agents"),
+    ))).mappings().one()
+    return {key: value or 0 for key, value in row.items()}
+
+
 @router.get("/stats", response_model=PlatformStatsResponse)
 async def get_platform_stats(
     db: AsyncSession = Depends(get_db),
@@ -242,32 +258,17 @@ async def get_platform_stats(
     """
     Get overall platform statistics.
 
-    Public endpoint - no authentication required.
+    Public endpoint - no authentication required. Counts are shared across
+    callers and refreshed after writes or every SHARED_CACHE_TTL_SECONDS.
     """
-    total_worlds = await db.scalar(
-        select(func.count()).select_from(World).where(World.is_active == True)
-    )
-    total_proposals = await db.scalar(
-        select(func.count()).select_from(Proposal)
-    )
-    total_dwellers = await db.scalar(
-        select(func.count()).select_from(Dweller).where(Dweller.is_active == True)
-    )
-    total_agents = await db.scalar(
-        select(func.count()).select_from(User).where(User.type == "agent")
-    )
-    active_dwellers = await db.scalar(
-        select(func.count())
-        .select_from(Dweller)
-        .where(and_(Dweller.inhabited_by != None, Dweller.is_active == True))
+    totals = await shared(
+        "platform_stats",
+        lambda: _count_platform_totals(db),
+        tables=(World, Proposal, Dweller, User),
     )
 
     return {
-        "total_worlds": total_worlds or 0,
-        "total_proposals": total_proposals or 0,
-        "total_dwellers": total_dwellers or 0,
-        "active_dwellers": active_dwellers or 0,
-        "total_agents": total_agents or 0,
+        **totals,
         "timestamp": utc_now().isoformat(),
         "environment": {
             "test_mode_enabled": TEST_MODE_ENABLED,
@@ -46,6 +46,7 @@ from schemas.proposals import (
     SimilarContentResponse,
     ProposalReviseResponse,
 )
+from utils.agent_stats import bump_agent_stats
 from utils.errors import agent_error
 from utils.notifications import notify_proposal_validated, notify_proposal_status_changed
 from utils.rate_limit import limiter_auth
@@ -320,22 +321,9 @@ async def search_proposals(
             embedding=query_embedding,
             limit=limit,
             threshold=0.5,  # Lower threshold for discovery
+            status=status.name if status else None,  # enum labels are member names
         )
 
-        # Filter by status if provided
-        if status:
-            # Get full proposal data to filter
-            from sqlalchemy import text
-            status_query = text("""
-                SELECT id, status FROM platform_proposals
-                WHERE id = ANY(:ids)
-            """)
-            if similar:
-                ids = [s["id"] for s in similar]
-                result = await db.execute(status_query, {"ids": ids})
-                status_map = {str(row.id): row.status for row in result.fetchall()}
-                similar = [s for s in similar if status_map.get(s["id"]) == status.value]
-
         return {
             "query": q,
             "status_filter": status.value if status else None,
@@ -431,6 +419,7 @@ async def create_proposal(
         status=ProposalStatus.DRAFT,
     )
     db.add(proposal)
+    await bump_agent_stats(db, current_user.id, worlds_proposed=1)
     await db.commit()
     await db.refresh(proposal)
 
@@ -1119,6 +1108,7 @@ async def test_approve_proposal(
     proposal.status = ProposalStatus.APPROVED
     proposal.resulting_world_id = world.id
     proposal.approved_at = func.now()
+    await bump_agent_stats(db, proposal.agent_id, worlds_created=1)
 
     await db.flush()
 
@@ -1233,6 +1223,8 @@ async def delete_proposal(
         ))
 
     proposal_name = proposal.name
+    proposal_agent_id = proposal.agent_id
+    was_approved = proposal.status == ProposalStatus.APPROVED
 
     validation_count = (await db.execute(
         select(func.count()).select_from(Validation).where(Validation.proposal_id == proposal_id)
@@ -1241,6 +1233,10 @@ async def delete_proposal(
     # Use SQL DELETE to bypass SQLAlchemy's cascade management.
     # DB-level ON DELETE CASCADE handles child validations.
     await db.execute(delete(Proposal).where(Proposal.id == proposal_id))
+    # Validators' proposals_validated counts are left to the reconciler
+    await bump_agent_stats(
+        db, proposal_agent_id, worlds_proposed=-1, worlds_created=-1 if was_approved else 0
+    )
     await db.commit()
 
     logger.info(f"Admin deleted proposal '{proposal_name}' ({proposal_id}): {validation_count} validations")
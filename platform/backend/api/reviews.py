@@ -42,6 +42,7 @@ from db import (
     Story,
 )
 from .auth import get_current_user, get_optional_user
+from utils.agent_stats import bump_agent_stats
 from utils.rate_limit import limiter_auth
 from schemas.reviews import (
     SubmitReviewResponse,
@@ -238,6 +239,7 @@ async def _auto_graduate_if_ready(
 
     proposal.status = ProposalStatus.APPROVED
     proposal.resulting_world_id = world.id
+    await bump_agent_stats(db, proposal.agent_id, worlds_created=1)
     await db.flush()
 
     # Queue cover image generation
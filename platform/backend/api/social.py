@@ -5,12 +5,14 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db, User, SocialInteraction, Comment, World, Story
 from .auth import get_current_user
 from utils.dedup import check_recent_duplicate
+from utils.keyset import decode_cursor, encode_cursor, parse_timestamp
+from utils.reaction_counters import apply_reaction_delta
 from schemas.social import (
     ReactionResponse,
     FollowResponse,
@@ -150,22 +152,8 @@ async def _update_reaction_count(
     reaction_type: str,
     delta: int,
 ) -> None:
-    """Update the cached reaction count on the target."""
-    if target_type == "world":
-        world_query = select(World).where(World.id == target_id)
-        result = await db.execute(world_query)
-        world = result.scalar_one_or_none()
-        if world:
-            counts = dict(world.reaction_counts) if world.reaction_counts else {}
-            counts[reaction_type] = max(0, counts.get(reaction_type, 0) + delta)
-            world.reaction_counts = counts
-    elif target_type == "story":
-        story_query = select(Story).where(Story.id == target_id)
-        result = await db.execute(story_query)
-        story = result.scalar_one_or_none()
-        if story:
-            # Stories use a simple reaction_count (total), not per-type counts
-            story.reaction_count = max(0, story.reaction_count + delta)
+    """Update the cached reaction count on the target (single atomic UPDATE)."""
+    await apply_reaction_delta(db, target_type, target_id, reaction_type, delta)
 
 
 async def _validate_follow_target_exists(
@@ -480,20 +468,19 @@ async def add_comment(
     )
     db.add(comment)
 
-    # Update target comment count
+    # Update target comment and reaction counts in place (no read-modify-write)
     if target:
-        if request.target_type == "world":
-            target.comment_count = (target.comment_count or 0) + 1
-            # Update reaction counts if reaction provided
-            if request.reaction:
-                counts = dict(target.reaction_counts) if target.reaction_counts else {}
-                counts[request.reaction] = counts.get(request.reaction, 0) + 1
-                target.reaction_counts = counts
-        elif request.target_type == "story":
-            target.comment_count = (target.comment_count or 0) + 1
-            # Stories use simple reaction_count (total)
-            if request.reaction:
-                target.reaction_count = (target.reaction_count or 0) + 1
+        model = World if request.target_type == "world" else Story
+        await db.execute(
+            update(model)
+            .where(model.id == request.target_id)
+            .values(comment_count=func.coalesce(model.comment_count, 0) + 1)
+            .execution_options(synchronize_session="fetch")
+        )
+        if request.reaction:
+            await _update_reaction_count(
+                db, request.target_type, request.target_id, request.reaction, 1
+            )
 
     await db.flush()  # Get the ID
 
@@ -519,55 +506,134 @@ async def add_comment(
     return response
 
 
+COMMENT_COLUMNS = (
+    Comment.id,
+    Comment.content,
+    Comment.reaction,
+    Comment.parent_id,
+    Comment.created_at,
+    User.id.label("user_id"),
+    User.name.label("user_name"),
+    User.type.label("user_type"),
+    User.avatar_url.label("user_avatar_url"),
+)
+
+
+def _comment_item(row: Any, reply_count: int | None = None) -> dict[str, Any]:
+    """Build a comment list item from a COMMENT_COLUMNS row."""
+    return {
+        "id": str(row.id),
+        "content": row.content,
+        "reaction": row.reaction,
+        "parent_id": str(row.parent_id) if row.parent_id else None,
+        "created_at": row.created_at.isoformat(),
+        "reply_count": reply_count,
+        "user": {
+            "id": str(row.user_id),
+            "name": row.user_name,
+            "type": row.user_type.value,
+            "avatar_url": row.user_avatar_url,
+        }
+        if row.user_id
+        else None,
+    }
+
+
 @router.get("/comments/{target_type}/{target_id}", response_model=CommentsResponse)
 async def get_comments(
     target_type: Literal["world", "story"],
     target_id: UUID,
+    limit: int = Query(20, ge=1, le=100, description="Top-level comments (threads) per page"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    replies_limit: int = Query(3, ge=0, le=20, description="Replies returned per thread"),
+    parent_id: UUID | None = Query(None, description="Page through the replies of one comment instead"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """
-    Get comments for a world or story.
+    Get comments for a world or story, oldest first.
+
+    Pages over top-level comments; each is followed by up to replies_limit of
+    its replies, and carries reply_count so clients know when a thread has
+    more. Fetch the rest of a thread with parent_id=<comment id> (paginated
+    the same way).
     """
-    query = (
-        select(Comment)
+    filters = [
+        Comment.target_type == target_type,
+        Comment.target_id == target_id,
+        Comment.is_deleted == False,
+        Comment.parent_id == parent_id if parent_id else Comment.parent_id.is_(None),
+    ]
+    if cursor:
+        values = decode_cursor(cursor, parse_timestamp, UUID)
+        if values is None:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "Invalid pagination cursor",
+                    "cursor": cursor,
+                    "how_to_fix": "Pass the next_cursor value from the previous response unchanged, or omit cursor for the first page.",
+                },
+            )
+        filters.append(tuple_(Comment.created_at, Comment.id) > tuple_(*values))
+
+    result = await db.execute(
+        select(*COMMENT_COLUMNS)
+        .outerjoin(User, User.id == Comment.user_id)
+        .where(and_(*filters))
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+
+    if parent_id or not rows:
+        return {
+            "comments": [_comment_item(row) for row in rows],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+
+    # First replies_limit replies of every thread on the page, plus each
+    # thread's total reply count, in one windowed query.
+    position = func.row_number().over(
+        partition_by=Comment.parent_id,
+        order_by=(Comment.created_at.asc(), Comment.id.asc()),
+    ).label("position")
+    total = func.count().over(partition_by=Comment.parent_id).label("total")
+    replies = (
+        select(*COMMENT_COLUMNS, position, total)
+        .outerjoin(User, User.id == Comment.user_id)
         .where(
             and_(
                 Comment.target_type == target_type,
                 Comment.target_id == target_id,
                 Comment.is_deleted == False,
+                Comment.parent_id.in_([row.id for row in rows]),
             )
         )
-        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .subquery()
     )
-    result = await db.execute(query)
-    comments = result.scalars().all()
-
-    # Get users
-    user_ids = {c.user_id for c in comments}
-    users_map: dict[UUID, User] = {}
-    if user_ids:
-        users_query = select(User).where(User.id.in_(user_ids))
-        users_result = await db.execute(users_query)
-        for user in users_result.scalars().all():
-            users_map[user.id] = user
+    reply_result = await db.execute(
+        select(replies)
+        .where(replies.c.position <= max(replies_limit, 1))
+        .order_by(replies.c.created_at.asc(), replies.c.id.asc())
+    )
+    replies_by_parent: dict[UUID, list[Any]] = {}
+    reply_counts: dict[UUID, int] = {}
+    for reply in reply_result.all():
+        reply_counts[reply.parent_id] = reply.total
+        if reply.position <= replies_limit:
+            replies_by_parent.setdefault(reply.parent_id, []).append(reply)
+
+    comments: list[dict[str, Any]] = []
+    for row in rows:
+        comments.append(_comment_item(row, reply_count=reply_counts.get(row.id, 0)))
+        comments.extend(_comment_item(reply) for reply in replies_by_parent.get(row.id, []))
 
     return {
-        "comments": [
-            {
-                "id": str(c.id),
-                "content": c.content,
-                "reaction": getattr(c, 'reaction', None),
-                "parent_id": str(c.parent_id) if c.parent_id else None,
-                "created_at": c.created_at.isoformat(),
-                "user": {
-                    "id": str(users_map[c.user_id].id),
-                    "name": users_map[c.user_id].name,
-                    "type": users_map[c.user_id].type.value,
-                    "avatar_url": users_map[c.user_id].avatar_url,
-                }
-                if c.user_id in users_map
-                else None,
-            }
-            for c in comments
-        ],
+        "comments": comments,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
     }
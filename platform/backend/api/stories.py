@@ -31,9 +31,9 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header,
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, model_validator
-from sqlalchemy import select, and_, desc, case, func as sa_func
+from sqlalchemy import select, and_, desc, tuple_, func as sa_func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 from db import (
     get_db,
@@ -72,8 +72,12 @@ from schemas.stories import (
     StoryReviseResponse,
     StoryPublishToXResponse,
 )
+from utils.agent_stats import bump_agent_stats, bump_agent_stats_many
 from utils.dedup import check_recent_duplicate
 from utils.errors import agent_error
+from utils.json_response import trusted_response
+from utils.keyset import decode_cursor, encode_cursor, parse_timestamp
+from utils.reaction_counters import apply_reaction_delta
 from utils.feed_events import emit_feed_event
 from utils.notifications import create_notification, notify_story_acclaimed
 from utils.nudge import build_nudge
@@ -510,6 +514,92 @@ def story_to_response(story: Story, guidance_signal: str | None = None) -> Story
     )
 
 
+# Columns story_to_response reads. List endpoints load only these, so story
+# bodies, prompts and embeddings never leave the database for summary cards.
+STORY_CARD_COLUMNS = (
+    Story.id,
+    Story.world_id,
+    Story.author_id,
+    Story.title,
+    Story.summary,
+    Story.perspective,
+    Story.perspective_dweller_id,
+    Story.cover_image_url,
+    Story.video_url,
+    Story.thumbnail_url,
+    Story.x_post_id,
+    Story.status,
+    Story.review_system,
+    Story.reaction_count,
+    Story.comment_count,
+    Story.acclaim_rank,
+    Story.created_at,
+)
+
+
+def story_card_query():
+    """Select stories as summary cards: card columns plus names of related rows, one round-trip."""
+    return select(Story).options(
+        load_only(*STORY_CARD_COLUMNS),
+        joinedload(Story.world).load_only(World.name),
+        joinedload(Story.author).load_only(User.name, User.username),
+        joinedload(Story.perspective_dweller).load_only(Dweller.name),
+    )
+
+
+def _story_sort_keys(sort: str) -> tuple:
+    # Every key sorts DESC, so the keyset predicate is a single row comparison
+    # that matches story_engagement_idx / story_world_recent_idx.
+    if sort == "engagement":
+        return (Story.acclaim_rank, Story.reaction_count, Story.created_at, Story.id)
+    return (Story.created_at, Story.id)
+
+
+def _story_cursor(story: Story, sort: str) -> str:
+    if sort == "engagement":
+        return encode_cursor(story.acclaim_rank, story.reaction_count, story.created_at, story.id)
+    return encode_cursor(story.created_at, story.id)
+
+
+def apply_story_keyset(query, sort: str, cursor: str | None, limit: int, offset: int = 0):
+    """Order a story query for `sort` and page it by cursor (or legacy offset).
+
+    Fetches limit + 1 rows so callers can tell whether another page exists.
+    """
+    keys = _story_sort_keys(sort)
+    if cursor:
+        if sort == "engagement":
+            values = decode_cursor(cursor, int, int, parse_timestamp, UUID)
+        else:
+            values = decode_cursor(cursor, parse_timestamp, UUID)
+        if values is None:
+            raise HTTPException(
+                status_code=400,
+                detail=agent_error(
+                    error="Invalid pagination cursor",
+                    how_to_fix=(
+                        "Pass the next_cursor value from the previous response unchanged, "
+                        "with the same sort parameter."
+                    ),
+                    blocker_type="validation",
+                    cursor=cursor,
+                    sort=sort,
+                ),
+            )
+        query = query.where(tuple_(*keys) < tuple_(*values))
+    elif offset:
+        query = query.offset(offset)
+    return query.order_by(*(desc(key) for key in keys)).limit(limit + 1)
+
+
+def story_page(stories: list[Story], sort: str, limit: int) -> tuple[list[Story], str | None]:
+    """Trim the look-ahead row and return (page, next_cursor)."""
+    if len(stories) <= limit:
+        return stories, None
+    page = stories[:limit]
+    return page, _story_cursor(page[-1], sort)
+
+
 async def story_to_detail_response(story: Story, db: AsyncSession) -> StoryDetailResponse:
     """Convert a Story model to a StoryDetailResponse."""
     # Count reviews and acclaim recommendations
@@ -996,6 +1086,7 @@ async def create_story(
     )
     db.add(story)
     await db.flush()
+    await bump_agent_stats(db, current_user.id, stories_written=1)
 
     if guidance_token_record:
         guidance_token_record.consumed = True
@@ -1114,7 +1205,8 @@ async def list_stories(
         "engagement", description="Sort order: engagement (acclaimed first, then reaction_count) or recent (created_at)"
     ),
     limit: int = Query(20, ge=1, le=50),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor"),
+    cursor: str | None = Query(None, description="Pagination cursor - next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_optional_user),
 ) -> dict[str, Any]:
@@ -1130,12 +1222,11 @@ async def list_stories(
     - author_id: Only stories by this author
     - perspective: Only stories with this perspective type
     - status: Only stories with this status (published or acclaimed)
+
+    PAGINATION: pass `next_cursor` from the previous response as `cursor`
+    (with the same sort). Story bodies are not included - use GET /stories/{id}.
     """
-    query = select(Story).options(
-        selectinload(Story.world),
-        selectinload(Story.author),
-        selectinload(Story.perspective_dweller),
-    )
+    query = story_card_query()
 
     # Apply filters
     if world_id:
@@ -1147,33 +1238,22 @@ async def list_stories(
     if status:
         query = query.where(Story.status == status)
 
-    # Apply sort
-    if sort == "engagement":
-        # Acclaimed stories rank higher than published
-        status_priority = case(
-            (Story.status == StoryStatus.ACCLAIMED, 0),
-            else_=1
-        )
-        query = query.order_by(status_priority, desc(Story.reaction_count), desc(Story.created_at), desc(Story.id))
-    else:
-        query = query.order_by(desc(Story.created_at), desc(Story.id))
-
-    # Pagination
-    query = query.limit(limit).offset(offset)
+    # Sort (acclaimed first for engagement) + keyset pagination
+    query = apply_story_keyset(query, sort, cursor, limit, offset)
 
     result = await db.execute(query)
-    stories = result.scalars().all()
+    stories, next_cursor = story_page(result.scalars().all(), sort, limit)
     guidance_notes: dict[UUID, str] = {}
     if current_user:
         own_story_ids = [story.id for story in stories if story.author_id == current_user.id]
         guidance_notes = await build_story_guidance_note_map(db, own_story_ids)
 
     story_items = [
-        story_to_response(story, guidance_signal=guidance_notes.get(story.id)).model_dump()
+        story_to_response(story, guidance_signal=guidance_notes.get(story.id)).model_dump(mode="json")
         for story in stories
     ]
 
-    return {
+    return trusted_response({
         "stories": story_items,
         "count": len(stories),
         "filters": {
@@ -1183,7 +1263,9 @@ async def list_stories(
             "status": status.value if status else None,
             "sort": sort,
         },
-    }
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }, StoryListResponse)
 
 
 @router.get("/{story_id}", response_model=StoryGetResponse)
@@ -1321,7 +1403,8 @@ async def get_world_stories(
     status: StoryStatus | None = Query(None, description="Filter by status"),
     sort: Literal["engagement", "recent"] = Query("engagement"),
     limit: int = Query(20, ge=1, le=50),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor"),
+    cursor: str | None = Query(None, description="Pagination cursor - next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """
@@ -1329,9 +1412,12 @@ async def get_world_stories(
 
     This is the main way humans browse stories about a world.
     Default sort is by engagement (acclaimed first, then most-reacted stories).
+    Page with `cursor` = `next_cursor` from the previous response.
     """
     # Validate world exists
-    world_query = select(World).where(World.id == world_id)
+    world_query = select(World).options(
+        load_only(World.id, World.name, World.year_setting)
+    ).where(World.id == world_id)
     world_result = await db.execute(world_query)
     world = world_result.scalar_one_or_none()
 
@@ -1346,33 +1432,16 @@ async def get_world_stories(
         )
 
     # Build query
-    query = (
-        select(Story)
-        .options(
-            selectinload(Story.world),
-            selectinload(Story.author),
-            selectinload(Story.perspective_dweller),
-        )
-        .where(Story.world_id == world_id)
-    )
+    query = story_card_query().where(Story.world_id == world_id)
 
     if status:
         query = query.where(Story.status == status)
 
-    if sort == "engagement":
-        # Acclaimed stories rank higher
-        status_priority = case(
-            (Story.status == StoryStatus.ACCLAIMED, 0),
-            else_=1
-        )
-        query = query.order_by(status_priority, desc(Story.reaction_count), desc(Story.created_at), desc(Story.id))
-    else:
-        query = query.order_by(desc(Story.created_at), desc(Story.id))
-
-    query = query.limit(limit).offset(offset)
+    # Acclaimed stories rank higher for engagement sort
+    query = apply_story_keyset(query, sort, cursor, limit, offset)
 
     result = await db.execute(query)
-    stories = result.scalars().all()
+    stories, next_cursor = story_page(result.scalars().all(), sort, limit)
 
     return {
         "world": {
@@ -1384,6 +1453,8 @@ async def get_world_stories(
         "count": len(stories),
         "sort": sort,
         "status_filter": status.value if status else None,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
     }
 
 
@@ -1441,11 +1512,13 @@ async def react_to_story(
         if existing_type == request.reaction_type:
             # Toggle off - remove reaction
             await db.delete(existing)
-            story.reaction_count = max(0, story.reaction_count - 1)
+            new_count = await apply_reaction_delta(
+                db, "story", story_id, request.reaction_type, -1
+            )
             return {
                 "action": "removed",
                 "reaction_type": request.reaction_type,
-                "new_reaction_count": story.reaction_count,
+                "new_reaction_count": new_count if new_count is not None else max(0, story.reaction_count - 1),
             }
         else:
             # Change reaction type (count stays same)
@@ -1466,12 +1539,12 @@ async def react_to_story(
         data={"type": request.reaction_type},
     )
     db.add(interaction)
-    story.reaction_count += 1
+    new_count = await apply_reaction_delta(db, "story", story_id, request.reaction_type, 1)
 
     return {
         "action": "added",
         "reaction_type": request.reaction_type,
-        "new_reaction_count": story.reaction_count,
+        "new_reaction_count": new_count if new_count is not None else story.reaction_count + 1,
     }
 
 
@@ -1571,6 +1644,10 @@ async def review_story(
     )
     db.add(review)
     await db.flush()
+    await bump_agent_stats_many(db, [
+        (current_user.id, {"stories_reviewed": 1}),
+        (story.author_id, {"unresponded_reviews": 1}),
+    ])
 
     if story.guidance_version_used:
         await record_guidance_compliance_signal(
@@ -1777,6 +1854,7 @@ async def respond_to_review(
     review.author_responded = True
     review.author_response = request.response
     review.author_responded_at = utc_now()
+    await bump_agent_stats(db, story.author_id, unresponded_reviews=-1)
 
     # Check if story should now become acclaimed
     transitioned = await maybe_transition_to_acclaimed(story, db)
@@ -1970,14 +2048,16 @@ async def _update_graph_and_arcs(story_id: UUID):
     """Background task: materialize relationships and arcs after story creation.
 
     Runs two independent phases, each in its own session, so a failure in one
-    does not block the other. Both phases log exceptions and proceed.
+    does not block the other. Both phases log exceptions and proceed. The
+    arc's summary is then refreshed in a third session so a slow or failing
+    LLM call never holds up arc assignment.
     """
-    from db.database import SessionLocal
+    from db.database import BackgroundSessionLocal
     from utils.relationship_service import update_relationships_for_story
-    from utils.arc_service import assign_story_to_arc
+    from utils.arc_service import assign_story_to_arc, refresh_arc_summaries
 
     rel_ok = False
-    async with SessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             result = await db.execute(
                 select(Story).where(Story.id == story_id)
@@ -2000,7 +2080,7 @@ async def _update_graph_and_arcs(story_id: UUID):
             story_id,
         )
 
-    async with SessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             result = await db.execute(
                 select(Story).where(Story.id == story_id)
@@ -2012,12 +2092,23 @@ async def _update_graph_and_arcs(story_id: UUID):
                     story_id,
                 )
                 return
-            await assign_story_to_arc(db, story)
+            arc = await assign_story_to_arc(db, story)
+            arc_id = arc.id if arc is not None else None
             await db.commit()
         except Exception:
             logger.exception(
                 "Background arc assignment failed for story %s", story_id
             )
+            return
+
+    if arc_id is None:
+        return
+    async with BackgroundSessionLocal() as db:
+        try:
+            await refresh_arc_summaries(db, arc_ids=[arc_id])
+            await db.commit()
+        except Exception:
+            logger.exception("Background arc summary failed for arc %s", arc_id)
 
 
 @router.post("/{story_id}/publish-to-x", response_model=StoryPublishToXResponse)
@@ -2101,6 +2192,13 @@ async def delete_story(
 
     review_count = len(story.reviews)
     title = story.title
+    await bump_agent_stats_many(db, [
+        (story.author_id, {
+            "stories_written": -1,
+            "unresponded_reviews": -sum(1 for r in story.reviews if not r.author_responded),
+        }),
+        *((review.reviewer_id, {"stories_reviewed": -1}) for review in story.reviews),
+    ])
     await db.delete(story)
     await db.commit()
 
@@ -14,6 +14,7 @@ from db import get_db, Story, ExternalFeedback
 from .auth import get_admin_user, get_current_user
 from db.models import User
 from utils.errors import agent_error
+from utils.leader_election import try_advisory_xact_lock
 from schemas.x_feedback import (
     ExternalFeedbackQuery,
     StoryExternalFeedbackResponse,
@@ -36,6 +37,14 @@ async def poll_x_feedback(
     """
     from services.x_feedback_monitor import poll_all_published_stories
 
+    # Cron may hit any instance; only one poll runs at a time
+    if not await try_advisory_xact_lock(db, "x_feedback_poll"):
+        return {
+            "success": False,
+            "new_feedback_items": 0,
+            "message": "An X feedback poll is already running on another instance.",
+        }
+
     new_count = await poll_all_published_stories(db)
 
     return {
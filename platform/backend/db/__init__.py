@@ -2,6 +2,9 @@ from .database import (
     get_db,
     engine,
     SessionLocal,
+    background_engine,
+    BackgroundSessionLocal,
+    pool_metrics,
     init_db,
     verify_schema_version,
     get_current_migration_version,
@@ -22,6 +25,10 @@ from .models import (
     DwellerProposal,
     DwellerValidation,
     SocialInteraction,
+    ReactionCounterShard,
+    EmbeddingCache,
+    WorldCanon,
+    AgentStats,
     Comment,
     Notification,
     RevisionSuggestion,
@@ -30,6 +37,7 @@ from .models import (
     Story,
     StoryArc,
     DwellerRelationship,
+    DwellerGraphVersion,
     FeedEvent,
     StoryReview,
     GuidanceComplianceSignal,
@@ -67,6 +75,9 @@ __all__ = [
     "get_db",
     "engine",
     "SessionLocal",
+    "background_engine",
+    "BackgroundSessionLocal",
+    "pool_metrics",
     "init_db",
     "verify_schema_version",
     "get_current_migration_version",
@@ -85,6 +96,10 @@ __all__ = [
     "DwellerProposal",
     "DwellerValidation",
     "SocialInteraction",
+    "ReactionCounterShard",
+    "EmbeddingCache",
+    "WorldCanon",
+    "AgentStats",
     "Comment",
     "Notification",
     "RevisionSuggestion",
@@ -93,6 +108,7 @@ __all__ = [
     "Story",
     "StoryArc",
     "DwellerRelationship",
+    "DwellerGraphVersion",
     "FeedEvent",
     "StoryReview",
     "GuidanceComplianceSignal",
@@ -9,8 +9,11 @@ from utils.deterministic import deterministic_uuid4
 
 from sqlalchemy import (
     ARRAY,
+    BigInteger,
     Boolean,
     CheckConstraint,
+    Computed,
+    DDL,
     DateTime,
     Enum,
     Float,
@@ -18,9 +21,11 @@ from sqlalchemy import (
     JSON,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
     text,
 )
@@ -131,6 +136,13 @@ class User(Base):
     __table_args__ = (
         Index("user_type_idx", "type"),
         Index("user_username_idx", "username"),
+        # GET /agents keyset order
+        Index(
+            "user_agent_activity_idx",
+            text("coalesce(last_active_at, created_at) DESC"),
+            text("id DESC"),
+            postgresql_where=text("type = 'AGENT'"),
+        ),
     )
 
 
@@ -805,6 +817,9 @@ class IdempotencyKey(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, server_default="in_progress")
     response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
     response_body: Mapped[dict[str, Any] | list[Any] | str | None] = mapped_column(JSON, nullable=True)
+    # Middleware responses: zlib-compressed body bytes, replayed verbatim
+    response_blob: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    response_content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -848,6 +863,97 @@ class SocialInteraction(Base):
     )
 
 
+class ReactionCounterShard(Base):
+    """Pending reaction-count deltas for the sharded counter mode.
+
+    When REACTION_COUNTER_SHARDS > 0, reactions add their delta to one of N
+    shard rows per (target, reaction type) instead of updating the target row,
+    so bursts on a hot world or story spread over N row locks. Shards are
+    periodically folded into World.reaction_counts / Story.reaction_count.
+    """
+
+    __tablename__ = "platform_reaction_counter_shards"
+
+    target_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    target_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    reaction_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class EmbeddingCache(Base):
+    """Persistent cache of text embeddings, keyed by a hash of model + text.
+
+    Backs utils.embeddings so repeated inputs (discovery queries, re-submitted
+    proposals, backfills) don't go back to the embedding API. Stored as a float
+    array so the cache doesn't depend on pgvector.
+    """
+
+    __tablename__ = "platform_embedding_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(64), nullable=False)
+    embedding: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class WorldCanon(Base):
+    """Materialized canon document for a world (GET /aspects/worlds/{id}/canon).
+
+    Rebuilt when canon changes (aspect/event approval, new regions) and served
+    as-is to readers; version increments on every rebuild and feeds the ETag.
+    source_fingerprint is an md5 of the canon columns of the world row the
+    document was built from, so a world edited outside the rebuild hooks is
+    detected as stale (counter updates on the row don't count).
+    """
+
+    __tablename__ = "platform_world_canons"
+
+    world_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_worlds.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    document: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    source_fingerprint: Mapped[str] = mapped_column(String(32), nullable=False)
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AgentStats(Base):
+    """Materialized per-user activity counters (utils.agent_stats).
+
+    Incremented in the same transaction as the write that changes them, so
+    heartbeat completion tracking, nudges and agent listings read one row
+    instead of counting each table. unresponded_reviews belongs to the story
+    author, not the reviewer. A periodic reconciler recomputes rows from the
+    source tables to correct drift (cascading deletes, manual SQL).
+    """
+
+    __tablename__ = "platform_agent_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_users.id", ondelete="CASCADE"), primary_key=True
+    )
+    stories_written: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stories_reviewed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    proposals_validated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    aspects_validated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dwellers_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    actions_taken: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    worlds_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    aspects_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    events_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unresponded_reviews: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    worlds_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dwellers_inhabited: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class Comment(Base):
     """Comments on stories, worlds, conversations."""
 
@@ -880,6 +986,11 @@ class Comment(Base):
         Index("comment_target_idx", "target_type", "target_id"),
         Index("comment_parent_idx", "parent_id"),
         Index("comment_created_at_idx", "created_at"),
+        # Covers the threaded listing: filter on target + is_deleted, keyset on (created_at, id)
+        Index(
+            "comment_target_thread_idx",
+            "target_type", "target_id", "is_deleted", "created_at", "id",
+        ),
     )
 
 
@@ -1399,6 +1510,13 @@ class Story(Base):
     # Engagement (simple count-based ranking)
     reaction_count: Mapped[int] = mapped_column(Integer, default=0)
     comment_count: Mapped[int] = mapped_column(Integer, default=0)
+    # 1 for ACCLAIMED, 0 otherwise. Generated so the engagement sort
+    # (acclaim_rank, reaction_count, created_at, id) is all-DESC and can be
+    # served by one composite index with row-value keyset pagination.
+    acclaim_rank: Mapped[int] = mapped_column(
+        Integer,
+        Computed("CASE WHEN status = 'ACCLAIMED' THEN 1 ELSE 0 END", persisted=True),
+    )
 
     # Revision tracking
     revision_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1443,6 +1561,22 @@ class Story(Base):
         Index("story_created_at_idx", "created_at"),
         Index("story_status_idx", "status"),
         Index("story_x_post_id_idx", "x_post_id"),
+        Index(
+            "story_engagement_idx",
+            text("acclaim_rank DESC"),
+            text("reaction_count DESC"),
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "story_world_engagement_idx",
+            "world_id",
+            text("acclaim_rank DESC"),
+            text("reaction_count DESC"),
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index("story_world_recent_idx", "world_id", text("created_at DESC"), text("id DESC")),
     )
 
 
@@ -1904,6 +2038,16 @@ class StoryArc(Base):
     # Ordered list of story UUIDs in the arc
     story_ids: Mapped[list[str]] = mapped_column(JSONB, default=list, nullable=False)
 
+    # One-sentence LLM summary, generated off the read path by
+    # refresh_arc_summaries. summary_source fingerprints the first and latest
+    # story it was written from, summary_updated_at the arc updated_at it
+    # describes; the arc is stale once updated_at moves past it.
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_source: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    summary_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -1944,6 +2088,17 @@ class DwellerRelationship(Base):
         ForeignKey("platform_dwellers.id", ondelete="CASCADE"),
         nullable=False,
     )
+    # Both dwellers always live in the same world; denormalized so the graph
+    # read path can filter by world without joining or IN-listing dwellers.
+    world_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("platform_worlds.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    # DwellerGraphVersion.version of the world at the time this edge last changed
+    graph_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
     co_occurrence_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     semantic_similarity: Mapped[float | None] = mapped_column(Float, nullable=True)
     combined_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
@@ -1972,6 +2127,28 @@ class DwellerRelationship(Base):
         Index("idx_dweller_rel_a", "dweller_a_id"),
         Index("idx_dweller_rel_b", "dweller_b_id"),
         Index("idx_dweller_rel_score", "combined_score"),
+        Index("idx_dweller_rel_world_version", "world_id", "graph_version"),
+    )
+
+
+class DwellerGraphVersion(Base):
+    """Per-world version counter for the dweller relationship graph.
+
+    Bumped by every relationship write and by dweller creation. Graph payloads
+    are cached per (world_id, min_weight, version), and clients can fetch only
+    the edges stamped with a version newer than the one they hold.
+    """
+
+    __tablename__ = "platform_dweller_graph_versions"
+
+    world_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("platform_worlds.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
 
@@ -1981,6 +2158,10 @@ class FeedEvent(Base):
     Each row captures a single platform event (dweller action, story published,
     world created, etc.) with a typed payload. Optional FKs associate the event
     with the relevant entities. Rows are never updated — only inserted.
+
+    Range-partitioned by month on created_at (utils/feed_partitions.py creates
+    upcoming partitions and archives old ones), so the primary key includes
+    created_at. A DEFAULT partition catches rows outside the monthly ranges.
     """
 
     __tablename__ = "platform_feed_events"
@@ -1990,7 +2171,7 @@ class FeedEvent(Base):
     )
     event_type: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
     )
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
 
@@ -2023,16 +2204,28 @@ class FeedEvent(Base):
     story: Mapped["Story | None"] = relationship("Story")
 
     __table_args__ = (
-        Index("feed_events_created_at_idx", "created_at"),
+        # Keyset pagination order: (created_at, id) DESC
+        Index("feed_events_created_at_id_idx", text("created_at DESC"), text("id DESC")),
         Index("feed_events_event_type_idx", "event_type"),
         Index(
             "feed_events_world_id_idx",
             "world_id",
             postgresql_where=text("world_id IS NOT NULL"),
         ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
+event.listen(
+    FeedEvent.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS platform_feed_events_default "
+        "PARTITION OF platform_feed_events DEFAULT"
+    ),
+)
+
+
 class ExternalFeedback(Base):
     """External platform feedback on stories (X/Twitter replies, quotes, likes).
 
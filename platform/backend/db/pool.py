@@ -0,0 +1,72 @@
+"""Connection pool with checkout-wait accounting.
+
+TimedQueuePool is AsyncAdaptedQueuePool plus counters for how long callers
+waited for a connection, so pool pressure shows up in /health/ready before
+it turns into QueuePool timeouts.
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def _do_get(self):
+        self.checkouts += 1
+        # Only an empty pool at its overflow limit blocks; opening a new
+        # connection isn't waiting on the pool
+        exhausted = (
+            self._pool.empty()
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+        if not exhausted:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - started) * 1000
+            self.waits += 1
+            self.wait_ms_total += waited_ms
+            self.wait_ms_max = max(self.wait_ms_max, waited_ms)
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    """Usage and wait counters for a pool, from in-process state (no I/O)."""
+    if not hasattr(pool, "checkedout"):
+        # NullPool/StaticPool: nothing to saturate
+        return {"size": None, "checked_out": None, "overflow": None, "capacity": None, "saturation": 0.0}
+    size = pool.size()
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    stats: dict[str, Any] = {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "waits": pool.waits,
+            "timeouts": pool.timeouts,
+            "wait_ms_avg": round(pool.wait_ms_total / pool.waits, 1) if pool.waits else 0.0,
+            "wait_ms_max": round(pool.wait_ms_max, 1),
+        })
+    return stats
@@ -40,11 +40,21 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from api import auth_router, feed_router, worlds_router, social_router, proposals_router, dwellers_router, dweller_graph_router, dweller_proposals_router, aspects_router, agents_router, platform_router, suggestions_router, events_router, actions_router, notifications_router, heartbeat_router, stories_router, feedback_router, media_router, reviews_router, x_feedback_router, arcs_router, admin_router
-from db import init_db, verify_schema_version
-from db import engine as db_engine
-from services.action_queue_worker import run_action_queue_worker
+from db import init_db
+from db import engine as db_engine, background_engine as db_background_engine
+from services.action_queue_worker import action_queue_metrics
+from services.background_jobs import BACKGROUND_JOBS_IN_PROCESS, BackgroundJobs
+from services.x_feedback_monitor import close_x_client
 from utils.deployment import get_retry_after_seconds, resolve_deployment_status
+from utils.embeddings import close_openai_client
+from utils.health import get_health_snapshot, readiness, run_health_monitor
+from utils.query_stats import install_query_stats
+from utils.static_docs import (
+    RenderedDoc, get_doc, preload_docs, resolve_heartbeat_path, resolve_skill_path,
+)
 instrument_sqlalchemy(db_engine.sync_engine)
+instrument_sqlalchemy(db_background_engine.sync_engine)
+install_query_stats()
 
 # =============================================================================
 # Configuration
@@ -63,28 +73,10 @@ logger = logging.getLogger(__name__)
 # Skill file versioning — extracted from skill.md header at startup
 import re as _re
 
-def _resolve_skill_path() -> Path:
-    """Find skill.md: local copy (Railway) or sibling public dir (dev)."""
-    local = Path(__file__).parent / "skill.md"
-    if local.exists():
-        return local
-    return Path(__file__).parent.parent / "public" / "skill.md"
-
-_skill_path = _resolve_skill_path()
+_skill_path = resolve_skill_path()
 _version_match = _re.search(r"^>\s*Version:\s*([\d.]+)", _skill_path.read_text(encoding="utf-8"), _re.MULTILINE) if _skill_path.exists() else None
 SKILL_VERSION = _version_match.group(1) if _version_match else "0.0.0"
 
-
-def render_doc_template(template: str) -> str:
-    """Replace {{SITE_URL}}, {{API_URL}}, {{API_BASE}} tokens with env-aware values."""
-    site_url = os.getenv("NEXT_PUBLIC_SITE_URL", "http://localhost:3000").rstrip("/")
-    api_url = os.getenv("NEXT_PUBLIC_API_URL", "http://localhost:8000/api").rstrip("/")
-    api_base = api_url.removesuffix("/api")
-    return (template
-        .replace("{{SITE_URL}}", site_url)
-        .replace("{{API_URL}}", api_url)
-        .replace("{{API_BASE}}", api_base))
-
 # =============================================================================
 # Rate Limiting
 # =============================================================================
@@ -92,44 +84,53 @@ def render_doc_template(template: str) -> str:
 # Disable rate limiting in test mode
 IS_TESTING = os.getenv("TESTING", "").lower() == "true"
 limiter = Limiter(key_func=get_remote_address, enabled=not IS_TESTING)
-ACTION_QUEUE_WORKER_ENABLED = os.getenv("ACTION_QUEUE_WORKER_ENABLED", "true").lower() == "true"
 
-_action_queue_worker_task: asyncio.Task | None = None
-_action_queue_worker_stop_event: asyncio.Event | None = None
+_background_jobs = BackgroundJobs()
+_health_monitor_task: asyncio.Task | None = None
+_health_monitor_stop_event: asyncio.Event | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global _action_queue_worker_task, _action_queue_worker_stop_event
+    global _health_monitor_task, _health_monitor_stop_event
 
     # Startup
     logger.info("Starting Deep Sci-Fi Platform...")
     await init_db()
     logger.info("Database initialized")
 
-    if ACTION_QUEUE_WORKER_ENABLED and not IS_TESTING:
-        _action_queue_worker_stop_event = asyncio.Event()
-        _action_queue_worker_task = asyncio.create_task(
-            run_action_queue_worker(_action_queue_worker_stop_event)
+    preload_docs()
+
+    if not IS_TESTING:
+        _health_monitor_stop_event = asyncio.Event()
+        _health_monitor_task = asyncio.create_task(
+            run_health_monitor(_health_monitor_stop_event)
         )
-        logger.info("Action queue worker started")
+
+    if BACKGROUND_JOBS_IN_PROCESS and not IS_TESTING:
+        _background_jobs.start()
 
     # Note: Scheduler disabled for crowdsourced model
     # External agents now drive content creation via proposals API
 
     yield
 
-    if _action_queue_worker_stop_event is not None:
-        _action_queue_worker_stop_event.set()
-    if _action_queue_worker_task is not None:
+    await _background_jobs.stop()
+
+    if _health_monitor_stop_event is not None:
+        _health_monitor_stop_event.set()
+    if _health_monitor_task is not None:
         try:
-            await _action_queue_worker_task
+            await _health_monitor_task
         except Exception:
-            logger.exception("Action queue worker shutdown failed")
+            logger.exception("Health monitor shutdown failed")
         finally:
-            _action_queue_worker_task = None
-            _action_queue_worker_stop_event = None
+            _health_monitor_task = None
+            _health_monitor_stop_event = None
+
+    await close_x_client()
+    await close_openai_client()
 
     # Shutdown
     logger.info("Shutting down Deep Sci-Fi Platform...")
@@ -666,6 +667,14 @@ app.add_middleware(IdempotencyMiddleware)
 from middleware import AgentContextMiddleware
 app.add_middleware(AgentContextMiddleware)
 
+# SQL accounting - Server-Timing + per-request query logs (outermost, so it counts the middleware above)
+from middleware import QueryStatsMiddleware
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-request profiling - X-Profile: <admin key> samples the request (outermost, so it sees everything)
+from middleware import ProfilingMiddleware
+app.add_middleware(ProfilingMiddleware)
+
 # Register routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(feed_router, prefix="/api")
@@ -742,8 +751,10 @@ async def health():
     - schema: Schema version verification details
 
     In production, schema drift means migrations weren't run during deployment.
+    Schema status comes from the background health monitor, not a query per call.
     """
-    schema_status = await verify_schema_version()
+    snapshot = await get_health_snapshot()
+    schema_status = snapshot.schema
     deployment_status = resolve_deployment_status(schema_status["is_current"])
 
     response: dict[str, object] = {
@@ -762,8 +773,45 @@ async def health():
     return response
 
 
+@app.get("/health/live")
+@app.get("/api/health/live")
+async def health_live():
+    """Liveness probe: the process is up and serving. No I/O."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+@app.get("/api/health/ready")
+async def health_ready():
+    """Readiness probe served from the health monitor's in-memory snapshot.
+
+    503 when the database is unreachable, the snapshot is stale, the
+    connection pool is saturated or the event loop is lagging. Deploys and
+    schema drift are reported but stay 200, as with /health. Action queue
+    metrics are informational and don't affect readiness.
+    """
+    report = readiness(await get_health_snapshot())
+    report["deployment_status"] = resolve_deployment_status(report["schema"]["is_current"])
+    report["action_queue"] = action_queue_metrics()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+def _doc_response(request: Request, doc: RenderedDoc, headers: dict[str, str]):
+    """Serve a preloaded document, honoring If-None-Match and Accept-Encoding."""
+    from starlette.responses import Response as StarletteResponse
+
+    headers = {**headers, "ETag": doc.etag, "Vary": "Accept-Encoding"}
+    if doc.matches(request.headers.get("if-none-match")):
+        return StarletteResponse(status_code=304, headers=headers)
+
+    body, encoding = doc.encoded(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StarletteResponse(content=body, media_type="text/markdown", headers=headers)
+
+
 @app.get("/skill.md")
-async def skill_md():
+async def skill_md(request: Request):
     """
     Return the skill.md file for agent onboarding.
 
@@ -772,28 +820,15 @@ async def skill_md():
 
     Headers:
     - X-Skill-Version: Current version of the skill file
-    - ETag: Content hash for conditional requests
+    - ETag: Content hash; send it back as If-None-Match to get a 304
     - Cache-Control: Cache for 1 hour, then revalidate
     """
-    from starlette.responses import Response as StarletteResponse
-    from pathlib import Path
-    import hashlib
-
-    skill_path = _resolve_skill_path()
-    if skill_path.exists():
-        raw = skill_path.read_text(encoding="utf-8")
-        rendered = render_doc_template(raw)
-        etag = hashlib.md5(rendered.encode("utf-8")).hexdigest()
-
-        return StarletteResponse(
-            content=rendered,
-            media_type="text/markdown",
-            headers={
-                "X-Skill-Version": SKILL_VERSION,
-                "ETag": f'"{etag}"',
-                "Cache-Control": "public, max-age=3600, must-revalidate",
-            },
-        )
+    doc = get_doc(resolve_skill_path())
+    if doc is not None:
+        return _doc_response(request, doc, {
+            "X-Skill-Version": SKILL_VERSION,
+            "Cache-Control": "public, max-age=3600, must-revalidate",
+        })
     else:
         from fastapi.responses import PlainTextResponse
         return PlainTextResponse(
@@ -810,27 +845,19 @@ async def skill_version():
     Agents can poll this to know when to re-fetch /skill.md.
     Much lighter than downloading the full file.
     """
-    from pathlib import Path
-    import hashlib
-
-    skill_path = _resolve_skill_path()
-    etag = ""
-    if skill_path.exists():
-        raw = skill_path.read_text(encoding="utf-8")
-        rendered = render_doc_template(raw)
-        etag = hashlib.md5(rendered.encode("utf-8")).hexdigest()
+    doc = get_doc(resolve_skill_path())
 
     return {
         "version": SKILL_VERSION,
-        "etag": etag,
+        "etag": doc.digest if doc is not None else "",
         "url": "/skill.md",
-        "cache_guidance": "Cache /skill.md locally. Re-fetch when version changes.",
+        "cache_guidance": "Cache /skill.md locally. Re-fetch when version changes, or revalidate with If-None-Match.",
         "update_detection": "Send X-Skill-Version header with your cached version on all API requests. Responses will include skill_update in _agent_context when an update is available.",
     }
 
 
 @app.get("/heartbeat.md")
-async def heartbeat_md():
+async def heartbeat_md(request: Request):
     """
     Return the heartbeat.md file for agent activity tracking.
 
@@ -838,17 +865,11 @@ async def heartbeat_md():
     automatically calls our heartbeat endpoint periodically.
     Standard in the OpenClaw/Moltbot ecosystem.
     """
-    from starlette.responses import Response as StarletteResponse
-    from pathlib import Path
-
-    heartbeat_path = Path(__file__).parent.parent / "public" / "heartbeat.md"
-    if heartbeat_path.exists():
-        raw = heartbeat_path.read_text(encoding="utf-8")
-        rendered = render_doc_template(raw)
-        return StarletteResponse(
-            content=rendered,
-            media_type="text/markdown",
-        )
+    doc = get_doc(resolve_heartbeat_path())
+    if doc is not None:
+        return _doc_response(request, doc, {
+            "Cache-Control": "public, max-age=3600, must-revalidate",
+        })
     else:
         from fastapi.responses import PlainTextResponse
         return PlainTextResponse(
@@ -2,5 +2,7 @@
 
 from .agent_context import AgentContextMiddleware
 from .idempotency import IdempotencyMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
 
-__all__ = ["AgentContextMiddleware", "IdempotencyMiddleware"]
+__all__ = ["AgentContextMiddleware", "IdempotencyMiddleware", "ProfilingMiddleware", "QueryStatsMiddleware"]
@@ -13,12 +13,13 @@ from sqlalchemy.orm import selectinload
 
 from db import (
     SessionLocal, User, ApiKey, Notification, NotificationStatus,
-    Proposal, ProposalStatus, Validation, World, Dweller,
-    Aspect, AspectStatus, AspectValidation,
+    Proposal, ProposalStatus, Dweller, Aspect,
     ReviewFeedback, FeedbackItem, FeedbackItemStatus, FeedbackResponse,
     Story,
 )
 from api.auth import hash_api_key
+from utils.json_response import dumps as dump_json, loads as load_json
+from utils.validation_queue import get_validation_queue, get_world_count
 
 
 MAX_ACTIVE_PROPOSALS = 3
@@ -209,53 +210,10 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
 async def _build_suggested_actions(db, user_id) -> list[dict]:
     """Build generic menu of available actions with counts."""
 
-    # Proposals awaiting review (not yours, not already reviewed by you)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    proposals_awaiting = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(validated_subq),
-        )
-    ) or 0
-
-    # Also count proposals needing critical review (not reviewed by you)
-    reviewed_subq = (
-        select(ReviewFeedback.content_id)
-        .where(
-            ReviewFeedback.reviewer_id == user_id,
-            ReviewFeedback.content_type == "proposal",
-        )
-        .scalar_subquery()
-    )
-    proposals_needing_review = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(reviewed_subq),
-        )
-    ) or 0
-
-    # Aspects awaiting review
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    aspects_awaiting = await db.scalar(
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != user_id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    ) or 0
+    # Proposals and aspects awaiting review (not yours, not already reviewed by you)
+    queue = await get_validation_queue(db)
+    proposals_needing_review = len(queue.proposals_to_review(user_id))
+    aspects_awaiting = len(queue.aspects_to_validate(user_id))
 
     # Your dwellers
     dweller_count = await db.scalar(
@@ -263,7 +221,7 @@ async def _build_suggested_actions(db, user_id) -> list[dict]:
     ) or 0
 
     # Approved worlds
-    world_count = await db.scalar(select(func.count(World.id))) or 0
+    world_count = await get_world_count(db)
 
     # Your active proposals
     own_proposals = await db.scalar(
@@ -326,7 +284,10 @@ def _get_skill_version() -> str:
 class AgentContextMiddleware:
     """Pure ASGI middleware to inject agent context into authenticated JSON responses."""
 
-    SKIP_PATHS = {"/", "/health", "/api/health", "/docs", "/openapi.json", "/skill.md", "/heartbeat.md"}
+    SKIP_PATHS = {
+        "/", "/health", "/api/health", "/api/health/live", "/api/health/ready",
+        "/docs", "/openapi.json", "/skill.md", "/heartbeat.md",
+    }
 
     def __init__(self, app):
         self.app = app
@@ -387,7 +348,7 @@ class AgentContextMiddleware:
 
         if status_code < 400 and "application/json" in content_type:
             try:
-                data = json.loads(body)
+                data = load_json(body)
                 if isinstance(data, dict):
                     try:
                         user = await get_user_from_api_key(api_key)
@@ -414,7 +375,7 @@ class AgentContextMiddleware:
                                     "fetch_url": "/skill.md",
                                 }
                             data["_agent_context"] = agent_context
-                            body = json.dumps(data).encode()
+                            body = dump_json(data)
 
                             response_headers = [
                                 (k, v) for k, v in response_headers
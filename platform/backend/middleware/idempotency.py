@@ -2,26 +2,113 @@
 
 Checks X-Idempotency-Key header on POST/PUT/PATCH requests.
 If key exists and completed: returns stored response (no re-execution).
-If key exists and in-progress: returns 409 Conflict.
-If new: executes request, stores response.
+If key exists and in-progress on this instance: waits for the original
+request and returns its response.
+If key exists and in-progress elsewhere: returns 409 Conflict.
+If new (or failed, or older than the 24h TTL): executes request, stores response.
 
 Usage (agent):
     X-Idempotency-Key: <uuid>
 
 Generate a new UUID for each unique action. Reuse the same UUID when retrying.
+
+Each request uses one session: a single statement authenticates the API key
+and claims the idempotency key (INSERT ... ON CONFLICT ... RETURNING), and
+one UPDATE stores the result. Response bodies are stored as zlib-compressed
+bytes and replayed verbatim.
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Any
+import os
+import zlib
+from dataclasses import dataclass, field
 from uuid import UUID
-from sqlalchemy import select, text
 
-from db import SessionLocal
+from sqlalchemy import text
+
+import db as db_module
+from services.action_resilience import ACTION_IDEMPOTENCY_TTL_HOURS
 
 logger = logging.getLogger(__name__)
 
+# How long a duplicate waits for the original request on this instance
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+
+# Authenticate and claim in one round trip. The claim succeeds for a new
+# key, or takes over a failed or expired one; otherwise the existing row is
+# returned as it was when the statement started.
+CLAIM_SQL = text(
+    """
+    WITH caller AS (
+        SELECT user_id FROM platform_api_keys
+        WHERE key_hash = :key_hash AND is_revoked = false
+        LIMIT 1
+    ), claimed AS (
+        INSERT INTO platform_idempotency_keys AS k (key, user_id, endpoint, status, created_at)
+        SELECT :key, user_id, :endpoint, 'in_progress', now() FROM caller
+        ON CONFLICT (key) DO UPDATE
+        SET user_id = excluded.user_id,
+            endpoint = excluded.endpoint,
+            status = 'in_progress',
+            created_at = excluded.created_at,
+            response_status = NULL,
+            response_body = NULL,
+            response_blob = NULL,
+            response_content_type = NULL,
+            completed_at = NULL
+        WHERE k.status = 'failed'
+           OR k.created_at < now() - make_interval(hours => :ttl_hours)
+        RETURNING key
+    )
+    SELECT
+        (SELECT user_id FROM caller) AS user_id,
+        EXISTS (SELECT 1 FROM claimed) AS claimed,
+        k.status,
+        k.response_status,
+        k.response_body,
+        k.response_blob,
+        k.response_content_type
+    FROM (SELECT 1) AS one
+    LEFT JOIN platform_idempotency_keys k ON k.key = :key
+    """
+)
+
+STORE_SQL = text(
+    """
+    UPDATE platform_idempotency_keys
+    SET status = :status,
+        response_status = :response_status,
+        response_blob = :response_blob,
+        response_content_type = :response_content_type,
+        completed_at = now()
+    WHERE key = :key
+    """
+)
+
+
+@dataclass
+class StoredResponse:
+    """A completed response, as replayed to duplicates."""
+
+    status: int
+    body: bytes
+    content_type: str = "application/json"
+
+
+@dataclass
+class _InFlight:
+    """A request currently executing on this instance under an idempotency key."""
+
+    key_hash: str
+    # Resolves to the StoredResponse, or None if it failed or sent an error
+    done: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+# Idempotency key -> request executing on this instance
+_in_flight: dict[str, _InFlight] = {}
+
 
 class IdempotencyMiddleware:
     """Pure ASGI middleware for idempotent POST/PUT/PATCH requests.
@@ -89,49 +176,86 @@ class IdempotencyMiddleware:
             )
             return
 
-        # Get user_id from API key
-        user_id = await self._get_user_id_from_api_key(api_key)
-        if not user_id:
-            await self._send_error(send, 401, {"error": "Invalid API key"})
+        from api.auth import hash_api_key
+
+        key_hash = hash_api_key(api_key)
+
+        # The first request for a key on this instance runs it; duplicates from
+        # the same caller wait for its result instead of hitting the database.
+        in_flight = _in_flight.get(idempotency_key)
+        if in_flight is None:
+            in_flight = _in_flight[idempotency_key] = _InFlight(key_hash=key_hash)
+            try:
+                stored = await self._handle(scope, receive, send, idempotency_key, key_hash, path)
+                in_flight.done.set_result(stored)
+            except BaseException:
+                in_flight.done.set_result(None)
+                raise
+            finally:
+                del _in_flight[idempotency_key]
             return
 
-        # Check for existing idempotency key
-        endpoint = path
-        existing = await self._get_idempotency_record(idempotency_key)
-
-        if existing:
-            # Key exists — check status
-            if existing["status"] == "in_progress":
-                await self._send_error(
-                    send,
-                    409,
-                    {
-                        "error": "Request is being processed",
-                        "idempotency_key": idempotency_key,
-                        "how_to_fix": "Wait for the original request to complete, then retry with the same key to get the result.",
-                    }
-                )
+        if in_flight.key_hash == key_hash:
+            stored = await self._wait_for(in_flight)
+            if stored is not None:
+                await self._send_stored_response(send, stored)
                 return
-            elif existing["status"] == "completed":
-                # Return stored response
-                await self._send_stored_response(send, existing)
+            if not in_flight.done.done():
+                await self._send_in_progress(send, idempotency_key)
                 return
-            # If failed, allow retry (fall through to execute)
+        # Original failed, or another caller reused the key: go by the database
+        await self._handle(scope, receive, send, idempotency_key, key_hash, path)
+
+    async def _handle(
+        self, scope, receive, send, idempotency_key: str, key_hash: str, path: str
+    ) -> StoredResponse | None:
+        """Claim the key and execute, or replay its stored response.
+
+        Returns the response sent, or None if an error (401/409) was sent.
+        """
+        async with db_module.SessionLocal() as db:
+            claim = (await db.execute(CLAIM_SQL, {
+                "key": idempotency_key,
+                "key_hash": key_hash,
+                "endpoint": path,
+                "ttl_hours": ACTION_IDEMPOTENCY_TTL_HOURS,
+            })).mappings().one()
+            await db.commit()
+
+            if claim["user_id"] is None:
+                await self._send_error(send, 401, {"error": "Invalid API key"})
+                return None
+
+            if claim["claimed"]:
+                return await self._execute(scope, receive, send, db, idempotency_key)
 
-        # New key or retry after failure — insert in_progress, execute, store result
-        await self._insert_in_progress(idempotency_key, user_id, endpoint)
+        if claim["status"] == "completed":
+            stored = self._load_stored_response(claim)
+            await self._send_stored_response(send, stored)
+            return stored
+        # Running on another instance
+        await self._send_in_progress(send, idempotency_key)
+        return None
 
+    @staticmethod
+    async def _wait_for(in_flight: _InFlight) -> StoredResponse | None:
+        """The original request's response, or None if it failed or timed out."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(in_flight.done), IDEMPOTENCY_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _execute(self, scope, receive, send, db, idempotency_key: str) -> StoredResponse:
+        """Run the request, store its response, then send it to the client."""
         # Capture response
-        response_started = False
         status_code = 200
         response_headers = []
         body_parts = []
 
         async def capture_send(message):
-            nonlocal response_started, status_code, response_headers
+            nonlocal status_code, response_headers
 
             if message["type"] == "http.response.start":
-                response_started = True
                 status_code = message.get("status", 200)
                 response_headers = list(message.get("headers", []))
                 # Don't send yet — buffer until we see the body
@@ -143,29 +267,33 @@ class IdempotencyMiddleware:
             await self.app(scope, receive, capture_send)
         except Exception as e:
             logger.error(f"Idempotency: request execution failed: {e}")
-            # Mark as failed
-            await self._update_idempotency_record(
-                idempotency_key,
-                status="failed",
-                response_status=500,
-                response_body={"error": "Internal server error"},
-            )
+            # Mark as failed so a retry can claim the key again
+            await db.rollback()
+            await db.execute(STORE_SQL, {
+                "key": idempotency_key,
+                "status": "failed",
+                "response_status": 500,
+                "response_blob": None,
+                "response_content_type": None,
+            })
+            await db.commit()
             raise
 
         body = b"".join(body_parts)
+        content_type = next(
+            (value.decode("latin-1") for key, value in response_headers if key.lower() == b"content-type"),
+            "application/json",
+        )
 
         # Store response
-        try:
-            response_body = json.loads(body) if body else None
-        except json.JSONDecodeError:
-            response_body = {"raw": body.decode("utf-8", errors="replace")}
-
-        await self._update_idempotency_record(
-            idempotency_key,
-            status="completed",
-            response_status=status_code,
-            response_body=response_body,
-        )
+        await db.execute(STORE_SQL, {
+            "key": idempotency_key,
+            "status": "completed",
+            "response_status": status_code,
+            "response_blob": zlib.compress(body),
+            "response_content_type": content_type,
+        })
+        await db.commit()
 
         # Send response to client
         await send({
@@ -177,82 +305,33 @@ class IdempotencyMiddleware:
             "type": "http.response.body",
             "body": body,
         })
-
-    async def _get_user_id_from_api_key(self, api_key: str) -> str | None:
-        """Get user_id from API key hash."""
-        from api.auth import hash_api_key
-
-        key_hash = hash_api_key(api_key)
-
-        async with SessionLocal() as db:
-            query = text(
-                "SELECT user_id FROM platform_api_keys WHERE key_hash = :key_hash AND is_revoked = false"
+        return StoredResponse(status=status_code, body=body, content_type=content_type)
+
+    @staticmethod
+    def _load_stored_response(row) -> StoredResponse:
+        """Decode a completed row; rows from before 0043 only have JSON response_body."""
+        status_code = row["response_status"] or 200
+        if row["response_blob"] is not None:
+            return StoredResponse(
+                status=status_code,
+                body=zlib.decompress(row["response_blob"]),
+                content_type=row["response_content_type"] or "application/json",
             )
-            result = await db.execute(query, {"key_hash": key_hash})
-            row = result.fetchone()
-            return str(row[0]) if row else None
-
-    async def _get_idempotency_record(self, key: str) -> dict[str, Any] | None:
-        """Check if idempotency key exists."""
-        async with SessionLocal() as db:
-            query = text(
-                "SELECT status, response_status, response_body FROM platform_idempotency_keys WHERE key = :key"
-            )
-            result = await db.execute(query, {"key": key})
-            row = result.fetchone()
-            if not row:
-                return None
-            return {
-                "status": row[0],
-                "response_status": row[1],
-                "response_body": row[2],
+        response_body = row["response_body"]
+        if isinstance(response_body, str):
+            response_body = json.loads(response_body)
+        return StoredResponse(status=status_code, body=json.dumps(response_body or {}).encode())
+
+    async def _send_in_progress(self, send, idempotency_key: str):
+        await self._send_error(
+            send,
+            409,
+            {
+                "error": "Request is being processed",
+                "idempotency_key": idempotency_key,
+                "how_to_fix": "Wait for the original request to complete, then retry with the same key to get the result.",
             }
-
-    async def _insert_in_progress(self, key: str, user_id: str, endpoint: str):
-        """Insert in_progress idempotency record."""
-        async with SessionLocal() as db:
-            query = text(
-                """
-                INSERT INTO platform_idempotency_keys (key, user_id, endpoint, status, created_at)
-                VALUES (:key, :user_id, :endpoint, 'in_progress', :created_at)
-                ON CONFLICT (key) DO NOTHING
-                """
-            )
-            await db.execute(query, {
-                "key": key,
-                "user_id": user_id,
-                "endpoint": endpoint,
-                "created_at": datetime.now(timezone.utc),
-            })
-            await db.commit()
-
-    async def _update_idempotency_record(
-        self,
-        key: str,
-        status: str,
-        response_status: int,
-        response_body: Any,
-    ):
-        """Update idempotency record with response."""
-        async with SessionLocal() as db:
-            query = text(
-                """
-                UPDATE platform_idempotency_keys
-                SET status = :status,
-                    response_status = :response_status,
-                    response_body = :response_body,
-                    completed_at = :completed_at
-                WHERE key = :key
-                """
-            )
-            await db.execute(query, {
-                "key": key,
-                "status": status,
-                "response_status": response_status,
-                "response_body": json.dumps(response_body) if response_body else None,
-                "completed_at": datetime.now(timezone.utc),
-            })
-            await db.commit()
+        )
 
     async def _send_error(self, send, status_code: int, detail: dict):
         """Send error response."""
@@ -270,22 +349,18 @@ class IdempotencyMiddleware:
             "body": body,
         })
 
-    async def _send_stored_response(self, send, existing: dict):
-        """Send stored response from idempotency record."""
-        status_code = existing.get("response_status", 200)
-        response_body = existing.get("response_body", {})
-
-        body = json.dumps(response_body).encode()
+    async def _send_stored_response(self, send, stored: StoredResponse):
+        """Send a stored response byte-for-byte."""
         await send({
             "type": "http.response.start",
-            "status": status_code,
+            "status": stored.status,
             "headers": [
-                (b"content-type", b"application/json"),
-                (b"content-length", str(len(body)).encode()),
+                (b"content-type", stored.content_type.encode("latin-1")),
+                (b"content-length", str(len(stored.body)).encode()),
                 (b"x-idempotent-replay", b"true"),  # Signal that this is a replayed response
             ],
         })
         await send({
             "type": "http.response.body",
-            "body": body,
+            "body": stored.body,
         })
@@ -0,0 +1,51 @@
+"""On-demand profile of a single request.
+
+Send the admin API key in X-Profile and the request is sampled with
+utils.profiling.SamplingProfiler (restricted to the request's own task, so
+concurrent requests don't show up; neither do tasks the request spawns with
+asyncio.gather or create_task). The response carries X-Profile-Id;
+download the flamegraph from GET /api/admin/profiling/profiles/{id}.
+Requests without the header, or with any other value, pass straight through.
+
+Outermost middleware, so the stacks include the middleware below it.
+"""
+
+import asyncio
+
+from api.auth import is_admin_key
+from utils.profiling import SamplingProfiler, store_profile
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware: sample the request's task when X-Profile holds the admin key."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = next((v for k, v in scope.get("headers", []) if k == b"x-profile"), None)
+        if key is None or not is_admin_key(key.decode("latin-1").strip()):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(
+            f"{scope.get('method')} {scope.get('path')}", task=asyncio.current_task()
+        )
+        store_profile(profiler)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profiler.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
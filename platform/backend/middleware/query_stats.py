@@ -0,0 +1,65 @@
+"""Per-request SQL accounting (utils.query_stats) for every HTTP request.
+
+Adds a Server-Timing header:
+    Server-Timing: db;dur=12.3;desc="7 queries, 40 rows", app;dur=31.0
+plus db-repeats when a statement shape ran QUERY_STATS_REPEAT_THRESHOLD or
+more times (likely N+1). The header covers work done before the response
+starts; streamed bodies (SSE) query after that, so the log line written when
+the request finishes is the full account. Repeated shapes are logged as a
+warning with the statement.
+
+Outermost middleware, so idempotency and agent-context queries are counted.
+"""
+
+import logging
+import time
+
+import utils.query_stats as query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware: Server-Timing header and log fields for SQL per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not query_stats.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with query_stats.track_queries() as stats:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    app_ms = (time.perf_counter() - started) * 1000
+                    headers = [(k, v) for k, v in message.get("headers", []) if k != b"server-timing"]
+                    headers.append((b"server-timing", f"{stats.server_timing()}, app;dur={app_ms:.1f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                fields = {
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    **stats.log_fields(),
+                }
+                if fields["db_repeated_shapes"]:
+                    logger.warning(
+                        "Repeated SQL in %s %s (likely N+1): %s",
+                        fields["method"], fields["path"],
+                        "; ".join(f'{r["count"]}x {r["statement"]}' for r in fields["db_repeated_shapes"]),
+                        extra=fields,
+                    )
+                else:
+                    logger.debug(
+                        "%s %s: %d queries, %.1f ms in db",
+                        fields["method"], fields["path"], stats.count, stats.db_ms,
+                        extra=fields,
+                    )
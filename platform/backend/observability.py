@@ -6,11 +6,25 @@ Each wrapper is individually guarded so one failure never crashes the app.
 
 import logging
 import os
+from contextlib import nullcontext
 
 logger = logging.getLogger(__name__)
 
 _logfire_enabled = False
 
+try:
+    import logfire
+    _logfire_available = True
+except ImportError:
+    _logfire_available = False
+
+
+def span(name: str, **attributes):
+    """Return a logfire span if available, otherwise a no-op context manager."""
+    if _logfire_available:
+        return logfire.span(name, **attributes)
+    return nullcontext()
+
 
 def configure_logfire() -> bool:
     """Configure Logfire if LOGFIRE_TOKEN is set. Returns True if enabled."""
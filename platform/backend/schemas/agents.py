@@ -30,6 +30,7 @@ class AgentListResponse(PaginatedResponse):
     """Response for GET /agents."""
 
     agents: list[AgentListItem]
+    next_cursor: str | None = Field(None, description="Cursor for fetching the next page")
 
 
 # --- Agent profile ---
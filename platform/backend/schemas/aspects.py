@@ -200,3 +200,4 @@ class WorldCanonResponse(BaseModel):
     scientific_basis: str | None = None
     regions: list[dict[str, Any]] = []
     approved_aspects: list[ApprovedAspectSummary]
+    version: int | None = None
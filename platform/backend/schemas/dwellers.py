@@ -71,6 +71,7 @@ class WorldCanon(BaseModel):
     causal_chain: list[dict[str, Any]] = []
     scientific_basis: str | None = None
     regions: list[dict[str, Any]] = []
+    version: int | None = None
 
 
 class PersonaBlock(BaseModel):
@@ -620,6 +621,17 @@ class DwellerGraphResponse(BaseModel):
     nodes: list[GraphNode]
     edges: list[GraphEdge]
     clusters: list[GraphCluster] = []
+    version: str | None = None
+
+
+class DwellerGraphChangesResponse(BaseModel):
+    """GET /dwellers/graph/changes"""
+    world_id: str
+    since_version: int
+    version: int
+    full_refresh_required: bool = False
+    nodes: list[GraphNode]
+    edges: list[GraphEdge]
 
 
 # ============================================================================
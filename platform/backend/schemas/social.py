@@ -137,6 +137,7 @@ class CommentItem(BaseModel):
     reaction: str | None = None
     parent_id: str | None = None
     created_at: str
+    reply_count: int | None = None  # Set on top-level comments only
     user: CommentUserInfo | None = None
 
 
@@ -144,3 +145,5 @@ class CommentsResponse(BaseModel):
     """Response for GET /social/comments/{target_type}/{target_id}."""
 
     comments: list[CommentItem]
+    next_cursor: str | None = None
+    has_more: bool = False
@@ -164,6 +164,8 @@ class StoryListResponse(BaseModel):
     stories: list[dict]
     count: int
     filters: StoryListFilters
+    next_cursor: str | None = None
+    has_more: bool = False
 
 
 class AcclaimEligibility(BaseModel):
@@ -222,6 +224,8 @@ class WorldStoriesResponse(BaseModel):
     count: int
     sort: str
     status_filter: str | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
 
 
 class StoryReactResponse(BaseModel):
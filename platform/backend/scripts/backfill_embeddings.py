@@ -12,7 +12,7 @@ Requires:
 
 The script:
 1. Fetches all active worlds without a premise_embedding
-2. Generates text-embedding-3-small embeddings for each world
+2. Generates text-embedding-3-small embeddings in batched API requests
 3. Stores the embedding vector back to the database
 4. Prints a summary when done
 """
@@ -38,7 +38,11 @@ logger = logging.getLogger(__name__)
 async def backfill() -> None:
     from sqlalchemy import text
     from db.database import SessionLocal as AsyncSessionLocal
-    from utils.embeddings import generate_embedding, create_proposal_text_for_embedding
+    from utils.embeddings import (
+        EMBEDDING_BATCH_SIZE,
+        create_proposal_text_for_embedding,
+        generate_embeddings,
+    )
 
     async with AsyncSessionLocal() as db:
         # Find worlds without embeddings
@@ -63,10 +67,10 @@ async def backfill() -> None:
         success = 0
         failed = 0
 
-        for row in rows:
-            world_id = str(row.id)
-            name = row.name or "(unnamed)"
-            try:
+        for start in range(0, len(rows), EMBEDDING_BATCH_SIZE):
+            batch = rows[start:start + EMBEDDING_BATCH_SIZE]
+            texts = []
+            for row in batch:
                 # Build rich text for embedding
                 causal_chain = row.causal_chain or []
                 regions = row.regions or []
@@ -85,28 +89,34 @@ async def backfill() -> None:
                 )
                 if region_text:
                     text_for_emb += f"\n\n{region_text}"
+                texts.append(text_for_emb)
 
-                embedding = await generate_embedding(text_for_emb)
+            try:
+                # One API request per batch (cached texts are skipped)
+                embeddings = await generate_embeddings(texts)
 
                 # Store back — use raw SQL for vector literal
-                emb_str = "[" + ",".join(str(v) for v in embedding) + "]"
                 await db.execute(
                     text(
                         "UPDATE platform_worlds "
                         "SET premise_embedding = CAST(:emb AS vector) "
                         "WHERE id = :id"
                     ),
-                    {"emb": emb_str, "id": world_id},
+                    [
+                        {"emb": "[" + ",".join(str(v) for v in embedding) + "]", "id": str(row.id)}
+                        for row, embedding in zip(batch, embeddings)
+                    ],
                 )
                 await db.commit()
 
-                logger.info(f"  ✓ {name} ({world_id})")
-                success += 1
+                for row in batch:
+                    logger.info(f"  ✓ {row.name or '(unnamed)'} ({row.id})")
+                success += len(batch)
 
             except Exception as e:
-                logger.error(f"  ✗ {name} ({world_id}): {e}")
+                logger.error(f"  ✗ batch of {len(batch)} starting at {batch[0].name or '(unnamed)'}: {e}")
                 await db.rollback()
-                failed += 1
+                failed += len(batch)
 
         logger.info(
             f"\nDone: {success} succeeded, {failed} failed out of {len(rows)} worlds."
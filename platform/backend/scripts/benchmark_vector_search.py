@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Recall / latency benchmark: ANN index search vs exact cosine search.
+
+Usage:
+    cd platform/backend
+    source .venv/bin/activate
+    python scripts/benchmark_vector_search.py                      # synthetic, HNSW
+    python scripts/benchmark_vector_search.py --index ivfflat --lists 50
+    python scripts/benchmark_vector_search.py --rows 50000 --ef-search 80
+    python scripts/benchmark_vector_search.py --table platform_proposals --column premise_embedding
+
+Requires:
+    DATABASE_URL    — PostgreSQL connection string (pgvector installed)
+
+Synthetic mode loads --rows clustered random vectors into a temporary table,
+builds the index with the given parameters, and runs --queries searches
+(perturbed copies of stored vectors). Table mode benchmarks an existing
+embedding column and its index (migration 0037), using stored vectors as
+queries. Both modes run the same ORDER BY <=> LIMIT k query twice per probe —
+once through the index and once with index scans disabled (exact) — and
+report recall@k and p50/p95 latency for each.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load .env from platform/
+load_dotenv(Path(__file__).parent.parent.parent / ".env")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _random_unit(rng: random.Random, dim: int, center: list[float] | None = None, spread: float = 1.0) -> list[float]:
+    vec = [rng.gauss(0, spread) + (center[i] if center else 0.0) for i in range(dim)]
+    norm = sum(x * x for x in vec) ** 0.5 or 1.0
+    return [x / norm for x in vec]
+
+
+def _vector_literal(vec: list[float]) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vec) + "]"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _load_synthetic(db, args: argparse.Namespace, rng: random.Random) -> list[list[float]]:
+    from sqlalchemy import text
+
+    await db.execute(text(
+        f"CREATE TEMP TABLE bench_vectors (id serial PRIMARY KEY, embedding vector({args.dim}))"
+    ))
+    # Clustered data resembles real embeddings better than uniform noise
+    centers = [_random_unit(rng, args.dim) for _ in range(max(1, args.rows // 200))]
+    stored: list[list[float]] = []
+    batch: list[dict[str, str]] = []
+    for _ in range(args.rows):
+        vec = _random_unit(rng, args.dim, center=[c * 4 for c in rng.choice(centers)], spread=0.5)
+        stored.append(vec)
+        batch.append({"emb": _vector_literal(vec)})
+        if len(batch) == 500:
+            await db.execute(text("INSERT INTO bench_vectors (embedding) VALUES (CAST(:emb AS vector))"), batch)
+            batch = []
+    if batch:
+        await db.execute(text("INSERT INTO bench_vectors (embedding) VALUES (CAST(:emb AS vector))"), batch)
+
+    if args.index == "ivfflat":
+        using = f"ivfflat (embedding vector_cosine_ops) WITH (lists = {args.lists})"
+    else:
+        using = f"hnsw (embedding vector_cosine_ops) WITH (m = {args.m}, ef_construction = {args.ef_construction})"
+    started = time.perf_counter()
+    await db.execute(text(f"CREATE INDEX ON bench_vectors USING {using}"))
+    await db.execute(text("ANALYZE bench_vectors"))
+    logger.info("Loaded %d vectors, built %s index in %.1fs", args.rows, args.index,
+                time.perf_counter() - started)
+
+    return [
+        _random_unit(rng, args.dim, center=[x * 10 for x in rng.choice(stored)], spread=0.3)
+        for _ in range(args.queries)
+    ]
+
+
+async def _sample_queries(db, args: argparse.Namespace) -> list[list[float]]:
+    from sqlalchemy import text
+
+    result = await db.execute(text(
+        f"SELECT {args.column}::text FROM {args.table} WHERE {args.column} IS NOT NULL "
+        f"ORDER BY random() LIMIT :n"
+    ), {"n": args.queries})
+    return [[float(x) for x in row[0].strip("[]").split(",")] for row in result.fetchall()]
+
+
+async def _search(db, table: str, column: str, query: list[float], k: int, exact: bool) -> tuple[list, float]:
+    from sqlalchemy import text
+
+    await db.execute(text("SELECT set_config('enable_indexscan', :on, true)"),
+                     {"on": "off" if exact else "on"})
+    started = time.perf_counter()
+    result = await db.execute(text(
+        f"SELECT id FROM {table} WHERE {column} IS NOT NULL "
+        f"ORDER BY {column} <=> CAST(:q AS vector) LIMIT :k"
+    ), {"q": _vector_literal(query), "k": k})
+    ids = [row[0] for row in result.fetchall()]
+    return ids, (time.perf_counter() - started) * 1000
+
+
+async def run(args: argparse.Namespace) -> None:
+    from sqlalchemy import text
+    from db.database import SessionLocal
+    from utils.embeddings import set_vector_search_params
+    import utils.embeddings as embeddings
+
+    embeddings.VECTOR_SEARCH_EF = args.ef_search
+    embeddings.VECTOR_SEARCH_PROBES = args.probes
+    rng = random.Random(args.seed)
+
+    async with SessionLocal() as db:
+        if args.table:
+            table, column = args.table, args.column
+            queries = await _sample_queries(db, args)
+        else:
+            table, column = "bench_vectors", "embedding"
+            queries = await _load_synthetic(db, args, rng)
+        if not queries:
+            logger.error("No embeddings found in %s.%s", table, column)
+            return
+
+        recalls: list[float] = []
+        ann_ms: list[float] = []
+        exact_ms: list[float] = []
+        for query in queries:
+            await set_vector_search_params(db)
+            ann_ids, ann_time = await _search(db, table, column, query, args.k, exact=False)
+            exact_ids, exact_time = await _search(db, table, column, query, args.k, exact=True)
+            if exact_ids:
+                recalls.append(len(set(ann_ids) & set(exact_ids)) / len(exact_ids))
+            ann_ms.append(ann_time)
+            exact_ms.append(exact_time)
+
+        await db.execute(text("SELECT set_config('enable_indexscan', 'on', true)"))
+        plan = await db.execute(text(
+            f"EXPLAIN SELECT id FROM {table} ORDER BY {column} <=> CAST(:q AS vector) LIMIT {args.k}"
+        ), {"q": _vector_literal(queries[0])})
+        uses_index = any("Index Scan" in row[0] for row in plan.fetchall())
+        await db.rollback()
+
+    print(f"\n{table}.{column}: {len(queries)} queries, k={args.k}, "
+          f"ef_search={args.ef_search}, probes={args.probes}, index used={uses_index}")
+    print(f"  recall@{args.k}:  mean {statistics.mean(recalls):.3f}  min {min(recalls):.3f}")
+    print(f"  ANN   latency: p50 {_percentile(ann_ms, 50):7.2f} ms  p95 {_percentile(ann_ms, 95):7.2f} ms")
+    print(f"  exact latency: p50 {_percentile(exact_ms, 50):7.2f} ms  p95 {_percentile(exact_ms, 95):7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pgvector ANN search against exact search")
+    parser.add_argument("--table", help="Existing table to benchmark (default: synthetic temp table)")
+    parser.add_argument("--column", default="premise_embedding", help="Embedding column for --table")
+    parser.add_argument("--rows", type=int, default=10000, help="Synthetic vectors to load")
+    parser.add_argument("--dim", type=int, default=1536, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=100, help="Queries to run")
+    parser.add_argument("--k", type=int, default=20, help="Neighbours per query")
+    parser.add_argument("--index", choices=["hnsw", "ivfflat"], default="hnsw", help="Synthetic index type")
+    parser.add_argument("--m", type=int, default=16, help="HNSW m")
+    parser.add_argument("--ef-construction", type=int, default=64, help="HNSW ef_construction")
+    parser.add_argument("--lists", type=int, default=100, help="IVFFlat lists")
+    parser.add_argument("--ef-search", type=int, default=40, help="hnsw.ef_search")
+    parser.add_argument("--probes", type=int, default=10, help="ivfflat.probes")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
@@ -1,15 +1,28 @@
-"""Background worker for resilient action queue submission."""
+"""Background worker for resilient action queue submission.
+
+Each pass leases a batch of due items (FOR UPDATE SKIP LOCKED), then submits
+them grouped by dweller: groups run concurrently, items within a group run
+in composition order so a dweller's actions land in the order they were
+composed. /api/actions/compose sends a NOTIFY on ACTION_QUEUE_CHANNEL, so
+new items are picked up immediately rather than on the next poll.
+
+action_queue_metrics() reports queue depth, claim latency and
+compose-to-submit latency from in-process counters (no I/O). Only the
+process currently running the worker has non-empty numbers.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from fastapi import HTTPException
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select, update
 
 import db as db_module
 from db import ActionCompositionQueue, IdempotencyKey
@@ -22,13 +35,68 @@ from services.action_resilience import (
     create_action_record,
     get_recent_idempotency_record,
     parse_stored_idempotency_response,
-    prune_expired_idempotency_keys,
 )
 from utils.clock import now as utc_now
 from utils.deployment import get_forced_deployment_status
+from utils.pg_listen import listen
 
 logger = logging.getLogger(__name__)
 
+ACTION_QUEUE_CHANNEL = "dsf_action_queue"
+ACTION_QUEUE_BATCH_SIZE = int(os.getenv("ACTION_QUEUE_BATCH_SIZE", "20"))
+# Dwellers submitted at once; each holds a background pool connection
+ACTION_QUEUE_CONCURRENCY = int(os.getenv("ACTION_QUEUE_CONCURRENCY", "3"))
+ACTION_QUEUE_CLAIM_LEASE_SECONDS = 120
+# Poll when no NOTIFY arrives and no retry is due sooner; NOTIFY only cuts the
+# latency below this, so it stays short for when the LISTEN connection is down
+ACTION_QUEUE_POLL_SECONDS = float(os.getenv("ACTION_QUEUE_POLL_SECONDS", "1"))
+
+
+@dataclass
+class ActionQueueStats:
+    depth: int | None = None  # Pending items at the last check
+    oldest_pending_seconds: float | None = None
+    claims: int = 0
+    claimed_items: int = 0
+    claim_ms_total: float = 0.0
+    claim_ms_max: float = 0.0
+    submitted: int = 0
+    retries: int = 0
+    submit_latency_ms_total: float = 0.0
+    submit_latency_ms_max: float = 0.0
+
+    def record_claim(self, items: int, elapsed_ms: float) -> None:
+        self.claims += 1
+        self.claimed_items += items
+        self.claim_ms_total += elapsed_ms
+        self.claim_ms_max = max(self.claim_ms_max, elapsed_ms)
+
+    def record_submission(self, latency_ms: float) -> None:
+        self.submitted += 1
+        self.submit_latency_ms_total += latency_ms
+        self.submit_latency_ms_max = max(self.submit_latency_ms_max, latency_ms)
+
+
+_stats = ActionQueueStats()
+
+
+def action_queue_metrics() -> dict[str, Any]:
+    """Queue depth, claim latency and compose-to-submit latency for this process."""
+    return {
+        "depth": _stats.depth,
+        "oldest_pending_seconds": _stats.oldest_pending_seconds,
+        "claims": _stats.claims,
+        "claimed_items": _stats.claimed_items,
+        "claim_ms_avg": round(_stats.claim_ms_total / _stats.claims, 1) if _stats.claims else 0.0,
+        "claim_ms_max": round(_stats.claim_ms_max, 1),
+        "submitted": _stats.submitted,
+        "retries": _stats.retries,
+        "submit_latency_ms_avg": (
+            round(_stats.submit_latency_ms_total / _stats.submitted, 1) if _stats.submitted else 0.0
+        ),
+        "submit_latency_ms_max": round(_stats.submit_latency_ms_max, 1),
+    }
+
 
 def _truncate_error(exc: Exception, *, max_length: int = 1000) -> str:
     text = str(exc)
@@ -52,30 +120,30 @@ def _extract_action_id(response: dict[str, Any] | None) -> UUID | None:
         return None
 
 
-async def _mark_retry(item_id: UUID, error_message: str) -> None:
-    async with db_module.SessionLocal() as db:
-        item = await db.get(ActionCompositionQueue, item_id)
-        if not item or item.submitted_at is not None:
-            return
-
-        item.submission_attempts += 1
-        item.last_error = error_message
+async def _mark_retry(db, item_id: UUID, error_message: str) -> None:
+    # Reloads the item: the failed attempt's rollback expired it
+    item = await db.get(ActionCompositionQueue, item_id)
+    if not item or item.submitted_at is not None:
+        return
 
-        if item.submission_attempts >= ACTION_QUEUE_MAX_RETRIES:
-            # Exhausted retries - leave as pending with final error for inspection.
-            await db.commit()
-            return
+    item.submission_attempts += 1
+    item.last_error = error_message
+    _stats.retries += 1
 
-        delay = ACTION_QUEUE_BACKOFF_SECONDS[item.submission_attempts - 1]
-        item.next_attempt_at = utc_now() + timedelta(seconds=delay)
+    if item.submission_attempts >= ACTION_QUEUE_MAX_RETRIES:
+        # Exhausted retries - leave as pending with final error for inspection.
         await db.commit()
+        return
+
+    delay = ACTION_QUEUE_BACKOFF_SECONDS[item.submission_attempts - 1]
+    item.next_attempt_at = utc_now() + timedelta(seconds=delay)
+    await db.commit()
 
 
 async def _process_item(db, item: ActionCompositionQueue) -> None:
     payload = ActionSubmissionPayload.from_dict(item.payload)
     idempotency_key = item.idempotency_key
 
-    await prune_expired_idempotency_keys(db)
     record = await get_recent_idempotency_record(db, key=idempotency_key)
 
     if record and record.status == "completed":
@@ -132,27 +200,52 @@ async def _process_item(db, item: ActionCompositionQueue) -> None:
     item.last_error = None
 
 
-async def process_action_queue_once(batch_size: int = 20) -> int:
-    """Process one batch of pending queue items."""
-    if get_forced_deployment_status() == "deploying":
-        return 0
+def _pending():
+    return and_(
+        ActionCompositionQueue.submitted_at.is_(None),
+        ActionCompositionQueue.submission_attempts < ACTION_QUEUE_MAX_RETRIES,
+    )
+
 
+async def _claim_batch(batch_size: int) -> list[tuple[UUID, UUID]]:
+    """Lease up to batch_size due items; returns (item id, dweller id) in composition order.
+
+    Leasing pushes next_attempt_at forward by ACTION_QUEUE_CLAIM_LEASE_SECONDS
+    so the items aren't claimed again while they're being submitted. If the
+    worker dies mid-batch they become due again when the lease runs out.
+    """
+    started = time.perf_counter()
     now = utc_now()
-    async with db_module.SessionLocal() as db:
-        result = await db.execute(
-            select(ActionCompositionQueue.id)
-            .where(
-                and_(
-                    ActionCompositionQueue.submitted_at.is_(None),
-                    ActionCompositionQueue.submission_attempts < ACTION_QUEUE_MAX_RETRIES,
-                    ActionCompositionQueue.next_attempt_at <= now,
-                )
+    due = (
+        select(ActionCompositionQueue.id)
+        .where(_pending(), ActionCompositionQueue.next_attempt_at <= now)
+        .order_by(ActionCompositionQueue.composed_at.asc(), ActionCompositionQueue.id.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    async with db_module.BackgroundSessionLocal() as db:
+        rows = (await db.execute(
+            update(ActionCompositionQueue)
+            .where(ActionCompositionQueue.id.in_(due))
+            .values(next_attempt_at=now + timedelta(seconds=ACTION_QUEUE_CLAIM_LEASE_SECONDS))
+            .returning(
+                ActionCompositionQueue.id,
+                ActionCompositionQueue.dweller_id,
+                ActionCompositionQueue.composed_at,
             )
-            .order_by(ActionCompositionQueue.composed_at.asc(), ActionCompositionQueue.id.asc())
-            .limit(batch_size)
-        )
-        item_ids = [row[0] for row in result.fetchall()]
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+    _stats.record_claim(len(rows), (time.perf_counter() - started) * 1000)
+    rows.sort(key=lambda row: (row.composed_at, row.id))
+    return [(row.id, row.dweller_id) for row in rows]
+
 
+async def _process_dweller_items(item_ids: list[UUID]) -> None:
+    """Submit one dweller's claimed items in order, on one session."""
+    async with db_module.BackgroundSessionLocal() as db:
+        # Load them all at once; db.get below hits the identity map
+        await db.execute(select(ActionCompositionQueue).where(ActionCompositionQueue.id.in_(item_ids)))
         for item_id in item_ids:
             item = await db.get(ActionCompositionQueue, item_id)
             if item is None:
@@ -160,35 +253,98 @@ async def process_action_queue_once(batch_size: int = 20) -> int:
             try:
                 await _process_item(db, item)
                 await db.commit()
-            except HTTPException as exc:
-                await db.rollback()
-                await _mark_retry(item_id, _truncate_error(exc))
             except Exception as exc:
                 await db.rollback()
-                await _mark_retry(item_id, _truncate_error(exc))
+                await _mark_retry(db, item_id, _truncate_error(exc))
+                continue
+            _stats.record_submission((item.submitted_at - item.composed_at).total_seconds() * 1000)
 
-        return len(item_ids)
+
+async def process_action_queue_once(batch_size: int = ACTION_QUEUE_BATCH_SIZE) -> int:
+    """Claim one batch of due queue items and submit them.
+
+    Different dwellers' items are submitted concurrently, up to
+    ACTION_QUEUE_CONCURRENCY at a time; each dweller's items go in
+    composition order. Returns the number of items claimed.
+    """
+    if get_forced_deployment_status() == "deploying":
+        return 0
+
+    claimed = await _claim_batch(batch_size)
+    by_dweller: dict[UUID, list[UUID]] = {}
+    for item_id, dweller_id in claimed:
+        by_dweller.setdefault(dweller_id, []).append(item_id)
+
+    semaphore = asyncio.Semaphore(ACTION_QUEUE_CONCURRENCY)
+
+    async def submit(item_ids: list[UUID]) -> None:
+        async with semaphore:
+            await _process_dweller_items(item_ids)
+
+    results = await asyncio.gather(
+        *(submit(item_ids) for item_ids in by_dweller.values()), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            # Items stay leased and are retried once the lease runs out
+            logger.error("Action queue dweller batch failed", exc_info=result)
+    return len(claimed)
+
+
+async def refresh_action_queue_depth() -> datetime | None:
+    """Update the depth metrics; returns when the earliest pending item is due."""
+    async with db_module.BackgroundSessionLocal() as db:
+        depth, oldest, next_due = (await db.execute(
+            select(
+                func.count(),
+                func.min(ActionCompositionQueue.composed_at),
+                func.min(ActionCompositionQueue.next_attempt_at),
+            ).where(_pending())
+        )).one()
+    _stats.depth = depth
+    _stats.oldest_pending_seconds = (
+        round((utc_now() - oldest).total_seconds(), 1) if oldest is not None else None
+    )
+    return next_due
+
+
+async def _wait_for_work(stop_event: asyncio.Event, wakeup: asyncio.Event, timeout: float) -> None:
+    waiters = {asyncio.create_task(stop_event.wait()), asyncio.create_task(wakeup.wait())}
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
 
 
 async def run_action_queue_worker(
     stop_event: asyncio.Event,
-    poll_interval_seconds: float = 1.0,
+    poll_interval_seconds: float = ACTION_QUEUE_POLL_SECONDS,
 ) -> None:
-    """Continuously poll and process queue items until shutdown."""
+    """Process queue items until shutdown.
+
+    Wakes on NOTIFY from /api/actions/compose, when the next retry is due,
+    or every poll_interval_seconds as a fallback.
+    """
     logger.info("Action queue worker started")
     try:
-        while not stop_event.is_set():
-            try:
-                processed = await process_action_queue_once()
-            except Exception:
-                logger.exception("Action queue worker iteration failed")
-                processed = 0
-
-            # Keep draining quickly while work exists, otherwise idle.
-            timeout = 0.05 if processed > 0 else poll_interval_seconds
-            try:
-                await asyncio.wait_for(stop_event.wait(), timeout=timeout)
-            except asyncio.TimeoutError:
-                continue
+        async with listen(ACTION_QUEUE_CHANNEL) as wakeup:
+            while not stop_event.is_set():
+                # Clear before claiming so a NOTIFY during the batch isn't lost
+                wakeup.clear()
+                try:
+                    processed = await process_action_queue_once()
+                    next_due = await refresh_action_queue_depth()
+                except Exception:
+                    logger.exception("Action queue worker iteration failed")
+                    processed, next_due = 0, None
+
+                if processed > 0:
+                    # Keep draining while work exists
+                    continue
+                timeout = poll_interval_seconds
+                if next_due is not None:
+                    timeout = min(timeout, max((next_due - utc_now()).total_seconds(), 0.05))
+                await _wait_for_work(stop_event, wakeup, timeout)
     finally:
         logger.info("Action queue worker stopped")
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
+import os
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
@@ -13,13 +16,19 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+import db as db_module
 from db import Dweller, DwellerAction, IdempotencyKey
+from utils.agent_stats import bump_agent_stats
 from utils.clock import now as utc_now
 from utils.deterministic import deterministic_uuid4
 from utils.feed_events import emit_feed_event
 
+logger = logging.getLogger(__name__)
+
 ACTION_IDEMPOTENCY_ENDPOINT = "/api/actions"
 ACTION_IDEMPOTENCY_TTL_HOURS = 24
+IDEMPOTENCY_PRUNE_SECONDS = float(os.getenv("IDEMPOTENCY_PRUNE_SECONDS", "300"))
+IDEMPOTENCY_PRUNE_BATCH = 1000
 ACTION_QUEUE_BACKOFF_SECONDS = (1, 2, 4, 8, 16)
 ACTION_QUEUE_MAX_RETRIES = len(ACTION_QUEUE_BACKOFF_SECONDS)
 DWELLER_LEASE_EXTENSION_HOURS = 24
@@ -117,14 +126,52 @@ def parse_stored_idempotency_response(response_body: Any) -> dict[str, Any] | No
     return None
 
 
-async def prune_expired_idempotency_keys(db: AsyncSession) -> None:
-    """Delete action idempotency keys older than the 24h TTL."""
-    await db.execute(
-        delete(IdempotencyKey).where(
-            IdempotencyKey.endpoint == ACTION_IDEMPOTENCY_ENDPOINT,
-            IdempotencyKey.created_at < _idempotency_cutoff(),
-        )
+async def prune_expired_idempotency_keys(db: AsyncSession, limit: int = IDEMPOTENCY_PRUNE_BATCH) -> int:
+    """Delete up to `limit` idempotency keys older than the 24h TTL, oldest first.
+
+    Covers every endpoint; keys from the idempotency middleware follow the
+    same TTL. Rows locked by an in-flight request are skipped. Returns the
+    number deleted.
+    """
+    expired = (
+        select(IdempotencyKey.key)
+        .where(IdempotencyKey.created_at < _idempotency_cutoff())
+        .order_by(IdempotencyKey.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
     )
+    result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired)))
+    return result.rowcount
+
+
+async def run_idempotency_key_pruner(stop_event: asyncio.Event) -> None:
+    """Prune expired idempotency keys on an interval until shutdown.
+
+    Deletes in batches of IDEMPOTENCY_PRUNE_BATCH, one transaction each, so
+    a backlog never holds locks for long.
+    """
+    logger.info("Idempotency key pruner started")
+    try:
+        while not stop_event.is_set():
+            try:
+                pruned = 0
+                while not stop_event.is_set():
+                    async with db_module.BackgroundSessionLocal() as db:
+                        deleted = await prune_expired_idempotency_keys(db)
+                        await db.commit()
+                    pruned += deleted
+                    if deleted < IDEMPOTENCY_PRUNE_BATCH:
+                        break
+                if pruned:
+                    logger.info("Pruned %d expired idempotency key(s)", pruned)
+            except Exception:
+                logger.exception("Idempotency key pruning failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=IDEMPOTENCY_PRUNE_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        logger.info("Idempotency key pruner stopped")
 
 
 async def get_recent_idempotency_record(
@@ -132,7 +179,11 @@ async def get_recent_idempotency_record(
     *,
     key: str,
 ) -> IdempotencyKey | None:
-    """Load idempotency key if it is still within 24h TTL."""
+    """Load idempotency key if it is still within 24h TTL.
+
+    Expired keys the pruner hasn't reached yet are deleted here and treated
+    as absent.
+    """
     record = await db.get(IdempotencyKey, key)
     if not record:
         return None
@@ -211,6 +262,7 @@ async def create_action_record(
     )
     db.add(action)
     await db.flush()
+    await bump_agent_stats(db, actor_id, actions_taken=1)
 
     timestamp = utc_now()
     episodic_memory = {
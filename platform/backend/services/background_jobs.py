@@ -0,0 +1,67 @@
+"""Singleton background loops, shared by the API process and worker.py.
+
+Each loop runs under run_as_leader(), so any number of API processes (or a
+separate worker process) can start them and exactly one instance of each
+loop is active across the deployment.
+
+BACKGROUND_JOBS controls where they run:
+    in_process - every API process competes for leadership (default)
+    off        - API processes don't run them; start `python worker.py`
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from services.action_queue_worker import run_action_queue_worker
+from services.action_resilience import run_idempotency_key_pruner
+from utils.agent_stats import run_agent_stats_reconciler
+from utils.arc_service import run_arc_summary_refresher
+from utils.feed_partitions import run_feed_partition_maintenance
+from utils.leader_election import run_as_leader
+from utils.reaction_counters import REACTION_COUNTER_SHARDS, run_reaction_counter_folder
+
+logger = logging.getLogger(__name__)
+
+ACTION_QUEUE_WORKER_ENABLED = os.getenv("ACTION_QUEUE_WORKER_ENABLED", "true").lower() == "true"
+BACKGROUND_JOBS_IN_PROCESS = os.getenv("BACKGROUND_JOBS", "in_process").lower() != "off"
+
+
+def singleton_jobs() -> list[tuple[str, Callable[[asyncio.Event], Awaitable[None]]]]:
+    """The enabled background loops, by leader lock name."""
+    jobs = []
+    if ACTION_QUEUE_WORKER_ENABLED:
+        jobs.append(("action_queue_worker", run_action_queue_worker))
+    if REACTION_COUNTER_SHARDS > 0:
+        jobs.append(("reaction_counter_folder", run_reaction_counter_folder))
+    jobs.append(("arc_summary_refresher", run_arc_summary_refresher))
+    jobs.append(("feed_partition_maintenance", run_feed_partition_maintenance))
+    jobs.append(("agent_stats_reconciler", run_agent_stats_reconciler))
+    jobs.append(("idempotency_key_pruner", run_idempotency_key_pruner))
+    return jobs
+
+
+class BackgroundJobs:
+    """Starts the singleton loops under leader election and stops them on shutdown."""
+
+    def __init__(self) -> None:
+        self._stop_event: asyncio.Event | None = None
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        self._stop_event = asyncio.Event()
+        for name, job in singleton_jobs():
+            self._tasks[name] = asyncio.create_task(run_as_leader(name, job, self._stop_event))
+        logger.info("Background jobs started: %s", ", ".join(self._tasks) or "none")
+
+    async def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for name, task in self._tasks.items():
+            try:
+                await task
+            except Exception:
+                logger.exception("Background job %s shutdown failed", name)
+        self._tasks = {}
+        self._stop_event = None
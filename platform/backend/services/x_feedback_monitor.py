@@ -3,18 +3,46 @@
 Polls X API for replies, quotes, and engagement on published stories.
 Stores feedback in the external_feedback table for analysis.
 Gracefully degrades when X_BEARER_TOKEN is not set.
+
+Polling is batched: stories are fetched concurrently (bounded by
+X_POLL_CONCURRENCY) through one shared, rate-limit-aware client; then a
+single existence query, batched sentiment classification, and one bulk
+INSERT ... ON CONFLICT DO NOTHING ingest everything that was found.
 """
 
+import asyncio
+import json
 import logging
 import os
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import timedelta
 
 import httpx
+from sqlalchemy import Text, and_, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
 logger = logging.getLogger(__name__)
 
-X_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
-X_TWEET_URL = "https://api.twitter.com/2/tweets"
+X_API_BASE_URL = os.getenv("X_API_BASE_URL", "https://api.twitter.com/2")
+X_SEARCH_PATH = "/tweets/search/recent"
+X_TWEET_PATH = "/tweets"
+
+X_POLL_CONCURRENCY = int(os.getenv("X_POLL_CONCURRENCY", "4"))
+# Longest we'll sleep for a rate-limit window to reset before giving up on a request
+X_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("X_RATE_LIMIT_MAX_WAIT_SECONDS", "60"))
+SENTIMENT_BATCH_SIZE = 25
+
+SENTIMENTS = ("positive", "negative", "neutral", "constructive")
+
+# Signal weight per feedback type (likes store the like count instead)
+FEEDBACK_WEIGHTS = {
+    "reply": 2.0,  # Replies are higher signal than likes
+    "quote": 3.0,  # Quotes are highest signal
+}
+
+_x_client: httpx.AsyncClient | None = None
+# endpoint -> monotonic time before which requests would be rejected
+_rate_limit_reset_at: dict[str, float] = {}
 
 
 def _get_bearer_token() -> str | None:
@@ -29,6 +57,85 @@ def _x_headers() -> dict:
     }
 
 
+def get_x_client() -> httpx.AsyncClient:
+    """Shared X API client (connection pooling across all fetches)."""
+    global _x_client
+    if _x_client is None or _x_client.is_closed:
+        _x_client = httpx.AsyncClient(
+            base_url=X_API_BASE_URL,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=X_POLL_CONCURRENCY * 2),
+        )
+    return _x_client
+
+
+async def close_x_client() -> None:
+    global _x_client
+    if _x_client is not None:
+        await _x_client.aclose()
+        _x_client = None
+
+
+def _record_rate_limit(endpoint: str, response: httpx.Response) -> None:
+    """Remember when an exhausted rate-limit window resets (x-rate-limit-* headers)."""
+    remaining = response.headers.get("x-rate-limit-remaining")
+    reset = response.headers.get("x-rate-limit-reset")
+    if reset is None or (remaining is not None and remaining != "0" and response.status_code != 429):
+        _rate_limit_reset_at.pop(endpoint, None)
+        return
+    try:
+        wait = max(0.0, float(reset) - time.time())
+    except ValueError:
+        return
+    _rate_limit_reset_at[endpoint] = time.monotonic() + wait
+
+
+async def _wait_for_rate_limit(endpoint: str, path: str) -> None:
+    wait = _rate_limit_reset_at.get(endpoint, 0.0) - time.monotonic()
+    if wait > X_RATE_LIMIT_MAX_WAIT_SECONDS:
+        raise httpx.HTTPStatusError(
+            f"X rate limit for {endpoint} resets in {wait:.0f}s",
+            request=httpx.Request("GET", path),
+            response=httpx.Response(429, text="rate limited"),
+        )
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def _x_get(endpoint: str, path: str, params: dict) -> dict:
+    """GET an X API path, waiting out exhausted rate-limit windows.
+
+    endpoint names the rate-limit bucket (X limits per endpoint, not per URL).
+    A 429 is retried once after its reset time. Raises httpx.HTTPStatusError
+    if the request still fails.
+    """
+    client = get_x_client()
+    await _wait_for_rate_limit(endpoint, path)
+    response = await client.get(path, headers=_x_headers(), params=params)
+    _record_rate_limit(endpoint, response)
+    if response.status_code == 429:
+        await _wait_for_rate_limit(endpoint, path)
+        response = await client.get(path, headers=_x_headers(), params=params)
+        _record_rate_limit(endpoint, response)
+    response.raise_for_status()
+    return response.json()
+
+
+def _parse_tweets(data: dict, feedback_type: str) -> list[dict]:
+    users = {u["id"]: u.get("username", "unknown")
+             for u in data.get("includes", {}).get("users", [])}
+    return [
+        {
+            "id": tweet["id"],
+            "text": tweet.get("text", ""),
+            "author_id": tweet.get("author_id"),
+            "author_username": users.get(tweet.get("author_id"), "unknown"),
+            "type": feedback_type,
+        }
+        for tweet in data.get("data", [])
+    ]
+
+
 async def fetch_replies(x_post_id: str) -> list[dict]:
     """Fetch replies to a specific X post using search API.
 
@@ -40,35 +147,14 @@ async def fetch_replies(x_post_id: str) -> list[dict]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                X_SEARCH_URL,
-                headers=_x_headers(),
-                params={
-                    "query": f"conversation_id:{x_post_id} is:reply",
-                    "tweet.fields": "author_id,created_at,text",
-                    "user.fields": "username",
-                    "expansions": "author_id",
-                    "max_results": 100,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Build user lookup
-            users = {u["id"]: u.get("username", "unknown")
-                     for u in data.get("includes", {}).get("users", [])}
-
-            replies = []
-            for tweet in data.get("data", []):
-                replies.append({
-                    "id": tweet["id"],
-                    "text": tweet.get("text", ""),
-                    "author_id": tweet.get("author_id"),
-                    "author_username": users.get(tweet.get("author_id"), "unknown"),
-                    "type": "reply",
-                })
-            return replies
+        data = await _x_get("search", X_SEARCH_PATH, {
+            "query": f"conversation_id:{x_post_id} is:reply",
+            "tweet.fields": "author_id,created_at,text",
+            "user.fields": "username",
+            "expansions": "author_id",
+            "max_results": 100,
+        })
+        return _parse_tweets(data, "reply")
 
     except httpx.HTTPStatusError as e:
         logger.error("X API error fetching replies for %s: %s", x_post_id, e.response.text)
@@ -85,33 +171,13 @@ async def fetch_quotes(x_post_id: str) -> list[dict]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{X_TWEET_URL}/{x_post_id}/quote_tweets",
-                headers=_x_headers(),
-                params={
-                    "tweet.fields": "author_id,created_at,text",
-                    "user.fields": "username",
-                    "expansions": "author_id",
-                    "max_results": 100,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            users = {u["id"]: u.get("username", "unknown")
-                     for u in data.get("includes", {}).get("users", [])}
-
-            quotes = []
-            for tweet in data.get("data", []):
-                quotes.append({
-                    "id": tweet["id"],
-                    "text": tweet.get("text", ""),
-                    "author_id": tweet.get("author_id"),
-                    "author_username": users.get(tweet.get("author_id"), "unknown"),
-                    "type": "quote",
-                })
-            return quotes
+        data = await _x_get("quote_tweets", f"{X_TWEET_PATH}/{x_post_id}/quote_tweets", {
+            "tweet.fields": "author_id,created_at,text",
+            "user.fields": "username",
+            "expansions": "author_id",
+            "max_results": 100,
+        })
+        return _parse_tweets(data, "quote")
 
     except httpx.HTTPStatusError as e:
         logger.error("X API error fetching quotes for %s: %s", x_post_id, e.response.text)
@@ -131,70 +197,129 @@ async def fetch_engagement(x_post_id: str) -> dict:
         return {}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{X_TWEET_URL}/{x_post_id}",
-                headers=_x_headers(),
-                params={"tweet.fields": "public_metrics"},
-            )
-            response.raise_for_status()
-            data = response.json()
-            metrics = data.get("data", {}).get("public_metrics", {})
-            return {
-                "like_count": metrics.get("like_count", 0),
-                "bookmark_count": metrics.get("bookmark_count", 0),
-                "retweet_count": metrics.get("retweet_count", 0),
-                "quote_count": metrics.get("quote_count", 0),
-                "reply_count": metrics.get("reply_count", 0),
-            }
+        data = await _x_get("tweet_lookup", f"{X_TWEET_PATH}/{x_post_id}", {
+            "tweet.fields": "public_metrics",
+        })
+        metrics = data.get("data", {}).get("public_metrics", {})
+        return {
+            "like_count": metrics.get("like_count", 0),
+            "bookmark_count": metrics.get("bookmark_count", 0),
+            "retweet_count": metrics.get("retweet_count", 0),
+            "quote_count": metrics.get("quote_count", 0),
+            "reply_count": metrics.get("reply_count", 0),
+        }
 
     except Exception:
         logger.exception("Failed to fetch X engagement for %s", x_post_id)
         return {}
 
 
+async def _call_haiku(client: httpx.AsyncClient, api_key: str, prompt: str, max_tokens: int) -> str:
+    response = await client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        },
+        json={
+            "model": "claude-haiku-4-5-20251001",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        },
+    )
+    response.raise_for_status()
+    return response.json()["content"][0]["text"]
+
+
 async def classify_sentiment(text: str) -> str:
     """Classify sentiment of feedback text using Claude Haiku.
 
     Returns one of: 'positive', 'negative', 'neutral', 'constructive'.
     Falls back to 'neutral' on failure.
     """
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key or not text.strip():
-        return "neutral"
+    return (await classify_sentiments([text]))[0]
 
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": "claude-haiku-4-5-20251001",
-                    "max_tokens": 10,
-                    "messages": [{
-                        "role": "user",
-                        "content": (
-                            f"Classify the sentiment of this social media reply about a sci-fi story. "
-                            f"Reply with exactly one word: positive, negative, neutral, or constructive.\n\n"
-                            f"Reply: {text[:500]}"
-                        ),
-                    }],
-                },
+
+async def classify_sentiments(texts: list[str]) -> list[str]:
+    """Classify many feedback texts, SENTIMENT_BATCH_SIZE per LLM call.
+
+    Returns one sentiment per input, in order. Anything that can't be
+    classified (no key, empty text, bad response) falls back to 'neutral'.
+    """
+    results = ["neutral"] * len(texts)
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        return results
+
+    pending = [i for i, text in enumerate(texts) if text.strip()]
+    if not pending:
+        return results
+
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for start in range(0, len(pending), SENTIMENT_BATCH_SIZE):
+            batch = pending[start:start + SENTIMENT_BATCH_SIZE]
+            numbered = "\n".join(
+                f"{n}. {json.dumps(texts[i][:500])}" for n, i in enumerate(batch, 1)
             )
-            response.raise_for_status()
-            result = response.json()
-            sentiment = result["content"][0]["text"].strip().lower()
-            if sentiment in ("positive", "negative", "neutral", "constructive"):
-                return sentiment
-            return "neutral"
+            prompt = (
+                f"Classify the sentiment of each social media reply about a sci-fi story "
+                f"as positive, negative, neutral, or constructive. Respond with only a JSON "
+                f"array of {len(batch)} lowercase strings, one per reply, in order.\n\n"
+                f"{numbered}"
+            )
+            try:
+                text = await _call_haiku(client, api_key, prompt, max_tokens=15 * len(batch))
+                labels = json.loads(text[text.index("["):text.rindex("]") + 1])
+            except Exception:
+                logger.exception("Sentiment classification failed for batch of %d", len(batch))
+                continue
+            if not isinstance(labels, list) or len(labels) != len(batch):
+                logger.warning("Sentiment batch returned %s labels for %d texts",
+                               len(labels) if isinstance(labels, list) else "no", len(batch))
+                continue
+            for i, label in zip(batch, labels):
+                label = str(label).strip().lower()
+                if label in SENTIMENTS:
+                    results[i] = label
 
-    except Exception:
-        logger.exception("Sentiment classification failed")
-        return "neutral"
+    return results
+
+
+async def _fetch_story_feedback(story_id, x_post_id: str, semaphore: asyncio.Semaphore) -> list[dict]:
+    """Fetch replies, quotes and likes for one story as feedback rows."""
+    async with semaphore:
+        replies, quotes, engagement = await asyncio.gather(
+            fetch_replies(x_post_id),
+            fetch_quotes(x_post_id),
+            fetch_engagement(x_post_id),
+        )
+
+    rows = [
+        {
+            "story_id": story_id,
+            "source": "x",
+            "source_post_id": item["id"],
+            "source_user": item.get("author_username"),
+            "feedback_type": item["type"],
+            "content": item["text"],
+            "weight": FEEDBACK_WEIGHTS[item["type"]],
+        }
+        for item in replies + quotes
+    ]
+    if engagement:
+        # Store like count as a single aggregate feedback entry
+        rows.append({
+            "story_id": story_id,
+            "source": "x",
+            "source_post_id": f"{x_post_id}:likes",
+            "source_user": None,
+            "feedback_type": "like",
+            "content": None,
+            "sentiment": "positive",
+            "weight": float(engagement.get("like_count", 0)),
+        })
+    return rows
 
 
 async def poll_all_published_stories(db) -> int:
@@ -202,7 +327,6 @@ async def poll_all_published_stories(db) -> int:
 
     Returns count of new feedback items ingested.
     """
-    from sqlalchemy import select, and_
     from db.models import Story, ExternalFeedback
     from utils.clock import now as utc_now
 
@@ -213,107 +337,78 @@ async def poll_all_published_stories(db) -> int:
 
     cutoff = utc_now() - timedelta(days=7)
     result = await db.execute(
-        select(Story).where(
+        select(Story.id, Story.x_post_id).where(
             and_(
                 Story.x_post_id.isnot(None),
                 Story.x_published_at >= cutoff,
             )
         )
     )
-    stories = result.scalars().all()
+    stories = result.all()
 
     if not stories:
         logger.info("No published stories to poll for X feedback")
         return 0
 
-    new_count = 0
+    semaphore = asyncio.Semaphore(X_POLL_CONCURRENCY)
+    per_story = await asyncio.gather(*[
+        _fetch_story_feedback(story_id, x_post_id, semaphore)
+        for story_id, x_post_id in stories
+    ])
+
+    # One row per source post (a reply can't belong to two stories)
+    rows_by_post: dict[str, dict] = {}
+    for rows in per_story:
+        for row in rows:
+            rows_by_post.setdefault(row["source_post_id"], row)
+    if not rows_by_post:
+        logger.info("X feedback poll complete: 0 new items ingested")
+        return 0
 
-    for story in stories:
-        # Fetch replies
-        replies = await fetch_replies(story.x_post_id)
-        for reply in replies:
-            # Check if we already have this
-            existing = await db.execute(
-                select(ExternalFeedback).where(
-                    and_(
-                        ExternalFeedback.source == "x",
-                        ExternalFeedback.source_post_id == reply["id"],
-                    )
-                )
+    existing_result = await db.execute(
+        select(ExternalFeedback.source_post_id).where(
+            and_(
+                ExternalFeedback.source == "x",
+                ExternalFeedback.source_post_id == any_(
+                    bindparam("source_post_ids", list(rows_by_post), type_=ARRAY(Text))
+                ),
             )
-            if existing.scalar_one_or_none():
-                continue
+        )
+    )
+    existing = set(existing_result.scalars().all())
 
-            sentiment = await classify_sentiment(reply["text"])
-            feedback = ExternalFeedback(
-                story_id=story.id,
-                source="x",
-                source_post_id=reply["id"],
-                source_user=reply.get("author_username"),
-                feedback_type="reply",
-                content=reply["text"],
-                sentiment=sentiment,
-                weight=2.0,  # Replies are higher signal than likes
-            )
-            db.add(feedback)
-            new_count += 1
-
-        # Fetch quotes
-        quotes = await fetch_quotes(story.x_post_id)
-        for quote in quotes:
-            existing = await db.execute(
-                select(ExternalFeedback).where(
-                    and_(
-                        ExternalFeedback.source == "x",
-                        ExternalFeedback.source_post_id == quote["id"],
-                    )
-                )
-            )
-            if existing.scalar_one_or_none():
-                continue
+    new_rows = [row for post_id, row in rows_by_post.items() if post_id not in existing]
+    to_classify = [row for row in new_rows if row["feedback_type"] != "like"]
+    sentiments = await classify_sentiments([row["content"] for row in to_classify])
+    for row, sentiment in zip(to_classify, sentiments):
+        row["sentiment"] = sentiment
 
-            sentiment = await classify_sentiment(quote["text"])
-            feedback = ExternalFeedback(
-                story_id=story.id,
-                source="x",
-                source_post_id=quote["id"],
-                source_user=quote.get("author_username"),
-                feedback_type="quote",
-                content=quote["text"],
-                sentiment=sentiment,
-                weight=3.0,  # Quotes are highest signal
-            )
-            db.add(feedback)
-            new_count += 1
-
-        # Fetch engagement counts (likes/bookmarks stored as aggregate)
-        engagement = await fetch_engagement(story.x_post_id)
-        if engagement:
-            # Store like count as a single aggregate feedback entry
-            like_post_id = f"{story.x_post_id}:likes"
-            existing = await db.execute(
-                select(ExternalFeedback).where(
+    new_count = 0
+    if new_rows:
+        stmt = (
+            pg_insert(ExternalFeedback)
+            .on_conflict_do_nothing(index_elements=["source", "source_post_id"])
+            .returning(ExternalFeedback.id)
+        )
+        inserted = await db.execute(stmt, new_rows)
+        new_count = len(inserted.all())
+
+    # Like aggregates that already exist just track the latest count
+    for post_id in existing:
+        row = rows_by_post[post_id]
+        if row["feedback_type"] == "like":
+            await db.execute(
+                update(ExternalFeedback)
+                .where(
                     and_(
                         ExternalFeedback.source == "x",
-                        ExternalFeedback.source_post_id == like_post_id,
+                        ExternalFeedback.source_post_id == post_id,
                     )
                 )
+                .values(weight=row["weight"])
             )
-            existing_like = existing.scalar_one_or_none()
-            if existing_like:
-                existing_like.weight = float(engagement.get("like_count", 0))
-            else:
-                feedback = ExternalFeedback(
-                    story_id=story.id,
-                    source="x",
-                    source_post_id=like_post_id,
-                    feedback_type="like",
-                    sentiment="positive",
-                    weight=float(engagement.get("like_count", 0)),
-                )
-                db.add(feedback)
-                new_count += 1
 
     await db.commit()
     logger.info("X feedback poll complete: %d new items ingested", new_count)
     return new_count
+
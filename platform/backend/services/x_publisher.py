@@ -152,12 +152,12 @@ async def publish_story_to_x(story_id: UUID) -> str | None:
         logger.warning("X publishing skipped (authlib not installed): story_id=%s", story_id)
         return None
 
-    from db.database import SessionLocal
+    from db.database import BackgroundSessionLocal
     from db.models import Story
     from sqlalchemy import select
     from sqlalchemy.orm import selectinload
 
-    async with SessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         result = await db.execute(
             select(Story)
             .options(selectinload(Story.world), selectinload(Story.author))
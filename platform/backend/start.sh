@@ -61,5 +61,9 @@ echo "Database ready."
 # Fetch skill.md for version detection (Railway root is backend/ only)
 curl -sf https://deep-sci-fi.world/skill.md -o skill.md && echo "Fetched skill.md" || echo "Could not fetch skill.md, version detection disabled"
 
-echo "Starting uvicorn..."
-exec uvicorn main:app --host 0.0.0.0 --port $PORT
+# WEB_CONCURRENCY > 1 runs several uvicorn worker processes. Background loops
+# are leader-elected across them (see services/background_jobs.py); set
+# BACKGROUND_JOBS=off and run `python worker.py` to move them out entirely.
+WORKERS=${WEB_CONCURRENCY:-1}
+echo "Starting uvicorn with $WORKERS worker(s)..."
+exec uvicorn main:app --host 0.0.0.0 --port $PORT --workers "$WORKERS"
@@ -64,6 +64,7 @@ from httpx import ASGITransport, AsyncClient, Response
 from db.database import Base
 from main import app, limiter as main_limiter
 from api.auth import limiter as auth_limiter
+from utils.shared_cache import clear_shared_cache
 
 # Ensure rate limiters are disabled for tests
 main_limiter.enabled = False
@@ -119,6 +120,9 @@ async def db_engine():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Shared aggregates describe the previous test's (dropped) schema
+    clear_shared_cache()
+
     yield engine
 
     # Cleanup - drop all tables for isolation.
@@ -180,8 +184,11 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
     # Also override SessionLocal so any code bypassing dependency injection
     # (e.g. middleware, utility functions) uses the test engine
     original_session_local = db_database_module.SessionLocal
+    original_background_session_local = db_database_module.BackgroundSessionLocal
     db_database_module.SessionLocal = session_factory
     db_module.SessionLocal = session_factory
+    db_database_module.BackgroundSessionLocal = session_factory
+    db_module.BackgroundSessionLocal = session_factory
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -190,6 +197,8 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
     db_database_module.SessionLocal = original_session_local
     db_module.SessionLocal = original_session_local
+    db_database_module.BackgroundSessionLocal = original_background_session_local
+    db_module.BackgroundSessionLocal = original_background_session_local
 
 
 @pytest_asyncio.fixture
@@ -206,6 +206,7 @@ def create_dst_engine_and_client():
     import db.database as db_database_module
 
     original_session_local = db_database_module.SessionLocal
+    original_background_session_local = db_database_module.BackgroundSessionLocal
 
     # Enter TestClient context manager to get a persistent portal/event loop.
     # The lifespan's init_db() is a no-op when DST_SIMULATION is set (checked
@@ -234,11 +235,15 @@ def create_dst_engine_and_client():
     app.dependency_overrides[get_db] = override_get_db
     db_database_module.SessionLocal = session_factory
     db_module.SessionLocal = session_factory
+    db_database_module.BackgroundSessionLocal = session_factory
+    db_module.BackgroundSessionLocal = session_factory
 
     def cleanup():
         app.dependency_overrides.clear()
         db_database_module.SessionLocal = original_session_local
         db_module.SessionLocal = original_session_local
+        db_database_module.BackgroundSessionLocal = original_background_session_local
+        db_module.BackgroundSessionLocal = original_background_session_local
         reset_clock()
         reset_simulation()
         # Teardown DB inside the same portal/event loop
@@ -982,3 +982,74 @@ async def test_cannot_nominate_other_agents_action(client: AsyncClient):
     )
     assert nominate_response.status_code == 403
     assert "own actions" in nominate_response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_propagate_world_event_is_set_based_and_idempotent(db_session: AsyncSession):
+    """One statement covers every dweller; re-running adds nothing and never duplicates facts."""
+    from uuid import uuid4
+
+    from db import User, World, WorldEvent
+    from db.models import UserType, WorldEventOrigin, WorldEventStatus
+    from utils.clock import now as utc_now
+    from utils.event_propagation import propagate_world_event
+
+    creator = User(type=UserType.AGENT, username=f"prop-{uuid4().hex[:12]}", name="Propagator")
+    db_session.add(creator)
+    await db_session.flush()
+    world = World(
+        name="Propagation World",
+        premise="A world with many dwellers to propagate events to " * 2,
+        scientific_basis="Mass memory science " * 10,
+        year_setting=2090,
+        created_by=creator.id,
+    )
+    db_session.add(world)
+    await db_session.flush()
+
+    fact = "World fact: The Grid Fails (2089)."
+    dwellers = [
+        Dweller(
+            world_id=world.id,
+            created_by=creator.id,
+            name=f"Dweller {i}",
+            origin_region="Test Region",
+            generation="First-generation",
+            name_context="Named following test conventions reflecting regional heritage.",
+            cultural_identity="Test cultural identity",
+            role="Resident",
+            age=30,
+            personality="A test personality with enough detail to meet requirements.",
+            background="A test background with enough detail to meet requirements.",
+            # One dweller already remembers the fact
+            core_memories=[fact] if i == 0 else ["An older memory"],
+        )
+        for i in range(25)
+    ]
+    db_session.add_all(dwellers)
+    event = WorldEvent(
+        world_id=world.id,
+        title="The Grid Fails",
+        description="",
+        year_in_world=2089,
+        origin_type=WorldEventOrigin.ESCALATION,
+        proposed_by=creator.id,
+        canon_justification="Escalated for propagation testing.",
+        status=WorldEventStatus.PENDING,
+    )
+    db_session.add(event)
+    await db_session.flush()
+
+    kwargs = dict(event_id=event.id, world_id=world.id, fact_text=fact, propagated_at=utc_now())
+    first = await propagate_world_event(db_session, **kwargs)
+    assert (first.propagated, first.memories_updated) == (25, 24)
+
+    again = await propagate_world_event(db_session, **kwargs)
+    assert (again.propagated, again.memories_updated) == (0, 0)
+    await db_session.commit()
+
+    rows = (await db_session.execute(
+        select(Dweller.core_memories).where(Dweller.world_id == world.id)
+    )).scalars().all()
+    assert all(memories.count(fact) == 1 for memories in rows)
+    assert sum("An older memory" in memories for memories in rows) == 24
@@ -1,15 +1,28 @@
 """Tests for PROP-043 Phase 1 action resilience."""
 
+import asyncio
 import os
+from datetime import timedelta
 from uuid import UUID, uuid4
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import ActionCompositionQueue, DwellerAction
-from services.action_queue_worker import process_action_queue_once
+from db import ActionCompositionQueue, DwellerAction, IdempotencyKey, User
+from db.models import UserType
+from services.action_resilience import (
+    ACTION_IDEMPOTENCY_ENDPOINT,
+    ACTION_IDEMPOTENCY_TTL_HOURS,
+    prune_expired_idempotency_keys,
+)
+from services.action_queue_worker import (
+    ACTION_QUEUE_CHANNEL,
+    action_queue_metrics,
+    process_action_queue_once,
+    refresh_action_queue_depth,
+)
 from tests.conftest import (
     SAMPLE_CAUSAL_CHAIN,
     SAMPLE_DWELLER,
@@ -17,6 +30,7 @@ from tests.conftest import (
     approve_proposal,
 )
 from utils.clock import now as utc_now
+from utils.pg_listen import listen
 
 
 requires_postgres = pytest.mark.skipif(
@@ -368,3 +382,105 @@ async def test_compose_action_403_includes_blocker_type(
     detail = compose.json()["detail"]
     assert detail["blocker_type"] == "auth"
     assert "next_steps" in detail
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_prune_expired_idempotency_keys_deletes_only_stale_rows(
+    db_session: AsyncSession,
+) -> None:
+    user = User(type=UserType.AGENT, username=f"prune-{uuid4().hex[:8]}", name="Prune Agent")
+    db_session.add(user)
+    await db_session.flush()
+    stale, fresh = f"stale-{uuid4()}", f"fresh-{uuid4()}"
+    db_session.add_all([
+        IdempotencyKey(
+            key=stale, user_id=user.id, endpoint="/api/proposals",
+            created_at=utc_now() - timedelta(hours=ACTION_IDEMPOTENCY_TTL_HOURS + 1),
+        ),
+        IdempotencyKey(key=fresh, user_id=user.id, endpoint=ACTION_IDEMPOTENCY_ENDPOINT),
+    ])
+    await db_session.flush()
+
+    assert await prune_expired_idempotency_keys(db_session) >= 1
+    db_session.expire_all()
+    assert await db_session.get(IdempotencyKey, stale) is None
+    assert await db_session.get(IdempotencyKey, fresh) is not None
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_compose_notifies_queue_worker(
+    client: AsyncClient,
+    db_engine,
+    action_setup: dict[str, str],
+) -> None:
+    async with listen(ACTION_QUEUE_CHANNEL, engine=db_engine) as wakeup:
+        compose = await client.post(
+            "/api/actions/compose",
+            headers={"X-API-Key": action_setup["api_key"]},
+            json={
+                "dweller_id": action_setup["dweller_id"],
+                "action_type": "observe",
+                "content": "Listening for the shift bell over the canal locks.",
+                "importance": 0.3,
+            },
+        )
+        assert compose.status_code == 200, compose.json()
+        await asyncio.wait_for(wakeup.wait(), timeout=5)
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_listen_reconnects_after_connection_loss(db_engine, db_session: AsyncSession) -> None:
+    channel = "dsf_test_listen_reconnect"
+    async with listen(channel, engine=db_engine) as wakeup:
+        terminated = await db_session.execute(text(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE pid <> pg_backend_pid() AND query = :listen"
+        ), {"listen": f'LISTEN "{channel}"'})
+        assert terminated.scalars().all() == [True]
+
+        # Set once on reconnect, since notifications in between were missed
+        await asyncio.wait_for(wakeup.wait(), timeout=5)
+        wakeup.clear()
+        await db_session.execute(text("SELECT pg_notify(:channel, '')"), {"channel": channel})
+        await db_session.commit()
+        await asyncio.wait_for(wakeup.wait(), timeout=5)
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_queue_worker_submits_dweller_items_in_order(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    action_setup: dict[str, str],
+) -> None:
+    queue_ids = []
+    for content in ("First, sealing the flood gate.", "Then, signalling the barge crews."):
+        compose = await client.post(
+            "/api/actions/compose",
+            headers={"X-API-Key": action_setup["api_key"]},
+            json={
+                "dweller_id": action_setup["dweller_id"],
+                "action_type": "work",
+                "content": content,
+                "importance": 0.4,
+            },
+        )
+        assert compose.status_code == 200, compose.json()
+        queue_ids.append(UUID(compose.json()["queue_id"]))
+
+    before = action_queue_metrics()
+    assert await process_action_queue_once() >= 2
+    await refresh_action_queue_depth()
+    after = action_queue_metrics()
+    assert after["claims"] > before["claims"]
+    assert after["submitted"] >= before["submitted"] + 2
+    assert after["depth"] is not None
+
+    db_session.expire_all()
+    items = [await db_session.get(ActionCompositionQueue, queue_id) for queue_id in queue_ids]
+    assert all(item.submitted_at is not None for item in items)
+    first, second = [await db_session.get(DwellerAction, item.submitted_action_id) for item in items]
+    assert first.created_at < second.created_at
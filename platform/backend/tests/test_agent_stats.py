@@ -0,0 +1,140 @@
+"""Tests for the materialized per-agent activity counters."""
+
+import os
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from db import AgentStats, Proposal, User
+from db.models import ProposalStatus, UserType
+from tests.conftest import act_with_context
+from tests.test_action_escalation import create_world_with_dweller
+import utils.agent_stats as agent_stats
+from utils.agent_stats import (
+    bump_agent_stats,
+    get_agent_stats,
+    reconcile_agent_stats,
+    refresh_agent_stats,
+)
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+async def _agent_with_proposals(db_session, *statuses: ProposalStatus) -> UUID:
+    user_id = uuid4()
+    db_session.add(User(id=user_id, type=UserType.AGENT, username=f"stats-{user_id.hex[:8]}", name="Stats"))
+    await db_session.flush()
+    for status in statuses:
+        db_session.add(Proposal(
+            agent_id=user_id, premise="p", year_setting=2050,
+            causal_chain=[], scientific_basis="s", status=status,
+        ))
+    await db_session.flush()
+    return user_id
+
+
+@pytest.mark.asyncio
+async def test_bump_many_merges_and_locks_in_user_id_order(monkeypatch) -> None:
+    calls = []
+
+    async def record(db, user_id, **deltas):
+        calls.append((user_id, deltas))
+
+    monkeypatch.setattr(agent_stats, "bump_agent_stats", record)
+    low, high = UUID(int=1), UUID(int=2)
+    await agent_stats.bump_agent_stats_many(None, [
+        (high, {"stories_reviewed": 1}),
+        (None, {"stories_reviewed": 1}),
+        (low, {"unresponded_reviews": 1}),
+        (high, {"stories_reviewed": 1, "unresponded_reviews": 1}),
+    ])
+    assert calls == [
+        (low, {"unresponded_reviews": 1}),
+        (high, {"stories_reviewed": 2, "unresponded_reviews": 1}),
+    ]
+
+
+@requires_postgres
+class TestAgentStats:
+
+    @pytest.mark.asyncio
+    async def test_first_read_counts_source_tables(self, db_session) -> None:
+        user_id = await _agent_with_proposals(db_session, ProposalStatus.APPROVED, ProposalStatus.DRAFT)
+
+        stats = await get_agent_stats(db_session, user_id)
+        assert stats["worlds_proposed"] == 2
+        assert stats["worlds_created"] == 1
+        assert stats["stories_written"] == 0
+        assert await db_session.get(AgentStats, user_id) is not None
+
+    @pytest.mark.asyncio
+    async def test_bump_creates_then_increments_and_clamps(self, db_session) -> None:
+        user_id = await _agent_with_proposals(db_session, ProposalStatus.DRAFT)
+
+        # No row yet: created from the source tables, which already hold the proposal
+        await bump_agent_stats(db_session, user_id, worlds_proposed=1)
+        assert (await get_agent_stats(db_session, user_id))["worlds_proposed"] == 1
+
+        await bump_agent_stats(db_session, user_id, worlds_proposed=2, unresponded_reviews=-5)
+        stats = await get_agent_stats(db_session, user_id)
+        assert stats["worlds_proposed"] == 3
+        assert stats["unresponded_reviews"] == 0
+
+        with pytest.raises(ValueError):
+            await bump_agent_stats(db_session, user_id, not_a_counter=1)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_corrects_drift(self, db_session) -> None:
+        user_id = await _agent_with_proposals(db_session, ProposalStatus.APPROVED)
+        await refresh_agent_stats(db_session, [user_id])
+        await db_session.execute(
+            update(AgentStats).where(AgentStats.user_id == user_id).values(worlds_created=7)
+        )
+
+        corrected, last = await reconcile_agent_stats(db_session)
+        assert corrected == 1
+        assert last == user_id
+        assert (await get_agent_stats(db_session, user_id))["worlds_created"] == 1
+
+        corrected, _ = await reconcile_agent_stats(db_session)
+        assert corrected == 0
+        assert await reconcile_agent_stats(db_session, after=user_id) == (0, None)
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_write_paths_keep_stats_in_sync(client: AsyncClient, db_session, test_agent) -> None:
+    agent_key = test_agent["api_key"]
+    agent_id = UUID(test_agent["user"]["id"])
+    _, dweller_id = await create_world_with_dweller(client, agent_key)
+    act = await act_with_context(
+        client, dweller_id, agent_key, action_type="observe", content="Looks around the plaza."
+    )
+    assert act.status_code == 200, act.json()
+
+    stats = await get_agent_stats(db_session, agent_id)
+    assert stats["worlds_proposed"] == 1
+    assert stats["worlds_created"] == 1
+    assert stats["dwellers_created"] == 1
+    assert stats["dwellers_inhabited"] == 1
+    assert stats["actions_taken"] == 1
+    # Nothing to correct: every counter matches the source tables
+    assert await refresh_agent_stats(db_session, [agent_id], only_changed=True) == 0
+    await db_session.rollback()  # Release the row lock before the API writes again
+
+    response = await client.get("/api/heartbeat", headers={"X-API-Key": agent_key})
+    assert response.status_code == 200
+    counts = response.json()["completion"]["counts"]
+    assert counts["actions_taken"] == 1
+    assert counts["dwellers_created"] == 1
+
+    release = await client.post(f"/api/dwellers/{dweller_id}/release", headers={"X-API-Key": agent_key})
+    assert release.status_code == 200
+    listing = (await client.get("/api/agents")).json()
+    listed = next(a for a in listing["agents"] if a["id"] == str(agent_id))
+    assert listed["stats"] == {"proposals": 1, "worlds_created": 1, "validations": 0, "dwellers": 0}
@@ -450,3 +450,60 @@ class TestAgentProfile:
 
         data = response.json()
         assert data["agent"]["username"] == "@active-agent-test"
+
+
+@requires_postgres
+class TestAgentDirectory:
+    """Test the agent directory listing."""
+
+    @pytest.mark.asyncio
+    async def test_directory_pages_by_cursor(self, client: AsyncClient, db_session) -> None:
+        """Cursor pages cover every agent once, most recently active first."""
+        from datetime import timedelta
+        from uuid import UUID
+        from sqlalchemy import update
+        from db import User
+        from utils.clock import now as utc_now
+
+        ids = []
+        for i in range(5):
+            response = await client.post(
+                "/api/auth/agent",
+                json={"name": f"Directory Agent {i}", "username": f"directory-agent-{i}"}
+            )
+            ids.append(response.json()["agent"]["id"])
+        # Agent 0 was active most recently; agent 4 never acted
+        base = utc_now() + timedelta(hours=1)
+        for i, agent_id in enumerate(ids[:4]):
+            await db_session.execute(
+                update(User).where(User.id == UUID(agent_id))
+                .values(last_active_at=base - timedelta(minutes=i))
+            )
+        await db_session.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = await client.get("/api/agents", params=params)
+            assert response.status_code == 200
+            assert response.headers["cache-control"].startswith("public, max-age=")
+            data = response.json()
+            assert data["total"] == 5
+            seen.extend(agent["id"] for agent in data["agents"])
+            cursor = data["next_cursor"]
+            assert data["has_more"] == (cursor is not None)
+            if cursor is None:
+                break
+
+        assert seen == ids
+        assert all(
+            agent["stats"] == {"proposals": 0, "worlds_created": 0, "validations": 0, "dwellers": 0}
+            for agent in data["agents"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_directory_rejects_bad_cursor(self, client: AsyncClient) -> None:
+        response = await client.get("/api/agents", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        assert "how_to_fix" in response.json()["detail"]
@@ -251,6 +251,73 @@ class TestAssignStoryToArc:
         assert str(story2.id) in arc.story_ids
 
 
+@requires_postgres
+class TestArcSummaries(TestAssignStoryToArc):
+    """Arc summaries are generated in the background and served from the table."""
+
+    # Reuse the fixture and story helper without re-running the parent's tests
+    test_first_story_creates_arc = None
+    test_similar_story_joins_existing_arc = None
+    test_dissimilar_story_creates_new_arc = None
+    test_no_time_window = None
+
+    async def test_refresh_persists_and_skips_unchanged(self, db_session, world_and_dweller, monkeypatch):
+        from db.models import StoryArc
+        import utils.arc_service as arc_service
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        calls: list[tuple[str, str]] = []
+
+        async def fake_summary(*, first_title, latest_title, dweller_name, world_name):
+            calls.append((first_title, latest_title))
+            return f"{dweller_name} goes from {first_title} to {latest_title}."
+
+        monkeypatch.setattr(arc_service, "_generate_arc_summary", fake_summary)
+
+        world, dweller = world_and_dweller
+        arc = None
+        for hot, title in (([20, 21, 22], "Dawn"), ([20, 21, 22, 23], "Noon")):
+            story = await self._make_story(
+                db_session, world, dweller,
+                title=title,
+                content=f"The {title.lower()} chapter of the summary arc " * 5,
+                embedding=_make_embedding(hot_indices=hot),
+            )
+            arc = await arc_service.assign_story_to_arc(db_session, story)
+
+        assert await arc_service.refresh_arc_summaries(db_session, arc_ids=[arc.id]) == 1
+        assert calls == [("Dawn", "Noon")]
+
+        # Unchanged arc: nothing stale, no LLM call
+        assert await arc_service.refresh_arc_summaries(db_session) == 0
+        assert len(calls) == 1
+
+        # Listing reads the stored summary and never calls the LLM
+        async def fail(**kwargs):
+            raise AssertionError("summary generated on the read path")
+
+        monkeypatch.setattr(arc_service, "_generate_arc_summary", fail)
+        payloads = await arc_service.list_arcs(db_session, dweller_id=dweller.id)
+        assert payloads[0]["summary"] == "Arc Dweller goes from Dawn to Noon."
+
+        # A new latest story changes the fingerprint and triggers regeneration
+        monkeypatch.setattr(arc_service, "_generate_arc_summary", fake_summary)
+        story = await self._make_story(
+            db_session, world, dweller,
+            title="Dusk",
+            content="The dusk chapter of the summary arc " * 5,
+            embedding=_make_embedding(hot_indices=[20, 21, 22]),
+        )
+        joined = await arc_service.assign_story_to_arc(db_session, story)
+        assert joined.id == arc.id
+        assert await arc_service.refresh_arc_summaries(db_session) == 1
+        assert calls[-1] == ("Dawn", "Dusk")
+
+        stored = await db_session.get(StoryArc, arc.id, populate_existing=True)
+        assert stored.summary == "Arc Dweller goes from Dawn to Dusk."
+        assert stored.summary_updated_at == stored.updated_at
+
+
 # ---------------------------------------------------------------------------
 # API integration tests
 # ---------------------------------------------------------------------------
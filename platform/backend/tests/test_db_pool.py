@@ -0,0 +1,64 @@
+"""Tests for pool profiles and checkout-wait accounting."""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.database import pool_settings
+from db.pool import TimedQueuePool, pool_stats
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def test_pool_settings_profile_and_env_overrides(monkeypatch) -> None:
+    monkeypatch.setenv("TESTPOOL_MAX_OVERFLOW", "7")
+    monkeypatch.setenv("TESTPOOL_PRE_PING", "true")
+    settings = pool_settings("TESTPOOL", "burst")
+    assert settings["pool_size"] == 15
+    assert settings["max_overflow"] == 7
+    assert settings["pool_pre_ping"] is True
+
+    assert pool_settings("TESTPOOL", "no-such-profile")["pool_size"] == 5
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_timed_pool_records_waits_and_timeouts() -> None:
+    engine = create_async_engine(
+        os.environ["TEST_DATABASE_URL"],
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+
+            async def waiter():
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+
+            task = asyncio.create_task(waiter())
+            await asyncio.sleep(0.05)
+        await task
+
+        stats = pool_stats(engine.pool)
+        assert stats["checkouts"] == 2
+        assert stats["waits"] == 1
+        assert stats["wait_ms_max"] >= 40
+        assert stats["capacity"] == 1
+
+        async with engine.connect():
+            with pytest.raises(Exception, match="QueuePool limit"):
+                async with engine.connect():
+                    pass
+        assert pool_stats(engine.pool)["timeouts"] == 1
+    finally:
+        await engine.dispose()
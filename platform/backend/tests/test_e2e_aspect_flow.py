@@ -205,6 +205,70 @@ class TestAspectFlow:
         assert "QNav" in canon["canon_summary"]
         assert "Quantum Navigation" in canon["canon_summary"] or "quantum" in canon["canon_summary"].lower()
 
+    @pytest.mark.asyncio
+    async def test_canon_etag_and_rebuild_on_approval(
+        self, client: AsyncClient, world_setup: dict
+    ) -> None:
+        """Canon is served with an ETag, 304s when unchanged, and changes version on approval."""
+
+        world_id = world_setup["world_id"]
+        creator_key = world_setup["creator_key"]
+        validator_key = world_setup["validator_key"]
+
+        response = await client.get(f"/api/aspects/worlds/{world_id}/canon")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        version = response.json()["version"]
+
+        response = await client.get(
+            f"/api/aspects/worlds/{world_id}/canon", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        response = await client.post(
+            f"/api/aspects/worlds/{world_id}/aspects",
+            headers={"X-API-Key": creator_key},
+            json={
+                "aspect_type": "technology",
+                "title": "Harbor Drone Swarms",
+                "premise": "Drone swarms handle all container transfers in automated ports worldwide",
+                "content": {"name": "Swarm Cranes", "description": "Cooperative lifting drones " * 60},
+                "canon_justification": "Explains how port logistics keep pace with fully autonomous ships in this world",
+            },
+        )
+        assert response.status_code == 200
+        aspect_id = response.json()["aspect"]["id"]
+        await client.post(f"/api/aspects/{aspect_id}/submit", headers={"X-API-Key": creator_key})
+        response = await client.post(
+            f"/api/aspects/{aspect_id}/test-approve",
+            headers={"X-API-Key": validator_key},
+            json={
+                "verdict": "approve",
+                "research_conducted": VALID_RESEARCH,
+                "critique": "Swarm cranes are a plausible extension of current port automation trends.",
+                "canon_conflicts": [],
+                "suggested_fixes": [],
+                "updated_canon_summary": (
+                    "WORLD: Autonomous Shipping 2040. Ports run on cooperative drone swarms "
+                    "that transfer containers without human crane operators."
+                ),
+            },
+        )
+        assert response.status_code == 200
+
+        # The old ETag no longer matches; the new document has the aspect
+        response = await client.get(
+            f"/api/aspects/worlds/{world_id}/canon",
+            headers={"If-None-Match": etag, "Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.headers.get("content-encoding") == "gzip"
+        canon = response.json()
+        assert canon["version"] == version + 1
+        assert "Harbor Drone Swarms" in [a["title"] for a in canon["approved_aspects"]]
+        assert "drone swarms" in canon["canon_summary"]
+
     @pytest.mark.asyncio
     async def test_region_aspect_adds_to_world_regions(
         self, client: AsyncClient, world_setup: dict
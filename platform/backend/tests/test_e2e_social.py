@@ -411,6 +411,73 @@ class TestSocialFlow:
             assert "created_at" in comment
             assert "user" in comment
 
+    @pytest.mark.asyncio
+    async def test_get_comments_threaded_pagination(
+        self, client: AsyncClient, world_setup: dict
+    ) -> None:
+        """Top-level comments page by cursor; replies are bounded per thread."""
+        world_id = world_setup["world_id"]
+        creator_key = world_setup["creator_key"]
+
+        async def comment(content: str, parent_id: str | None = None) -> str:
+            response = await client.post(
+                "/api/social/comment",
+                headers={"X-API-Key": creator_key},
+                json={
+                    "target_type": "world",
+                    "target_id": world_id,
+                    "content": content,
+                    "parent_id": parent_id,
+                }
+            )
+            assert response.status_code == 200, response.json()
+            return response.json()["comment"]["id"]
+
+        top_ids = [await comment(f"Thread {i}") for i in range(3)]
+        reply_ids = [await comment(f"Reply {i}", top_ids[0]) for i in range(4)]
+
+        response = await client.get(
+            f"/api/social/comments/world/{world_id}",
+            params={"limit": 2, "replies_limit": 2},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_more"] is True
+        assert [c["id"] for c in data["comments"]] == [
+            top_ids[0], reply_ids[0], reply_ids[1], top_ids[1]
+        ]
+        assert data["comments"][0]["reply_count"] == 4
+        assert data["comments"][1]["reply_count"] is None
+        assert data["comments"][3]["reply_count"] == 0
+        assert set(data["comments"][0]["user"]) == {"id", "name", "type", "avatar_url"}
+
+        response = await client.get(
+            f"/api/social/comments/world/{world_id}",
+            params={"limit": 2, "cursor": data["next_cursor"]},
+        )
+        data = response.json()
+        assert [c["id"] for c in data["comments"]] == [top_ids[2]]
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+
+        # Rest of a thread
+        response = await client.get(
+            f"/api/social/comments/world/{world_id}",
+            params={"parent_id": top_ids[0], "limit": 3},
+        )
+        data = response.json()
+        assert [c["id"] for c in data["comments"]] == reply_ids[:3]
+        response = await client.get(
+            f"/api/social/comments/world/{world_id}",
+            params={"parent_id": top_ids[0], "limit": 3, "cursor": data["next_cursor"]},
+        )
+        assert [c["id"] for c in response.json()["comments"]] == reply_ids[3:]
+
+        response = await client.get(
+            f"/api/social/comments/world/{world_id}", params={"cursor": "garbage"}
+        )
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_comment_requires_auth(
         self, client: AsyncClient, world_setup: dict
@@ -634,3 +701,99 @@ class TestSocialFlow:
         response = await client.get(f"/api/worlds/{world_id}")
         new_counts = response.json()["world"]["reaction_counts"]
         assert new_counts.get("heart", 0) == initial_counts.get("heart", 0) + 1
+
+    @pytest.mark.asyncio
+    async def test_reaction_toggle_round_trips_world_counts(
+        self, client: AsyncClient, world_setup: dict
+    ) -> None:
+        """Add, change, and remove leave per-type world counts consistent."""
+        world_id = world_setup["world_id"]
+        creator_key = world_setup["creator_key"]
+        body = {"target_type": "world", "target_id": world_id}
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        initial_counts = response.json()["world"]["reaction_counts"]
+
+        await client.post("/api/social/react", headers={"X-API-Key": creator_key},
+                          json={**body, "reaction_type": "fire"})
+        await client.post("/api/social/react", headers={"X-API-Key": creator_key},
+                          json={**body, "reaction_type": "mind"})
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        counts = response.json()["world"]["reaction_counts"]
+        assert counts.get("fire", 0) == initial_counts.get("fire", 0)
+        assert counts.get("mind", 0) == initial_counts.get("mind", 0) + 1
+
+        await client.post("/api/social/react", headers={"X-API-Key": creator_key},
+                          json={**body, "reaction_type": "mind"})
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        assert response.json()["world"]["reaction_counts"] == initial_counts
+
+    @pytest.mark.asyncio
+    async def test_sharded_reaction_counts_fold_into_world(
+        self, client: AsyncClient, world_setup: dict, db_session, monkeypatch
+    ) -> None:
+        """In sharded mode deltas land in shard rows and are folded onto the world."""
+        import utils.reaction_counters as reaction_counters
+
+        monkeypatch.setattr(reaction_counters, "REACTION_COUNTER_SHARDS", 4)
+        world_id = world_setup["world_id"]
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        initial_thinking = response.json()["world"]["reaction_counts"].get("thinking", 0)
+
+        for i in range(3):
+            response = await client.post(
+                "/api/auth/agent",
+                json={"name": f"Shard Reactor {i}", "username": f"shard-reactor-{i}"}
+            )
+            key = response.json()["api_key"]["key"]
+            response = await client.post(
+                "/api/social/react",
+                headers={"X-API-Key": key},
+                json={"target_type": "world", "target_id": world_id, "reaction_type": "thinking"}
+            )
+            assert response.status_code == 200
+
+        # Deferred until folded
+        response = await client.get(f"/api/worlds/{world_id}")
+        assert response.json()["world"]["reaction_counts"].get("thinking", 0) == initial_thinking
+
+        assert await reaction_counters.fold_reaction_counter_shards(db_session) == 1
+        await db_session.commit()
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        assert response.json()["world"]["reaction_counts"]["thinking"] == initial_thinking + 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reactions_do_not_lose_updates(
+        self, client: AsyncClient, world_setup: dict
+    ) -> None:
+        """Simultaneous reactions from different agents all land in the count."""
+        import asyncio
+
+        world_id = world_setup["world_id"]
+        keys = []
+        for i in range(5):
+            response = await client.post(
+                "/api/auth/agent",
+                json={"name": f"Burst Reactor {i}", "username": f"burst-reactor-{i}"}
+            )
+            keys.append(response.json()["api_key"]["key"])
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        initial_fire = response.json()["world"]["reaction_counts"].get("fire", 0)
+
+        responses = await asyncio.gather(*[
+            client.post(
+                "/api/social/react",
+                headers={"X-API-Key": key},
+                json={"target_type": "world", "target_id": world_id, "reaction_type": "fire"}
+            )
+            for key in keys
+        ])
+        assert all(r.status_code == 200 for r in responses)
+
+        response = await client.get(f"/api/worlds/{world_id}")
+        assert response.json()["world"]["reaction_counts"]["fire"] == initial_fire + 5
@@ -0,0 +1,168 @@
+"""Tests for utils.embeddings.
+
+Covers the ANN similarity query (through a real HNSW index, built in the test
+since the test schema comes from create_all rather than migrations) and the
+embedding service: LRU + persistent cache, single-flight coalescing and
+batched API requests, against a fake OpenAI client.
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import utils.embeddings as embeddings
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def _embedding(weights: dict[int, float], dim: int = 1536) -> list[float]:
+    """Unit vector with the given weights at the given indices."""
+    emb = [0.0] * dim
+    for idx, weight in weights.items():
+        emb[idx] = weight
+    norm = sum(x * x for x in emb) ** 0.5
+    return [x / norm for x in emb]
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_find_similar_worlds_orders_and_thresholds(db_session) -> None:
+    from db.models import User, UserType, World
+    from utils.embeddings import find_similar_worlds
+
+    creator = User(type=UserType.AGENT, username=f"ann-{uuid4().hex[:12]}", name="ANN Tester")
+    db_session.add(creator)
+    await db_session.flush()
+
+    # Similarity to the query vector (1.0 at index 0): ~1.0, ~0.95, ~0.8, 0.0
+    vectors = {
+        "exact": {0: 1.0},
+        "close": {0: 1.0, 1: 0.33},
+        "near": {0: 1.0, 1: 0.75},
+        "orthogonal": {700: 1.0},
+    }
+    ids = {}
+    for name, weights in vectors.items():
+        world = World(
+            name=f"ANN {name}",
+            premise=f"A world used for nearest-neighbour testing: {name}. " * 2,
+            scientific_basis="Vector geometry " * 10,
+            year_setting=2080,
+            created_by=creator.id,
+        )
+        db_session.add(world)
+        await db_session.flush()
+        await db_session.execute(
+            text("UPDATE platform_worlds SET premise_embedding = CAST(:emb AS vector) WHERE id = :id"),
+            {"emb": str(_embedding(weights)), "id": str(world.id)},
+        )
+        ids[name] = str(world.id)
+    await db_session.execute(text(
+        "CREATE INDEX IF NOT EXISTS test_worlds_premise_embedding_hnsw ON platform_worlds "
+        "USING hnsw (premise_embedding vector_cosine_ops)"
+    ))
+
+    query = _embedding({0: 1.0})
+    results = await find_similar_worlds(db_session, query, threshold=0.75, limit=10)
+    ours = [r for r in results if r["id"] in ids.values()]
+    assert [r["id"] for r in ours] == [ids["exact"], ids["close"], ids["near"]]
+    assert ours[0]["similarity"] == 1.0
+    assert all(r["similarity"] > 0.75 for r in results)
+
+    stricter = await find_similar_worlds(db_session, query, threshold=0.9, limit=10)
+    assert ids["near"] not in {r["id"] for r in stricter}
+
+    limited = await find_similar_worlds(db_session, query, threshold=0.75, limit=1)
+    assert len(limited) == 1
+    await db_session.rollback()
+
+
+class FakeEmbeddingsAPI:
+    """Stands in for client.embeddings; records the inputs of each request."""
+
+    def __init__(self) -> None:
+        self.requests: list[list[str]] = []
+
+    async def create(self, model: str, input: list[str]):
+        self.requests.append(list(input))
+        await asyncio.sleep(0.01)  # let concurrent callers pile up
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+            for i, text in enumerate(input)
+        ])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch, db_engine):
+    """Fresh caches, a fake client, and BackgroundSessionLocal bound to the test engine."""
+    import db as db_module
+
+    api = FakeEmbeddingsAPI()
+    monkeypatch.setattr(embeddings, "_embedding_lru", OrderedDict())
+    monkeypatch.setattr(embeddings, "_inflight", {})
+    monkeypatch.setattr(embeddings, "get_openai_client", lambda: SimpleNamespace(embeddings=api))
+    monkeypatch.setattr(
+        db_module, "BackgroundSessionLocal",
+        async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    return api
+
+
+@requires_postgres
+class TestEmbeddingService:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_coalesce(self, fake_openai) -> None:
+        results = await asyncio.gather(*[embeddings.generate_embedding("same query") for _ in range(5)])
+        assert fake_openai.requests == [["same query"]]
+        assert all(result == results[0] for result in results)
+
+        # Served from the LRU afterwards
+        await embeddings.generate_embedding("same query")
+        assert len(fake_openai.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_persistent_cache_survives_lru_loss(self, fake_openai, db_session) -> None:
+        from db import EmbeddingCache
+
+        first = await embeddings.generate_embedding("discovery query")
+        embeddings._embedding_lru.clear()
+        assert await embeddings.generate_embedding("discovery query") == first
+        assert len(fake_openai.requests) == 1
+
+        row = (await db_session.execute(select(EmbeddingCache))).scalar_one()
+        assert row.model == embeddings.EMBEDDING_MODEL
+        assert list(row.embedding) == first
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batches_unique_misses(self, fake_openai, monkeypatch) -> None:
+        monkeypatch.setattr(embeddings, "EMBEDDING_BATCH_SIZE", 2)
+        await embeddings.generate_embedding("a")
+
+        texts = ["a", "bb", "ccc", "bb", "dddd", "eeeee"]
+        results = await embeddings.generate_embeddings(texts)
+        assert [result[0] for result in results] == [float(len(t)) for t in texts]
+        # "a" was cached; the four unique misses went out two per request
+        assert fake_openai.requests[1:] == [["bb", "ccc"], ["dddd", "eeeee"]]
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_coalesced_callers(self, fake_openai, monkeypatch) -> None:
+        async def failing(model: str, input: list[str]):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        monkeypatch.setattr(fake_openai, "create", failing)
+        results = await asyncio.gather(
+            *[embeddings.generate_embedding("doomed") for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert embeddings._inflight == {}
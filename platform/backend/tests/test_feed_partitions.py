@@ -0,0 +1,92 @@
+"""Tests for monthly feed partitions, retention and the feed keyset query."""
+
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+import utils.feed_partitions as feed_partitions
+from api.feed import _fetch_feed_page
+from db.models import FeedEvent
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+async def _partition_of(db_session, event_id) -> str:
+    return (await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM platform_feed_events WHERE id = :id"), {"id": event_id}
+    )).scalar_one()
+
+
+@requires_postgres
+class TestFeedPartitions:
+
+    @pytest.mark.asyncio
+    async def test_creates_upcoming_partitions_and_moves_default_rows(self, db_session) -> None:
+        early = FeedEvent(id=uuid4(), event_type="test", payload={}, created_at=NOW - timedelta(days=3))
+        db_session.add(early)
+        await db_session.flush()
+        assert await _partition_of(db_session, early.id) == "platform_feed_events_default"
+
+        result = await feed_partitions.maintain_feed_partitions(db_session, now=NOW)
+        assert result.created == [
+            "platform_feed_events_p202610",
+            "platform_feed_events_p202611",
+            "platform_feed_events_p202612",
+        ]
+        assert await _partition_of(db_session, early.id) == "platform_feed_events_p202610"
+
+        again = await feed_partitions.maintain_feed_partitions(db_session, now=NOW)
+        assert again.created == []
+
+    @pytest.mark.asyncio
+    async def test_retention_archives_expired_partitions(self, db_session, monkeypatch) -> None:
+        monkeypatch.setattr(feed_partitions, "FEED_RETENTION_MONTHS", 12)
+        old_month = datetime(2025, 8, 1, tzinfo=timezone.utc)
+        await feed_partitions.create_month_partition(db_session, old_month)
+        old = FeedEvent(id=uuid4(), event_type="test", payload={}, created_at=old_month + timedelta(days=2))
+        stray = FeedEvent(id=uuid4(), event_type="test", payload={}, created_at=datetime(2024, 1, 5, tzinfo=timezone.utc))
+        db_session.add_all([old, stray])
+        await db_session.flush()
+
+        result = await feed_partitions.maintain_feed_partitions(db_session, now=NOW)
+        assert result.archived == ["platform_feed_events_archive_202508", "platform_feed_events_archive_202401"]
+
+        remaining = (await db_session.execute(text("SELECT count(*) FROM platform_feed_events"))).scalar_one()
+        assert remaining == 0
+        archived = (await db_session.execute(
+            text("SELECT count(*) FROM platform_feed_events_archive_202508")
+        )).scalar_one()
+        assert archived == 1
+        # The stray row from the DEFAULT partition is archived, not deleted
+        stray_archived = (await db_session.execute(
+            text("SELECT id FROM platform_feed_events_archive_202401")
+        )).scalars().all()
+        assert stray_archived == [stray.id]
+
+    @pytest.mark.asyncio
+    async def test_keyset_page_spans_hot_window(self, db_session) -> None:
+        # Two recent events sharing a timestamp, one far older than the hot window
+        recent_ts = datetime.now(timezone.utc) - timedelta(hours=1)
+        ids = sorted([uuid4(), uuid4()], reverse=True)
+        db_session.add_all([
+            FeedEvent(id=ids[0], event_type="test", payload={}, created_at=recent_ts),
+            FeedEvent(id=ids[1], event_type="test", payload={}, created_at=recent_ts),
+            FeedEvent(id=uuid4(), event_type="test", payload={}, created_at=recent_ts - timedelta(days=90)),
+        ])
+        await db_session.flush()
+
+        first = await _fetch_feed_page(db_session, None, 1)
+        assert [e.id for e in first] == [ids[0]]
+
+        rest = await _fetch_feed_page(db_session, (first[0].created_at, first[0].id), 5)
+        assert [e.id for e in rest][:1] == [ids[1]]
+        assert len(rest) == 2
+        assert rest[1].created_at < recent_ts - timedelta(days=31)
@@ -0,0 +1,83 @@
+"""Tests for the liveness/readiness probes and the cached health snapshot."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+
+import utils.health as health
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+@pytest.fixture
+def schema_checks(monkeypatch):
+    """Fresh snapshot and a counting stand-in for verify_schema_version."""
+    calls = {"count": 0, "fail": False}
+
+    async def fake_verify():
+        calls["count"] += 1
+        if calls["fail"]:
+            raise ConnectionRefusedError("db down")
+        return {"is_current": True, "current_version": "x", "expected_version": "x", "message": "ok"}
+
+    monkeypatch.setattr(health, "_snapshot", health.HealthSnapshot())
+    monkeypatch.setattr(health, "verify_schema_version", fake_verify)
+    return calls
+
+
+@requires_postgres
+class TestHealthProbes:
+
+    @pytest.mark.asyncio
+    async def test_liveness_does_no_io(self, client: AsyncClient, schema_checks) -> None:
+        schema_checks["fail"] = True
+        response = await client.get("/api/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        assert schema_checks["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_probes_share_cached_snapshot(self, client: AsyncClient, schema_checks) -> None:
+        for _ in range(3):
+            assert (await client.get("/api/health")).json()["status"] == "healthy"
+        ready = await client.get("/api/health/ready")
+        assert ready.status_code == 200
+        data = ready.json()
+        assert data["ready"] is True
+        assert "saturation" in data["pools"]["request"]
+        assert "lag_ms" in data["event_loop"]
+        assert schema_checks["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_readiness_fails_when_database_unreachable(self, client: AsyncClient, schema_checks) -> None:
+        schema_checks["fail"] = True
+        response = await client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert "database_unreachable" in response.json()["reasons"]
+
+        # /health keeps answering 200 for load balancers
+        legacy = await client.get("/api/health")
+        assert legacy.status_code == 200
+        assert legacy.json()["status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_event_loop_lag(monkeypatch, schema_checks) -> None:
+    monkeypatch.setattr(health, "HEALTH_LAG_SAMPLE_SECONDS", 0.01)
+    stop = asyncio.Event()
+    task = asyncio.create_task(health.run_health_monitor(stop))
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # block the loop
+    await asyncio.sleep(0.03)
+    stop.set()
+    await task
+
+    assert schema_checks["count"] == 1
+    assert max(health._snapshot.lag_samples) >= 50
+    assert health._monitor_running is False
@@ -0,0 +1,84 @@
+"""Tests for the X-Idempotency-Key middleware."""
+
+import asyncio
+import os
+import zlib
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import IdempotencyKey, Proposal
+from tests.conftest import SAMPLE_CAUSAL_CHAIN
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+PROPOSAL = {
+    "name": "Idempotent World",
+    "premise": "A world used to test that retried proposal submissions run exactly once.",
+    "year_setting": 2088,
+    "causal_chain": SAMPLE_CAUSAL_CHAIN,
+    "scientific_basis": (
+        "Grid-scale storage and cheap fusion made continuous power universal, "
+        "so every district could run its own autonomous fabrication."
+    ),
+    "image_prompt": "Wide shot of a retrofitted harbour city under soft morning haze.",
+}
+
+
+@requires_postgres
+class TestIdempotencyMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_retry_replays_stored_bytes(
+        self, client: AsyncClient, db_session: AsyncSession, test_agent: dict
+    ) -> None:
+        key = str(uuid4())
+        headers = {"X-API-Key": test_agent["api_key"], "X-Idempotency-Key": key}
+
+        first = await client.post("/api/proposals", headers=headers, json=PROPOSAL)
+        assert first.status_code == 200, first.json()
+        assert "x-idempotent-replay" not in first.headers
+
+        second = await client.post("/api/proposals", headers=headers, json=PROPOSAL)
+        assert second.status_code == 200
+        assert second.headers["x-idempotent-replay"] == "true"
+        assert second.content == first.content
+
+        record = await db_session.get(IdempotencyKey, key)
+        assert record.status == "completed"
+        assert record.response_body is None
+        assert zlib.decompress(record.response_blob) == first.content
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_waits_for_original(
+        self, client: AsyncClient, db_session: AsyncSession, test_agent: dict
+    ) -> None:
+        headers = {"X-API-Key": test_agent["api_key"], "X-Idempotency-Key": str(uuid4())}
+
+        responses = await asyncio.gather(
+            client.post("/api/proposals", headers=headers, json=PROPOSAL),
+            client.post("/api/proposals", headers=headers, json=PROPOSAL),
+        )
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].content == responses[1].content
+        assert sorted(r.headers.get("x-idempotent-replay", "") for r in responses) == ["", "true"]
+
+        created = await db_session.scalar(
+            select(func.count()).select_from(Proposal).where(Proposal.agent_id == UUID(test_agent["user"]["id"]))
+        )
+        assert created == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_api_key_is_rejected(self, client: AsyncClient) -> None:
+        response = await client.post(
+            "/api/proposals",
+            headers={"X-API-Key": "not-a-key", "X-Idempotency-Key": str(uuid4())},
+            json=PROPOSAL,
+        )
+        assert response.status_code == 401
@@ -0,0 +1,46 @@
+"""Tests for orjson rendering and trusted (unvalidated) responses."""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from schemas.dwellers import GetFullMemoryResponse
+from utils.json_response import (
+    FastJSONResponse,
+    TrustedResponseMismatchError,
+    dumps,
+    trusted_response,
+)
+
+
+def test_renders_same_bytes_as_starlette() -> None:
+    content = {"name": "Dweller Ñandú", "values": [1, 2.5, None, True], "nested": {"k": []}, 3: "int key"}
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_dumps_falls_back_to_jsonable_encoder() -> None:
+    moment = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    uid = UUID("12345678-1234-5678-1234-567812345678")
+    assert dumps({"at": moment, "id": uid, "tags": {"only"}}) == (
+        b'{"at":"2026-03-01T12:00:00+00:00","id":"12345678-1234-5678-1234-567812345678","tags":["only"]}'
+    )
+
+
+def test_trusted_response_checks_payload_against_model() -> None:
+    memory = {
+        "core_memories": ["Grew up on the seawall"],
+        "personality_blocks": {},
+        "episodic_memories": [{"content": "Counted pylons"}],
+        "total_episodes": 1,
+        "relationship_memories": {},
+    }
+    payload = {"dweller_id": "d1", "dweller_name": "Ana", "memory": memory}
+    response = trusted_response(payload, GetFullMemoryResponse)
+    assert response.body == dumps(payload)
+
+    # A field left to its default would be missing from the trusted output
+    del memory["total_episodes"]
+    with pytest.raises(TrustedResponseMismatchError, match=r"\$\.memory\.total_episodes missing"):
+        trusted_response(payload, GetFullMemoryResponse)
@@ -0,0 +1,72 @@
+"""Tests for advisory-lock leader election of background jobs."""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from utils.leader_election import advisory_lock_key, run_as_leader, try_advisory_xact_lock
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def test_lock_keys_are_stable_signed_bigints() -> None:
+    key = advisory_lock_key("action_queue_worker")
+    assert key == advisory_lock_key("action_queue_worker")
+    assert key != advisory_lock_key("arc_summary_refresher")
+    assert -(2 ** 63) <= key < 2 ** 63
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_single_leader_and_failover() -> None:
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"], poolclass=NullPool)
+    running: list[str] = []
+
+    def job_for(instance: str):
+        async def job(stop_event: asyncio.Event) -> None:
+            running.append(instance)
+            await stop_event.wait()
+            running.remove(instance)
+        return job
+
+    stop_a, stop_b = asyncio.Event(), asyncio.Event()
+    a = asyncio.create_task(run_as_leader("test-singleton", job_for("a"), stop_a, engine=engine, retry_seconds=0.05))
+    await asyncio.sleep(0.3)
+    b = asyncio.create_task(run_as_leader("test-singleton", job_for("b"), stop_b, engine=engine, retry_seconds=0.05))
+    try:
+        await asyncio.sleep(0.3)
+        assert running == ["a"]
+
+        # Leader shuts down; the follower takes over
+        stop_a.set()
+        await a
+        for _ in range(40):
+            if running == ["b"]:
+                break
+            await asyncio.sleep(0.05)
+        assert running == ["b"]
+    finally:
+        stop_a.set()
+        stop_b.set()
+        await asyncio.gather(a, b)
+        await engine.dispose()
+    assert running == []
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_xact_lock_excludes_concurrent_runs(db_engine) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    async with AsyncSession(db_engine) as first, AsyncSession(db_engine) as second:
+        assert await try_advisory_xact_lock(first, "test-cron")
+        assert not await try_advisory_xact_lock(second, "test-cron")
+        await first.commit()
+        assert await try_advisory_xact_lock(second, "test-cron")
+        await second.rollback()
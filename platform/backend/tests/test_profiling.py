@@ -0,0 +1,103 @@
+"""Tests for the sampling profiler, loop watchdog and admin profiling endpoints."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+
+import api.auth as auth_module
+from utils.profiling import LoopWatchdog, SamplingProfiler
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _block(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_sampler_attributes_time_to_busy_function() -> None:
+    profiler = SamplingProfiler("spin", interval_ms=1).start()
+    _spin(0.1)
+    profiler.stop()
+    samples = profiler.samples
+    _spin(0.02)
+
+    # stop() doesn't join the sampler, but no sample is recorded after it
+    assert not profiler.running
+    assert profiler.samples == samples > 0
+    spin_samples = sum(n for stack, n in profiler.stacks.items() if stack[-1].startswith("_spin "))
+    assert spin_samples / profiler.samples > 0.5
+    assert "_spin (tests/test_profiling.py:" in profiler.collapsed()
+
+    document = profiler.speedscope()
+    [profile] = document["profiles"]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(0 <= i < len(document["shared"]["frames"]) for sample in profile["samples"] for i in sample)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_blocking_call() -> None:
+    watchdog = LoopWatchdog(interval_ms=10, slow_callback_ms=30).start()
+    await asyncio.sleep(0.05)
+    _block(0.15)
+    await asyncio.sleep(0.05)
+    watchdog.stop()
+
+    metrics = watchdog.metrics(include_stacks=True)
+    assert metrics["stalls_total"] == 1
+    assert metrics["max_stall_ms"] >= 100
+    [stall] = metrics["recent_stalls"]
+    assert stall["stack"][-1].startswith("_block ")
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_admin_profile_endpoint(client: AsyncClient, test_agent: dict, monkeypatch) -> None:
+    headers = {"X-API-Key": test_agent["api_key"]}
+    response = await client.post("/api/admin/profiling/profile?seconds=0.05", headers=headers)
+    assert response.status_code == 403
+
+    monkeypatch.setattr(auth_module, "ADMIN_API_KEY", test_agent["api_key"])
+    response = await client.post("/api/admin/profiling/profile?seconds=0.05&format=collapsed", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert ".collapsed.txt" in response.headers["content-disposition"]
+
+    response = await client.get("/api/admin/profiling/loop", headers=headers)
+    assert response.status_code == 200
+    assert "watchdog" in response.json()
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_x_profile_header_records_request(client: AsyncClient, test_agent: dict, monkeypatch) -> None:
+    monkeypatch.setattr(auth_module, "ADMIN_API_KEY", test_agent["api_key"])
+    headers = {"X-API-Key": test_agent["api_key"]}
+
+    response = await client.get("/api/worlds", headers={"X-Profile": "not-the-admin-key"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+    response = await client.get("/api/worlds", headers={"X-Profile": test_agent["api_key"]})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    response = await client.get(f"/api/admin/profiling/profiles/{profile_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "GET /api/worlds"
+
+    response = await client.get("/api/admin/profiling/profiles/missing", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,57 @@
+"""Tests for per-request SQL accounting and the Server-Timing header."""
+
+import os
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import utils.query_stats as query_stats
+from db import User
+from utils.query_stats import QueryStats, statement_shape, track_queries
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def test_statement_shape_collapses_bind_lists() -> None:
+    assert statement_shape("SELECT * FROM t\n WHERE id IN ($1, $2, $3)") == statement_shape(
+        "SELECT * FROM t WHERE id IN ($1, $2)"
+    )
+    assert statement_shape("SELECT a FROM t WHERE id = $1") != statement_shape("SELECT b FROM t WHERE id = $1")
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_tracks_count_rows_and_repeated_shapes(db_session: AsyncSession) -> None:
+    with track_queries() as outer:
+        await db_session.execute(text("SELECT generate_series(1, 7)"))
+        with track_queries() as inner:
+            for _ in range(query_stats.QUERY_STATS_REPEAT_THRESHOLD):
+                await db_session.execute(select(User.id).where(User.username == "nobody"))
+
+    assert inner.count == query_stats.QUERY_STATS_REPEAT_THRESHOLD
+    assert outer.count == inner.count + 1
+    assert outer.rows == 7
+    assert outer.db_ms > 0
+    [(shape, count)] = inner.repeated()
+    assert "platform_users" in shape and count == query_stats.QUERY_STATS_REPEAT_THRESHOLD
+    assert "db-repeats" in inner.server_timing()
+    assert "db-repeats" not in QueryStats(count=1).server_timing()
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient, monkeypatch) -> None:
+    response = await client.get("/api/worlds")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert "queries" in timing and "app;dur=" in timing
+
+    monkeypatch.setattr(query_stats, "QUERY_STATS_ENABLED", False)
+    response = await client.get("/api/worlds")
+    assert "server-timing" not in response.headers
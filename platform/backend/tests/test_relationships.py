@@ -6,6 +6,8 @@ Tests:
 3. story mentioning 3 dwellers → 3 relationships (A-B, A-C, B-C)
 4. GET /api/dwellers/graph → returns data from table (not computed)
 5. GET /api/dwellers/graph with no stories → empty graph (200)
+6. relationship writes bump the per-world graph version and stamp edges
+7. GET /api/dwellers/graph honors If-None-Match; /graph/changes returns deltas
 """
 
 import os
@@ -253,6 +255,151 @@ class TestDwellerGraphAPI:
             assert "last_interaction" in edge
 
 
+    async def test_graph_etag_returns_304(self, client: AsyncClient):
+        """Repeating the request with the returned ETag yields 304 Not Modified."""
+        first = await client.get("/api/dwellers/graph")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.json()["version"] == first.headers["x-graph-version"]
+
+        second = await client.get("/api/dwellers/graph", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+
+    async def test_graph_changes_unknown_world(self, client: AsyncClient):
+        """GET /api/dwellers/graph/changes for a world with no graph returns version 0."""
+        response = await client.get(
+            "/api/dwellers/graph/changes",
+            params={"world_id": str(uuid4()), "since_version": 0},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == 0
+        assert data["edges"] == []
+        assert data["full_refresh_required"] is False
+
+
+# ---------------------------------------------------------------------------
+# Graph versioning
+# ---------------------------------------------------------------------------
+
+@requires_postgres
+class TestGraphVersioning:
+    """Relationship writes bump the world graph version and stamp changed edges."""
+
+    async def _seed(self, db_session):
+        from db.models import Dweller, User, UserType, World
+
+        creator = User(
+            type=UserType.AGENT,
+            username=f"graph-version-{uuid4().hex[:12]}",
+            name="Graph Version Tester",
+        )
+        db_session.add(creator)
+        await db_session.flush()
+
+        world = World(
+            name="Graph Version World",
+            premise="A world for testing graph versions " * 5,
+            scientific_basis="Based on science " * 10,
+            year_setting=2100,
+            created_by=creator.id,
+        )
+        db_session.add(world)
+        await db_session.flush()
+
+        dwellers = []
+        for name in ["Alice", "Bob", "Carol"]:
+            d = Dweller(
+                world_id=world.id,
+                created_by=creator.id,
+                name=name,
+                origin_region="Central District",
+                generation="Second Generation",
+                name_context=f"{name} is a common name in Central District records.",
+                cultural_identity="Urban archival collective culture.",
+                role=f"{name}'s role",
+                age=30,
+                personality=f"{name}'s personality " * 5,
+                background=f"{name}'s background " * 5,
+                is_active=True,
+            )
+            db_session.add(d)
+            dwellers.append(d)
+        await db_session.flush()
+        return world, dwellers
+
+    def _story(self, world, author_id, perspective_id, content):
+        from db.models import Story, StoryPerspective
+
+        return Story(
+            world_id=world.id,
+            author_id=author_id,
+            title="Graph version story",
+            content=content,
+            perspective=StoryPerspective.THIRD_PERSON_LIMITED,
+            perspective_dweller_id=perspective_id,
+            video_prompt="A quiet scene in the district " * 3,
+        )
+
+    async def test_story_write_bumps_version_and_stamps_edges(self, db_session):
+        from db.models import DwellerRelationship
+        from utils.relationship_service import (
+            get_dweller_graph_changes,
+            get_graph_version,
+            update_relationships_for_story,
+        )
+        from sqlalchemy import select
+
+        world, [alice, bob, carol] = await self._seed(db_session)
+        assert await get_graph_version(db_session, world.id) == "0"
+
+        story1 = self._story(world, alice.created_by, alice.id, "Alice waited for Bob at the pier.")
+        db_session.add(story1)
+        await db_session.flush()
+        await update_relationships_for_story(db_session, story1)
+        assert await get_graph_version(db_session, world.id) == "1"
+
+        story2 = self._story(world, alice.created_by, carol.id, "Carol and Bob argued late into the night.")
+        db_session.add(story2)
+        await db_session.flush()
+        await update_relationships_for_story(db_session, story2)
+        assert await get_graph_version(db_session, world.id) == "2"
+
+        rels = (await db_session.execute(select(DwellerRelationship))).scalars().all()
+        assert {r.world_id for r in rels} == {world.id}
+        assert max(r.graph_version for r in rels) == 2
+
+        changes = await get_dweller_graph_changes(db_session, world.id, since_version=1)
+        assert changes["version"] == 2
+        pairs = {frozenset((e["source"], e["target"])) for e in changes["edges"]}
+        assert frozenset((str(bob.id), str(carol.id))) in pairs
+        assert {n["id"] for n in changes["nodes"]} >= {str(bob.id), str(carol.id)}
+
+        nothing_new = await get_dweller_graph_changes(db_session, world.id, since_version=2)
+        assert nothing_new["edges"] == []
+
+    async def test_cached_graph_invalidated_by_version_bump(self, db_session):
+        import json
+        from utils.relationship_service import get_dweller_graph_json, update_relationships_for_story
+
+        world, [alice, bob, _carol] = await self._seed(db_session)
+
+        body, version = await get_dweller_graph_json(db_session, world_id=world.id)
+        assert json.loads(body)["edges"] == []
+        cached_body, cached_version = await get_dweller_graph_json(db_session, world_id=world.id)
+        assert cached_body is body
+        assert cached_version == version
+
+        story = self._story(world, alice.created_by, alice.id, "Alice handed Bob the ledger.")
+        db_session.add(story)
+        await db_session.flush()
+        await update_relationships_for_story(db_session, story)
+
+        fresh_body, fresh_version = await get_dweller_graph_json(db_session, world_id=world.id)
+        assert fresh_version != version
+        assert len(json.loads(fresh_body)["edges"]) == 1
+
+
 # ---------------------------------------------------------------------------
 # SPEAK action relationship tests (PROP-022 revision)
 # ---------------------------------------------------------------------------
@@ -13,14 +13,14 @@ def _render(template: str, site_url: str = "", api_url: str = "") -> str:
     if api_url:
         env["NEXT_PUBLIC_API_URL"] = api_url
     with patch.dict(os.environ, env, clear=False):
-        from main import render_doc_template
+        from utils.static_docs import render_doc_template
         return render_doc_template(template)
 
 
 class TestRenderDocTemplate:
     def test_defaults_when_env_unset(self):
         with patch.dict(os.environ, {}, clear=True):
-            from main import render_doc_template
+            from utils.static_docs import render_doc_template
             result = render_doc_template("{{SITE_URL}} {{API_URL}} {{API_BASE}}")
         assert result == "http://localhost:3000 http://localhost:8000/api http://localhost:8000"
 
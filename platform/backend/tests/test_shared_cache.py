@@ -0,0 +1,108 @@
+"""Tests for the cross-agent shared cache and the aggregates built on it."""
+
+import asyncio
+import os
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Proposal, User
+from db.models import ProposalStatus
+from tests.conftest import SAMPLE_CAUSAL_CHAIN
+from utils.shared_cache import clear_shared_cache, invalidate_tables, shared
+from utils.validation_queue import get_validation_queue
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation() -> None:
+    clear_shared_cache()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(shared("test_key", compute, tables=("t",)) for _ in range(5)))
+    assert results == [1] * 5
+    assert await shared("test_key", compute, tables=("t",)) == 1
+
+    invalidate_tables(["t"])
+    assert await shared("test_key", compute, tables=("t",)) == 2
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_result_overlapping_invalidation_is_not_stored() -> None:
+    clear_shared_cache()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            invalidate_tables(["t"])  # A write lands while the first read runs
+        return calls
+
+    assert await shared("test_overlap", compute, tables=("t",)) == 1
+    assert await shared("test_overlap", compute, tables=("t",)) == 2
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_commit_invalidates_validation_queue(
+    client: AsyncClient, db_session: AsyncSession, test_agent: dict
+) -> None:
+    assert (await get_validation_queue(db_session)).proposals == ()
+
+    author = await db_session.get(User, UUID(test_agent["user"]["id"]))
+    db_session.add(Proposal(
+        agent_id=author.id,
+        name="Shared Cache World",
+        premise="A world used to test shared cache invalidation.",
+        year_setting=2090,
+        causal_chain=SAMPLE_CAUSAL_CHAIN,
+        scientific_basis="Committed writes invalidate cached aggregates that read the table.",
+        status=ProposalStatus.VALIDATING,
+    ))
+    await db_session.commit()
+
+    queue = await get_validation_queue(db_session)
+    assert [p.name for p in queue.proposals] == ["Shared Cache World"]
+    assert queue.proposals_to_validate(author.id) == []
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_platform_stats_reflect_writes_immediately(
+    client: AsyncClient, test_agent: dict
+) -> None:
+    before = (await client.get("/api/platform/stats")).json()
+
+    response = await client.post(
+        "/api/proposals",
+        headers={"X-API-Key": test_agent["api_key"]},
+        json={
+            "name": "Stats World",
+            "premise": "A world used to test that platform stats stay fresh.",
+            "year_setting": 2088,
+            "causal_chain": SAMPLE_CAUSAL_CHAIN,
+            "scientific_basis": (
+                "Grid-scale storage and cheap fusion made continuous power universal, "
+                "so every district could run its own autonomous fabrication."
+            ),
+            "image_prompt": "Wide shot of a retrofitted harbour city under soft morning haze.",
+        },
+    )
+    assert response.status_code == 200, response.json()
+
+    after = (await client.get("/api/platform/stats")).json()
+    assert after["total_proposals"] == before["total_proposals"] + 1
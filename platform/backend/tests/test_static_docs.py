@@ -0,0 +1,75 @@
+"""Tests for the preloaded skill.md/heartbeat.md documents and their endpoints."""
+import gzip
+import os
+
+import pytest
+from httpx import AsyncClient
+
+from utils.static_docs import get_doc
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+class TestRenderedDoc:
+    def test_rendered_once_and_refreshed_on_change(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# Doc\n\nSee {{SITE_URL}}", encoding="utf-8")
+
+        first = get_doc(path)
+        assert get_doc(path) is first
+        assert b"{{SITE_URL}}" not in first.body
+        assert gzip.decompress(first.gzip_body) == first.body
+
+        path.write_text("# Doc v2\n\nSee {{SITE_URL}}", encoding="utf-8")
+        second = get_doc(path)
+        assert second is not first
+        assert second.etag != first.etag
+
+        path.unlink()
+        assert get_doc(path) is None
+
+    def test_conditional_and_encoding_negotiation(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# Doc\n" + "agents poll this\n" * 50, encoding="utf-8")
+        doc = get_doc(path)
+
+        assert doc.matches(doc.etag)
+        assert doc.matches(f'"other", W/{doc.etag}')
+        assert doc.matches("*")
+        assert not doc.matches('"other"')
+        assert not doc.matches(None)
+
+        assert doc.encoded(None) == (doc.body, None)
+        assert doc.encoded("gzip, deflate") == (doc.gzip_body, "gzip")
+        assert doc.encoded("gzip;q=0") == (doc.body, None)
+        if doc.br_body is not None:
+            assert doc.encoded("gzip, br") == (doc.br_body, "br")
+
+
+@requires_postgres
+class TestDocEndpoints:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("url", ["/skill.md", "/heartbeat.md"])
+    async def test_if_none_match_returns_304(self, client: AsyncClient, url: str) -> None:
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert "Accept-Encoding" in response.headers["vary"]
+        etag = response.headers["etag"]
+
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_skill_version_etag_matches_document(self, client: AsyncClient) -> None:
+        doc = await client.get("/skill.md", headers={"Accept-Encoding": "gzip"})
+        assert doc.headers["content-encoding"] == "gzip"
+        assert "X-Skill-Version" in doc.headers
+
+        version = (await client.get("/api/skill/version")).json()
+        assert doc.headers["etag"] == f'"{version["etag"]}"'
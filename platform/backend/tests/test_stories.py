@@ -593,6 +593,58 @@ class TestStoriesAPI:
         assert "stories" in data
         assert len(data["stories"]) >= 1
 
+    @pytest.mark.asyncio
+    async def test_list_stories_cursor_pagination(
+        self, client: AsyncClient, world_with_dweller: dict
+    ) -> None:
+        """Cursor pages are disjoint, cover every story, and omit story bodies."""
+        world_id = world_with_dweller["world_id"]
+        creator_key = world_with_dweller["creator_key"]
+
+        created_ids = set()
+        for i in range(3):
+            response = await client.post(
+                "/api/stories",
+                headers={"X-API-Key": creator_key},
+                json={
+                    "world_id": world_id,
+                    "title": f"Cursor Story {i}",
+                    "content": SAMPLE_STORY_CONTENT,
+                    "video_prompt": SAMPLE_VIDEO_PROMPT,
+                    "perspective": "first_person_agent"
+                }
+            )
+            assert response.status_code == 200, response.json()
+            created_ids.add(response.json()["story"]["id"])
+
+        for path in ("/api/stories", f"/api/stories/worlds/{world_id}"):
+            for sort in ("engagement", "recent"):
+                seen: list[str] = []
+                cursor = None
+                while True:
+                    params = {"sort": sort, "limit": 2, "world_id": world_id}
+                    if cursor:
+                        params["cursor"] = cursor
+                    response = await client.get(path, params=params)
+                    assert response.status_code == 200, response.json()
+                    data = response.json()
+                    for story in data["stories"]:
+                        assert "content" not in story
+                        seen.append(story["id"])
+                    cursor = data["next_cursor"]
+                    assert data["has_more"] is (cursor is not None)
+                    if not cursor:
+                        break
+                assert len(seen) == len(set(seen)) == 3
+                assert set(seen) == created_ids
+
+    @pytest.mark.asyncio
+    async def test_list_stories_invalid_cursor(self, client: AsyncClient) -> None:
+        """A malformed cursor is rejected with an actionable 400."""
+        response = await client.get("/api/stories", params={"sort": "engagement", "cursor": "nope"})
+        assert response.status_code == 400
+        assert "how_to_fix" in response.json()["detail"]
+
     # ==========================================================================
     # Story Details Tests
     # ==========================================================================
@@ -0,0 +1,211 @@
+"""Tests for batched X feedback polling against a local mock X API.
+
+The mock serves the three endpoints the monitor uses (recent search, quote
+tweets, tweet lookup) and is mounted on the monitor's shared client through an
+ASGI transport, so the full request path — rate-limit headers, concurrency,
+parsing — runs without touching the real X API.
+"""
+
+import json
+import os
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+import services.x_feedback_monitor as monitor
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def build_mock_x_api(posts: dict[str, dict], rate_limit_first_search: bool = False) -> FastAPI:
+    """Mock X API v2. posts maps x_post_id -> {"replies": [...], "quotes": [...], "likes": int}."""
+    app = FastAPI()
+    app.state.calls = []
+    app.state.search_limited = not rate_limit_first_search
+
+    def _tweets(items: list[tuple[str, str]], prefix: str) -> dict:
+        return {
+            "data": [
+                {"id": tweet_id, "text": text, "author_id": f"{prefix}-{tweet_id}"}
+                for tweet_id, text in items
+            ],
+            "includes": {
+                "users": [
+                    {"id": f"{prefix}-{tweet_id}", "username": f"user_{tweet_id}"}
+                    for tweet_id, _ in items
+                ]
+            },
+        }
+
+    @app.get("/2/tweets/search/recent")
+    async def search(request: Request, query: str):
+        app.state.calls.append(("search", query))
+        if not app.state.search_limited:
+            app.state.search_limited = True
+            return JSONResponse(
+                {"title": "Too Many Requests"},
+                status_code=429,
+                headers={"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(time.time()))},
+            )
+        post_id = query.split("conversation_id:")[1].split()[0]
+        return _tweets(posts.get(post_id, {}).get("replies", []), "r")
+
+    @app.get("/2/tweets/{post_id}/quote_tweets")
+    async def quotes(post_id: str):
+        app.state.calls.append(("quotes", post_id))
+        return _tweets(posts.get(post_id, {}).get("quotes", []), "q")
+
+    @app.get("/2/tweets/{post_id}")
+    async def lookup(post_id: str):
+        app.state.calls.append(("lookup", post_id))
+        return {"data": {"id": post_id, "public_metrics": {"like_count": posts[post_id]["likes"]}}}
+
+    return app
+
+
+@pytest.fixture
+def mock_x(monkeypatch):
+    """Install a mock X API on the monitor's shared client."""
+    monkeypatch.setenv("X_BEARER_TOKEN", "test-token")
+    monkeypatch.setattr(monitor, "_rate_limit_reset_at", {})
+
+    async def install(posts: dict[str, dict], **kwargs) -> FastAPI:
+        app = build_mock_x_api(posts, **kwargs)
+        monkeypatch.setattr(
+            monitor,
+            "_x_client",
+            AsyncClient(transport=ASGITransport(app=app), base_url="http://mock-x/2"),
+        )
+        return app
+
+    return install
+
+
+@pytest.fixture
+def batch_sentiment(monkeypatch):
+    """Fake the Haiku call; records each batch and labels everything 'positive'."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    batches: list[int] = []
+
+    async def fake_call(client, api_key, prompt, max_tokens):
+        count = sum(1 for line in prompt.splitlines() if line[:1].isdigit())
+        batches.append(count)
+        return json.dumps(["positive"] * count)
+
+    monkeypatch.setattr(monitor, "_call_haiku", fake_call)
+    return batches
+
+
+@requires_postgres
+class TestPollPublishedStories:
+    """poll_all_published_stories end to end against the mock API."""
+
+    async def _published_stories(self, db_session, post_ids: list[str]) -> list:
+        from db.models import Story, StoryPerspective, User, UserType, World
+        from utils.clock import now as utc_now
+
+        author = User(type=UserType.AGENT, username=f"x-poll-{uuid4().hex[:12]}", name="X Poller")
+        db_session.add(author)
+        await db_session.flush()
+        world = World(
+            name="X Poll World",
+            premise="A world whose stories are published to X " * 3,
+            scientific_basis="Social signal science " * 10,
+            year_setting=2090,
+            created_by=author.id,
+        )
+        db_session.add(world)
+        await db_session.flush()
+
+        stories = []
+        for post_id in post_ids:
+            story = Story(
+                world_id=world.id,
+                author_id=author.id,
+                title=f"Published {post_id}",
+                content="A story that went out on X. " * 10,
+                perspective=StoryPerspective.FIRST_PERSON_AGENT,
+                video_prompt="Cinematic scene of a published story, dramatic lighting. " * 2,
+                x_post_id=post_id,
+                x_published_at=utc_now(),
+            )
+            db_session.add(story)
+            stories.append(story)
+        await db_session.commit()
+        return stories
+
+    @pytest.mark.asyncio
+    async def test_ingests_replies_quotes_and_likes(self, db_session, mock_x, batch_sentiment) -> None:
+        from db.models import ExternalFeedback
+
+        stories = await self._published_stories(db_session, ["p1", "p2", "p3"])
+        app = await mock_x(
+            {
+                "p1": {"replies": [("r1", "love it"), ("r2", "more please")], "quotes": [("q1", "wow")], "likes": 7},
+                "p2": {"replies": [("r3", "hmm")], "likes": 2},
+                "p3": {"likes": 0},
+            },
+            rate_limit_first_search=True,
+        )
+
+        assert await monitor.poll_all_published_stories(db_session) == 7
+
+        rows = (await db_session.execute(select(ExternalFeedback))).scalars().all()
+        by_post = {row.source_post_id: row for row in rows}
+        assert set(by_post) == {"r1", "r2", "r3", "q1", "p1:likes", "p2:likes", "p3:likes"}
+        assert by_post["r1"].story_id == stories[0].id
+        assert by_post["r1"].source_user == "user_r1"
+        assert by_post["q1"].weight == 3.0
+        assert by_post["p1:likes"].weight == 7.0
+        assert all(row.sentiment == "positive" for row in rows)
+        # Four replies/quotes classified in one LLM call
+        assert batch_sentiment == [4]
+        # The rate-limited search was retried, not dropped
+        assert sum(1 for kind, _ in app.state.calls if kind == "search") == 4
+
+    @pytest.mark.asyncio
+    async def test_repoll_skips_existing_and_updates_likes(self, db_session, mock_x, batch_sentiment) -> None:
+        from db.models import ExternalFeedback
+
+        await self._published_stories(db_session, ["p9"])
+        posts = {"p9": {"replies": [("r9", "first")], "likes": 1}}
+        await mock_x(posts)
+        assert await monitor.poll_all_published_stories(db_session) == 2
+
+        posts["p9"] = {"replies": [("r9", "first"), ("r10", "second")], "likes": 5}
+        assert await monitor.poll_all_published_stories(db_session) == 1
+        assert batch_sentiment == [1, 1]
+
+        db_session.expire_all()
+        likes = (await db_session.execute(
+            select(ExternalFeedback).where(ExternalFeedback.source_post_id == "p9:likes")
+        )).scalar_one()
+        assert likes.weight == 5.0
+
+    @pytest.mark.asyncio
+    async def test_no_credentials_skips_polling(self, db_session, monkeypatch) -> None:
+        monkeypatch.delenv("X_BEARER_TOKEN", raising=False)
+        assert await monitor.poll_all_published_stories(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_classify_sentiments_falls_back_per_batch(monkeypatch) -> None:
+    """A malformed batch response leaves that batch neutral without failing others."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(monitor, "SENTIMENT_BATCH_SIZE", 2)
+    responses = iter(['["constructive", "negative"]', "not json"])
+
+    async def fake_call(client, api_key, prompt, max_tokens):
+        return next(responses)
+
+    monkeypatch.setattr(monitor, "_call_haiku", fake_call)
+    result = await monitor.classify_sentiments(["a", "b", "", "c"])
+    assert result == ["constructive", "negative", "neutral", "neutral"]
@@ -0,0 +1,223 @@
+"""Materialized per-agent activity counters (platform_agent_stats).
+
+Heartbeats, nudges and agent listings need per-agent activity counts on
+every call. Instead of counting nine tables each time, write paths call
+bump_agent_stats() in the same transaction as the row they add or remove,
+and readers take one primary-key read via get_agent_stats().
+
+A user without a stats row (new since the backfill, or created outside the
+API) gets one computed from the source tables on first bump or read.
+Cascading deletes (a world, a story's reviews) and manual SQL aren't
+tracked; run_agent_stats_reconciler recomputes every row periodically and
+fixes whatever drifted.
+"""
+
+import asyncio
+import logging
+import os
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import db as db_module
+from db import (
+    AgentStats, Aspect, AspectValidation, Dweller, DwellerAction, Proposal,
+    Story, StoryReview, User, Validation, WorldEvent,
+)
+from db.models import ProposalStatus
+
+logger = logging.getLogger(__name__)
+
+AGENT_STATS_RECONCILE_SECONDS = float(os.getenv("AGENT_STATS_RECONCILE_SECONDS", "3600"))
+AGENT_STATS_RECONCILE_BATCH = 500
+
+
+def _count(*conditions):
+    return select(func.count()).where(*conditions).correlate(User).scalar_subquery()
+
+
+# Counter column -> how to count it from the source tables, per User row
+AGENT_STAT_SOURCES = {
+    "stories_written": _count(Story.author_id == User.id),
+    "stories_reviewed": _count(StoryReview.reviewer_id == User.id),
+    "proposals_validated": _count(Validation.agent_id == User.id),
+    "aspects_validated": _count(AspectValidation.agent_id == User.id),
+    "dwellers_created": _count(Dweller.created_by == User.id),
+    "actions_taken": _count(DwellerAction.actor_id == User.id),
+    "worlds_proposed": _count(Proposal.agent_id == User.id),
+    "aspects_proposed": _count(Aspect.agent_id == User.id),
+    "events_proposed": _count(WorldEvent.proposed_by == User.id),
+    "unresponded_reviews": (
+        select(func.count())
+        .select_from(StoryReview)
+        .join(Story, StoryReview.story_id == Story.id)
+        .where(Story.author_id == User.id, StoryReview.author_responded == False)
+        .correlate(User)
+        .scalar_subquery()
+    ),
+    "worlds_created": _count(
+        Proposal.agent_id == User.id, Proposal.status == ProposalStatus.APPROVED
+    ),
+    "dwellers_inhabited": _count(Dweller.inhabited_by == User.id),
+}
+AGENT_STAT_COLUMNS = tuple(AGENT_STAT_SOURCES)
+
+
+async def refresh_agent_stats(db: AsyncSession, user_ids: list[UUID], only_changed: bool = False) -> int:
+    """Recompute stats rows for users from the source tables. Caller commits.
+
+    Returns the number of rows written (with only_changed, the number that
+    had drifted).
+    """
+    if not user_ids:
+        return 0
+    source = select(
+        User.id, *(count.label(column) for column, count in AGENT_STAT_SOURCES.items())
+    ).where(User.id.in_(user_ids))
+    stmt = pg_insert(AgentStats).from_select(["user_id", *AGENT_STAT_COLUMNS], source)
+    table = AgentStats.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            **{column: stmt.excluded[column] for column in AGENT_STAT_COLUMNS},
+            "updated_at": func.now(),
+        },
+        where=(
+            tuple_(*(table.c[column] for column in AGENT_STAT_COLUMNS))
+            .is_distinct_from(tuple_(*(stmt.excluded[column] for column in AGENT_STAT_COLUMNS)))
+            if only_changed else None
+        ),
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def bump_agent_stats(db: AsyncSession, user_id: UUID | None, **deltas: int) -> None:
+    """Add deltas to a user's counters, e.g. bump_agent_stats(db, uid, stories_written=1).
+
+    Call after adding (or deleting) the source row, inside the same
+    transaction. Counters never go below zero.
+    """
+    unknown = set(deltas) - set(AGENT_STAT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown agent stats: {sorted(unknown)}")
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if user_id is None or not deltas:
+        return
+
+    table = AgentStats.__table__
+    result = await db.execute(
+        update(table)
+        .where(table.c.user_id == user_id)
+        .values(
+            **{column: func.greatest(0, table.c[column] + delta) for column, delta in deltas.items()},
+            updated_at=func.now(),
+        )
+    )
+    if result.rowcount == 0:
+        # No row yet: count from the source tables, which include the new row
+        await db.flush()
+        await refresh_agent_stats(db, [user_id])
+
+
+async def bump_agent_stats_many(
+    db: AsyncSession, bumps: list[tuple[UUID | None, dict[str, int]]]
+) -> None:
+    """Apply bump_agent_stats for several users, locking their rows in user id order.
+
+    Two transactions bumping the same pair of users in opposite orders (two
+    agents reviewing each other's stories) would otherwise deadlock.
+    """
+    merged: dict[UUID, dict[str, int]] = {}
+    for user_id, deltas in bumps:
+        if user_id is None:
+            continue
+        totals = merged.setdefault(user_id, {})
+        for column, delta in deltas.items():
+            totals[column] = totals.get(column, 0) + delta
+    for user_id in sorted(merged):
+        await bump_agent_stats(db, user_id, **merged[user_id])
+
+
+async def get_agent_stats_many(db: AsyncSession, user_ids: list[UUID]) -> dict[UUID, dict[str, int]]:
+    """Counters for several users by id, creating missing rows."""
+    table = AgentStats.__table__
+    query = select(table.c.user_id, *(table.c[column] for column in AGENT_STAT_COLUMNS))
+
+    async def fetch(ids: list[UUID]) -> dict[UUID, dict[str, int]]:
+        rows = (await db.execute(query.where(table.c.user_id.in_(ids)))).mappings().all()
+        return {row["user_id"]: {column: row[column] for column in AGENT_STAT_COLUMNS} for row in rows}
+
+    if not user_ids:
+        return {}
+    stats = await fetch(user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in stats]
+    if missing:
+        await refresh_agent_stats(db, missing)
+        stats.update(await fetch(missing))
+    return stats
+
+
+async def get_agent_stats(db: AsyncSession, user_id: UUID) -> dict[str, int]:
+    """All counters for a user (zeros for an unknown user)."""
+    stats = await get_agent_stats_many(db, [user_id])
+    return stats.get(user_id) or dict.fromkeys(AGENT_STAT_COLUMNS, 0)
+
+
+async def reconcile_agent_stats(db: AsyncSession, after: UUID | None = None) -> tuple[int, UUID | None]:
+    """Recompute one batch of users ordered by id, starting after `after`.
+
+    Returns (rows corrected, last user id in the batch or None when done).
+    Existing rows in the batch are locked first, so bumps from transactions
+    still in flight are either counted (they committed before the lock was
+    granted) or applied on top of the recomputed values (they wait for it).
+    """
+    query = select(User.id).order_by(User.id).limit(AGENT_STATS_RECONCILE_BATCH)
+    if after is not None:
+        query = query.where(User.id > after)
+    user_ids = list((await db.execute(query)).scalars().all())
+    if not user_ids:
+        return 0, None
+
+    await db.execute(
+        select(AgentStats.user_id)
+        .where(AgentStats.user_id.in_(user_ids))
+        .order_by(AgentStats.user_id)
+        .with_for_update()
+    )
+    corrected = await refresh_agent_stats(db, user_ids, only_changed=True)
+    return corrected, user_ids[-1]
+
+
+async def reconcile_all_agent_stats() -> int:
+    """Reconcile every user in batches, one transaction per batch."""
+    corrected = 0
+    after = None
+    while True:
+        async with db_module.BackgroundSessionLocal() as db:
+            batch_corrected, after = await reconcile_agent_stats(db, after)
+            await db.commit()
+        corrected += batch_corrected
+        if after is None:
+            return corrected
+
+
+async def run_agent_stats_reconciler(stop_event: asyncio.Event) -> None:
+    """Reconcile agent stats on an interval until shutdown."""
+    logger.info("Agent stats reconciler started")
+    try:
+        while not stop_event.is_set():
+            try:
+                corrected = await reconcile_all_agent_stats()
+                if corrected:
+                    logger.info("Agent stats reconciler corrected %d row(s)", corrected)
+            except Exception:
+                logger.exception("Agent stats reconciliation failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=AGENT_STATS_RECONCILE_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        logger.info("Agent stats reconciler stopped")
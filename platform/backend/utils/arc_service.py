@@ -9,6 +9,12 @@ Read paths (called from arcs.py):
     list_arcs(db, world_id, dweller_id, limit, offset)
     get_story_arc(story_id, db)
 
+Summaries (background — never on the read path):
+    refresh_arc_summaries(db, arc_ids=None)
+    Called after arc assignment and by a periodic sweep. Regenerates the
+    one-sentence LLM summary for arcs changed since their last summary, and
+    skips the LLM call when the first and latest story are unchanged.
+
 Detection algorithm (assign_story_to_arc):
 - Get the new story's content_embedding (generated at creation time)
 - Query existing arcs for this dweller from story_arcs table
@@ -22,6 +28,7 @@ Backfill (for existing stories):
 """
 
 import asyncio
+import hashlib
 import logging
 import math
 import os
@@ -29,7 +36,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, text
+from sqlalchemy import and_, func, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -40,7 +47,9 @@ logger = logging.getLogger(__name__)
 ARC_JOIN_THRESHOLD = 0.75
 
 SUMMARY_MODEL = "gpt-4o-mini"
-SUMMARY_CACHE_LIMIT = 256
+# Arcs summarized per refresh pass, and the interval of the background sweep
+SUMMARY_REFRESH_BATCH = 50
+SUMMARY_REFRESH_SECONDS = float(os.getenv("ARC_SUMMARY_REFRESH_SECONDS", "300"))
 CONCLUSION_ACTION_TYPES = {
     "conclude",
     "conclusion",
@@ -54,8 +63,6 @@ CONCLUSION_CONTENT_MARKERS = (
     "#conclusion",
     "thread resolved",
 )
-_summary_cache: dict[tuple[str, str, str | None, str | None], str | None] = {}
-_CACHE_MISS = object()
 
 
 # ---------------------------------------------------------------------------
@@ -205,16 +212,10 @@ def _compute_arc_health_score(
     return round(_clamp01(score), 3)
 
 
-def _get_cached_summary(cache_key: tuple[str, str, str | None, str | None]) -> str | None | object:
-    return _summary_cache.get(cache_key, _CACHE_MISS)
-
-
-def _store_summary(cache_key: tuple[str, str, str | None, str | None], summary: str | None) -> None:
-    if len(_summary_cache) >= SUMMARY_CACHE_LIMIT:
-        # dict preserves insertion order in py3.7+; evict oldest entry
-        oldest_key = next(iter(_summary_cache))
-        _summary_cache.pop(oldest_key, None)
-    _summary_cache[cache_key] = summary
+def _summary_fingerprint(first_story: dict[str, Any], latest_story: dict[str, Any]) -> str:
+    """Fingerprint of the stories a summary is written from."""
+    source = f"{first_story['id']}:{first_story['title']}|{latest_story['id']}:{latest_story['title']}"
+    return hashlib.sha1(source.encode()).hexdigest()
 
 
 async def _generate_arc_summary(
@@ -224,20 +225,14 @@ async def _generate_arc_summary(
     dweller_name: str | None,
     world_name: str | None,
 ) -> str | None:
-    cache_key = (first_title, latest_title, dweller_name, world_name)
-    cached = _get_cached_summary(cache_key)
-    if cached is not _CACHE_MISS:
-        return cached  # type: ignore[return-value]
-
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
-        _store_summary(cache_key, None)
         return None
 
     try:
-        from openai import AsyncOpenAI
+        from utils.embeddings import get_openai_client
 
-        client = AsyncOpenAI(api_key=api_key)
+        client = get_openai_client()
         response = await client.chat.completions.create(
             model=SUMMARY_MODEL,
             temperature=0.3,
@@ -266,11 +261,9 @@ async def _generate_arc_summary(
         summary = summary.strip('"').strip()
         if summary and len(summary) > 220:
             summary = summary[:217].rstrip() + "..."
-        _store_summary(cache_key, summary or None)
         return summary or None
     except Exception:
         logger.exception("Arc summary generation failed")
-        _store_summary(cache_key, None)
         return None
 
 
@@ -278,9 +271,11 @@ async def _generate_arc_summary(
 # Write path: assign_story_to_arc
 # ---------------------------------------------------------------------------
 
-async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
+async def assign_story_to_arc(db: AsyncSession, story: Any) -> Any | None:
     """Assign a newly-created story to an existing arc or create a new one.
 
+    Returns the arc the story now belongs to (None if it isn't arc-tracked).
+
     Called after story creation commits (in background task in stories.py).
     Only runs if the story has a perspective_dweller_id (arcs are per-dweller).
 
@@ -294,7 +289,7 @@ async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
     from db import StoryArc
 
     if not story.perspective_dweller_id:
-        return  # Only track per-dweller arcs for now
+        return None  # Only track per-dweller arcs for now
 
     story_id = str(story.id)
     dweller_id = story.perspective_dweller_id
@@ -333,8 +328,7 @@ async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
 
     if story_embedding is None:
         # No embedding available — create a seed arc and exit
-        await _create_arc(db, story, world_id, dweller_id, [story_id])
-        return
+        return await _create_arc(db, story, world_id, dweller_id, [story_id])
 
     # Step 3 & 4: Find the best-matching arc by centroid similarity
     best_arc: StoryArc | None = None
@@ -381,12 +375,14 @@ async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
         logger.info(
             "Story %s joined arc %s (sim=%.3f)", story_id, best_arc.id, best_sim
         )
-    else:
-        # Step 5: Create a new arc (seed for future stories)
-        await _create_arc(db, story, world_id, dweller_id, [story_id])
-        logger.info(
-            "Story %s seeded new arc (best_sim=%.3f)", story_id, best_sim
-        )
+        return best_arc
+
+    # Step 5: Create a new arc (seed for future stories)
+    arc = await _create_arc(db, story, world_id, dweller_id, [story_id])
+    logger.info(
+        "Story %s seeded new arc (best_sim=%.3f)", story_id, best_sim
+    )
+    return arc
 
 
 async def _create_arc(
@@ -395,7 +391,7 @@ async def _create_arc(
     world_id: UUID,
     dweller_id: UUID,
     story_ids: list[str],
-) -> None:
+) -> Any:
     """Create a new StoryArc. Fetches dweller name for arc naming."""
     from db import StoryArc
 
@@ -416,6 +412,7 @@ async def _create_arc(
     )
     db.add(arc)
     await db.flush()
+    return arc
 
 
 # ---------------------------------------------------------------------------
@@ -626,7 +623,6 @@ async def _build_arc_list_payloads(db: AsyncSession, arcs: list[Any]) -> list[di
             }
 
     payloads: list[dict[str, Any]] = []
-    summary_specs: list[tuple[int, str, str, str | None, str | None]] = []
 
     for arc in arcs:
         arc_story_ids = list(arc.story_ids or [])
@@ -721,50 +717,145 @@ async def _build_arc_list_payloads(db: AsyncSession, arcs: list[Any]) -> list[di
             "momentum": momentum,
             "days_since_last_story": days_since_last_story,
             "arc_health_score": arc_health_score,
-            "summary": None,
+            # Generated in the background by refresh_arc_summaries
+            "summary": arc.summary if len(ordered_stories) >= 2 else None,
         }
 
-        if len(ordered_stories) >= 2:
-            summary_specs.append(
-                (
-                    len(payloads),
-                    ordered_stories[0]["title"],
-                    ordered_stories[-1]["title"],
-                    payload["dweller_name"],
-                    payload["world_name"],
-                )
-            )
-
         payloads.append(payload)
 
-    if summary_specs:
-        semaphore = asyncio.Semaphore(4)
-
-        async def _summarize(
-            first_title: str,
-            latest_title: str,
-            dweller_name: str | None,
-            world_name: str | None,
-        ) -> str | None:
-            async with semaphore:
-                return await _generate_arc_summary(
-                    first_title=first_title,
-                    latest_title=latest_title,
-                    dweller_name=dweller_name,
-                    world_name=world_name,
-                )
+    return payloads
+
 
-        summary_results = await asyncio.gather(
-            *[
-                _summarize(first_title, latest_title, dweller_name, world_name)
-                for _, first_title, latest_title, dweller_name, world_name in summary_specs
-            ]
+# ---------------------------------------------------------------------------
+# Background: arc summaries
+# ---------------------------------------------------------------------------
+
+async def refresh_arc_summaries(
+    db: AsyncSession,
+    arc_ids: list[UUID] | None = None,
+    limit: int = SUMMARY_REFRESH_BATCH,
+) -> int:
+    """Regenerate summaries for arcs that changed since their last summary.
+
+    An arc is stale when its updated_at has moved past the summary_updated_at
+    stamped at its last summary. If its first and latest story still match
+    summary_source, the summary is just marked fresh; otherwise it is
+    regenerated. Arcs whose LLM call fails stay stale and are retried by the
+    next pass. Returns summaries written.
+    """
+    from db import StoryArc
+
+    if not os.getenv("OPENAI_API_KEY"):
+        return 0
+
+    query = (
+        select(StoryArc)
+        .options(selectinload(StoryArc.world), selectinload(StoryArc.dweller))
+        .where(
+            and_(
+                func.jsonb_array_length(StoryArc.story_ids) >= 2,
+                or_(
+                    StoryArc.summary_updated_at.is_(None),
+                    StoryArc.summary_updated_at < StoryArc.updated_at,
+                ),
+            )
         )
+        .order_by(StoryArc.updated_at.desc())
+        .limit(limit)
+        .execution_options(populate_existing=True)
+    )
+    if arc_ids is not None:
+        query = query.where(StoryArc.id.in_(arc_ids))
+    arcs = list((await db.execute(query)).scalars().all())
+    if not arcs:
+        return 0
 
-        for (payload_index, *_), summary in zip(summary_specs, summary_results):
-            payloads[payload_index]["summary"] = summary
+    story_uuid_ids: list[UUID] = []
+    for arc in arcs:
+        for sid in arc.story_ids or []:
+            try:
+                story_uuid_ids.append(UUID(sid))
+            except ValueError:
+                continue
+    stories_result = await db.execute(
+        text(
+            "SELECT id, title, created_at FROM platform_stories "
+            "WHERE id = ANY(:ids)"
+        ),
+        {"ids": story_uuid_ids},
+    )
+    stories_by_id = {
+        str(row.id): {"id": str(row.id), "title": row.title, "created_at": row.created_at}
+        for row in stories_result.fetchall()
+    }
 
-    return payloads
+    async def _mark(arc: Any, **values: Any) -> None:
+        # Stamp the arc version that was summarized; skipped if the arc changed
+        # meanwhile. updated_at is kept as is (it orders listings).
+        await db.execute(
+            update(StoryArc)
+            .where(and_(StoryArc.id == arc.id, StoryArc.updated_at == arc.updated_at))
+            .values(summary_updated_at=StoryArc.updated_at, updated_at=StoryArc.updated_at, **values)
+        )
+
+    semaphore = asyncio.Semaphore(4)
+
+    async def _summarize(arc: Any, first: dict[str, Any], latest: dict[str, Any]) -> str | None:
+        async with semaphore:
+            return await _generate_arc_summary(
+                first_title=first["title"],
+                latest_title=latest["title"],
+                dweller_name=arc.dweller.name if arc.dweller else None,
+                world_name=arc.world.name if arc.world else "Unknown",
+            )
+
+    to_generate: list[tuple[Any, dict[str, Any], dict[str, Any], str]] = []
+    for arc in arcs:
+        stories = [stories_by_id[sid] for sid in arc.story_ids or [] if sid in stories_by_id]
+        stories.sort(key=lambda story: story["created_at"])
+        if len(stories) < 2:
+            continue
+        fingerprint = _summary_fingerprint(stories[0], stories[-1])
+        if arc.summary and fingerprint == arc.summary_source:
+            await _mark(arc)
+        else:
+            to_generate.append((arc, stories[0], stories[-1], fingerprint))
+
+    summaries = await asyncio.gather(
+        *[_summarize(arc, first, latest) for arc, first, latest, _ in to_generate]
+    )
+    written = 0
+    for (arc, _, _, fingerprint), summary in zip(to_generate, summaries):
+        if summary is None:
+            continue
+        await _mark(arc, summary=summary, summary_source=fingerprint)
+        written += 1
+    return written
+
+
+async def run_arc_summary_refresher(stop_event: asyncio.Event) -> None:
+    """Sweep stale arc summaries on an interval until shutdown.
+
+    Story creation refreshes its own arc right away; the sweep catches
+    failures, backfills and arcs rebuilt by detect_arcs.
+    """
+    from db.database import BackgroundSessionLocal
+
+    logger.info("Arc summary refresher started")
+    try:
+        while not stop_event.is_set():
+            try:
+                async with BackgroundSessionLocal() as db:
+                    await refresh_arc_summaries(db)
+                    await db.commit()
+            except Exception:
+                logger.exception("Arc summary refresh failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=SUMMARY_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        logger.info("Arc summary refresher stopped")
 
 
 # ---------------------------------------------------------------------------
@@ -796,17 +887,27 @@ async def detect_arcs(db: AsyncSession) -> list[dict[str, Any]]:
 
     if unembedded_rows:
         logger.info("Computing embeddings for %d stories", len(unembedded_rows))
-        for row in unembedded_rows:
-            embed_text = f"Title: {row.title}\n\n{(row.content or '')[:5000]}"
-            embedding = await _generate_embedding(embed_text)
-            if embedding:
-                await db.execute(
-                    text(
-                        "UPDATE platform_stories SET content_embedding = CAST(:emb AS vector) "
-                        "WHERE id = :story_id"
-                    ),
-                    {"emb": str(embedding), "story_id": str(row.id)},
-                )
+        from utils.embeddings import generate_embeddings
+
+        try:
+            embeddings = await generate_embeddings([
+                f"Title: {row.title}\n\n{(row.content or '')[:5000]}"
+                for row in unembedded_rows
+            ])
+        except Exception:
+            logger.exception("Failed to generate story embeddings")
+            embeddings = []
+        if embeddings:
+            await db.execute(
+                text(
+                    "UPDATE platform_stories SET content_embedding = CAST(:emb AS vector) "
+                    "WHERE id = :story_id"
+                ),
+                [
+                    {"emb": str(embedding), "story_id": str(row.id)}
+                    for row, embedding in zip(unembedded_rows, embeddings)
+                ],
+            )
         await db.flush()
 
     # Step 2: Load all stories with embeddings, in chronological order
@@ -2,14 +2,26 @@
 
 Uses OpenAI's text-embedding-3-small model for generating embeddings.
 These embeddings are used to detect similar world proposals and prevent duplicates.
+
+Embeddings are cached by content hash (in-process LRU, then the
+platform_embedding_cache table), identical concurrent requests are coalesced,
+and all calls share one OpenAI client. The cache table is read and written
+through the background pool: callers are usually requests that already hold
+a request-pool connection, and a second checkout from that pool per lookup
+could starve it under load.
 """
 
+import asyncio
+import hashlib
 import os
 import logging
+from collections import OrderedDict
 from typing import Any
 
 import openai
 
+from utils.simulation import is_simulation
+
 logger = logging.getLogger(__name__)
 
 # Embedding configuration
@@ -20,19 +32,203 @@ EMBEDDING_DIMENSIONS = 1536  # Default for text-embedding-3-small
 SIMILARITY_THRESHOLD_GLOBAL = 0.75  # For checking against all proposals/worlds
 SIMILARITY_THRESHOLD_SELF = 0.90  # For checking agent's own proposals (stricter)
 
+# Query-embedding cache: in-process LRU in front of platform_embedding_cache
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+EMBEDDING_BATCH_SIZE = 100  # Inputs per embeddings API request
+_embedding_lru: OrderedDict[str, list[float]] = OrderedDict()
+# Single-flight: content hash -> future for lookups/requests in progress
+_inflight: dict[str, asyncio.Future] = {}
+
+# ANN search (HNSW / IVFFlat indexes from migration 0037). Queries take the
+# nearest candidates in index order, then apply the similarity threshold.
+VECTOR_SEARCH_EF = int(os.getenv("VECTOR_SEARCH_EF", "40"))  # hnsw.ef_search
+VECTOR_SEARCH_PROBES = int(os.getenv("VECTOR_SEARCH_PROBES", "10"))  # ivfflat.probes
+# Candidates fetched per requested result, to leave room for threshold/filter losses
+ANN_CANDIDATE_FACTOR = 4
+
+
+_openai_client: openai.AsyncOpenAI | None = None
+_openai_client_key: str | None = None
+
 
 def get_openai_client() -> openai.AsyncOpenAI:
-    """Get configured OpenAI async client."""
+    """Get the shared OpenAI async client (one connection pool per process)."""
+    global _openai_client, _openai_client_key
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required for embeddings")
-    return openai.AsyncOpenAI(api_key=api_key)
+    if _openai_client is None or _openai_client_key != api_key:
+        _openai_client = openai.AsyncOpenAI(api_key=api_key)
+        _openai_client_key = api_key
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client (called on shutdown)."""
+    global _openai_client, _openai_client_key
+    if _openai_client is not None:
+        await _openai_client.close()
+    _openai_client = None
+    _openai_client_key = None
+
+
+def _prepare_text(text: str) -> str:
+    # Truncate text if too long (model has 8191 token limit)
+    # Rough estimate: 4 chars per token
+    max_chars = 30000
+    if len(text) > max_chars:
+        logger.warning(f"Text truncated to {max_chars} chars for embedding")
+        return text[:max_chars]
+    return text
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\n{text}".encode()).hexdigest()
+
+
+def _lru_get(key: str) -> list[float] | None:
+    embedding = _embedding_lru.get(key)
+    if embedding is not None:
+        _embedding_lru.move_to_end(key)
+    return embedding
+
+
+def _lru_put(key: str, embedding: list[float]) -> None:
+    _embedding_lru[key] = embedding
+    _embedding_lru.move_to_end(key)
+    while len(_embedding_lru) > EMBEDDING_CACHE_SIZE:
+        _embedding_lru.popitem(last=False)
+
+
+async def _load_persisted(keys: list[str]) -> dict[str, list[float]]:
+    """Look up embeddings in platform_embedding_cache. Failures are a cache miss."""
+    if not keys:
+        return {}
+    try:
+        import db as db_module
+        from sqlalchemy import select
+        from db import EmbeddingCache
+
+        async with db_module.BackgroundSessionLocal() as db:
+            result = await db.execute(
+                select(EmbeddingCache.content_hash, EmbeddingCache.embedding)
+                .where(EmbeddingCache.content_hash.in_(keys))
+            )
+            return {row.content_hash: list(row.embedding) for row in result}
+    except Exception as e:
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        return {}
+
+
+async def _persist(embeddings: dict[str, list[float]]) -> None:
+    """Write new embeddings to platform_embedding_cache. Failures are logged only."""
+    if not embeddings:
+        return
+    try:
+        import db as db_module
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from db import EmbeddingCache
+
+        async with db_module.BackgroundSessionLocal() as db:
+            await db.execute(
+                pg_insert(EmbeddingCache)
+                .values([
+                    {"content_hash": key, "model": EMBEDDING_MODEL, "embedding": embedding}
+                    for key, embedding in embeddings.items()
+                ])
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Embedding cache write failed: {e}")
+
+
+async def _request_embeddings(texts: list[str]) -> list[list[float]]:
+    """Call the embeddings API, EMBEDDING_BATCH_SIZE inputs per request."""
+    client = get_openai_client()
+    embeddings: list[list[float]] = []
+    for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        response = await client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts[i:i + EMBEDDING_BATCH_SIZE],
+        )
+        embeddings.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+    return embeddings
+
+
+async def generate_embeddings(texts: list[str]) -> list[list[float]]:
+    """
+    Generate embeddings for several texts, in input order.
+
+    Each text is looked up in the in-process LRU, then in the persistent
+    cache; the remaining misses go to OpenAI in batched requests. Concurrent
+    callers asking for the same text share one lookup/request.
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set and a text is not cached
+        openai.APIError: If the API call fails
+    """
+    prepared = [_prepare_text(text) for text in texts]
+    keys = [_content_hash(text) for text in prepared]
+    if is_simulation():
+        # Simulation runs must see every call (and its injected faults)
+        return await _request_embeddings(prepared)
+
+    found: dict[str, list[float]] = {}
+    waiting: dict[str, asyncio.Future] = {}
+    owned: dict[str, str] = {}  # key -> text, for keys this call resolves
+    for key, text in zip(keys, prepared):
+        if key in found or key in waiting or key in owned:
+            continue
+        cached = _lru_get(key)
+        if cached is not None:
+            found[key] = cached
+        elif key in _inflight:
+            waiting[key] = _inflight[key]
+        else:
+            owned[key] = text
+
+    if owned:
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in owned}
+        _inflight.update(futures)
+        try:
+            resolved = await _load_persisted(list(owned))
+            missing = [key for key in owned if key not in resolved]
+            if missing:
+                fresh = dict(zip(missing, await _request_embeddings([owned[key] for key in missing])))
+                await _persist(fresh)
+                resolved.update(fresh)
+            for key, embedding in resolved.items():
+                _lru_put(key, embedding)
+                futures[key].set_result(embedding)
+            found.update(resolved)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved; waiters re-raise it
+            raise
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+        finally:
+            for key in futures:
+                _inflight.pop(key, None)
+
+    for key, future in waiting.items():
+        found[key] = await asyncio.shield(future)
+
+    return [found[key] for key in keys]
 
 
 async def generate_embedding(text: str) -> list[float]:
     """
     Generate embedding for text using OpenAI.
 
+    Cached and coalesced; see generate_embeddings.
+
     Args:
         text: The text to embed (typically premise + scientific_basis)
 
@@ -43,21 +239,7 @@ async def generate_embedding(text: str) -> list[float]:
         ValueError: If OPENAI_API_KEY is not set
         openai.APIError: If the API call fails
     """
-    client = get_openai_client()
-
-    # Truncate text if too long (model has 8191 token limit)
-    # Rough estimate: 4 chars per token
-    max_chars = 30000
-    if len(text) > max_chars:
-        text = text[:max_chars]
-        logger.warning(f"Text truncated to {max_chars} chars for embedding")
-
-    response = await client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=text,
-    )
-
-    return response.data[0].embedding
+    return (await generate_embeddings([text]))[0]
 
 
 def create_proposal_text_for_embedding(
@@ -88,6 +270,75 @@ def create_proposal_text_for_embedding(
     return "\n\n".join(parts)
 
 
+async def set_vector_search_params(db: Any, k: int = 0) -> None:
+    """Set ANN search parameters for the current transaction.
+
+    hnsw.ef_search bounds how many rows an HNSW scan can return, so it is
+    raised to at least k.
+    """
+    from sqlalchemy import text
+
+    await db.execute(
+        text(
+            "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+            "set_config('ivfflat.probes', :probes, true)"
+        ),
+        {
+            "ef_search": str(min(max(VECTOR_SEARCH_EF, k), 1000)),
+            "probes": str(VECTOR_SEARCH_PROBES),
+        },
+    )
+
+
+async def nearest_neighbours(
+    db: Any,  # AsyncSession
+    *,
+    table: str,
+    column: str,
+    select_columns: str,
+    embedding: list[float],
+    threshold: float,
+    limit: int,
+    where: str = "",
+    params: dict[str, Any] | None = None,
+) -> list[Any]:
+    """Rows nearest to embedding by cosine distance, above a similarity threshold.
+
+    The inner query is ORDER BY column <=> :embedding LIMIT k so it can be served
+    by the ANN index; the threshold is applied to those candidates. table,
+    column, select_columns and where are trusted SQL fragments (never user input).
+    """
+    from sqlalchemy import text
+
+    candidates = max(limit * ANN_CANDIDATE_FACTOR, limit)
+    await set_vector_search_params(db, k=candidates)
+
+    extra = f"AND {where}" if where else ""
+    query = text(f"""
+        SELECT * FROM (
+            SELECT
+                {select_columns},
+                {column} <=> CAST(:embedding AS vector) AS distance
+            FROM {table}
+            WHERE {column} IS NOT NULL
+            {extra}
+            ORDER BY {column} <=> CAST(:embedding AS vector)
+            LIMIT :candidates
+        ) nearest
+        WHERE 1 - distance > :threshold
+        ORDER BY distance
+        LIMIT :limit
+    """)
+    result = await db.execute(query, {
+        **(params or {}),
+        "embedding": str(embedding),
+        "candidates": candidates,
+        "threshold": threshold,
+        "limit": limit,
+    })
+    return result.fetchall()
+
+
 async def find_similar_proposals(
     db: Any,  # AsyncSession
     embedding: list[float],
@@ -95,6 +346,7 @@ async def find_similar_proposals(
     exclude_ids: list[str] | None = None,
     agent_id: str | None = None,
     limit: int = 5,
+    status: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Find proposals similar to the given embedding.
@@ -106,15 +358,14 @@ async def find_similar_proposals(
         exclude_ids: Proposal IDs to exclude from results
         agent_id: If provided, only search this agent's proposals
         limit: Maximum number of results
+        status: If provided, only search proposals with this status
 
     Returns:
         List of dicts with proposal info and similarity score
     """
-    from sqlalchemy import text
-
     # Build query with optional filters
-    conditions = ["premise_embedding IS NOT NULL"]
-    params = {"embedding": str(embedding), "threshold": threshold, "limit": limit}
+    conditions = []
+    params: dict[str, Any] = {}
 
     if exclude_ids:
         conditions.append("id != ALL(:exclude_ids)")
@@ -124,25 +375,21 @@ async def find_similar_proposals(
         conditions.append("agent_id = :agent_id")
         params["agent_id"] = agent_id
 
-    where_clause = " AND ".join(conditions)
-
-    query = text(f"""
-        SELECT
-            id,
-            name,
-            premise,
-            year_setting,
-            agent_id,
-            1 - (premise_embedding <=> CAST(:embedding AS vector)) as similarity
-        FROM platform_proposals
-        WHERE {where_clause}
-        AND 1 - (premise_embedding <=> CAST(:embedding AS vector)) > :threshold
-        ORDER BY similarity DESC
-        LIMIT :limit
-    """)
-
-    result = await db.execute(query, params)
-    rows = result.fetchall()
+    if status:
+        conditions.append("status = :status")
+        params["status"] = status
+
+    rows = await nearest_neighbours(
+        db,
+        table="platform_proposals",
+        column="premise_embedding",
+        select_columns="id, name, premise, year_setting, agent_id",
+        embedding=embedding,
+        threshold=threshold,
+        limit=limit,
+        where=" AND ".join(conditions),
+        params=params,
+    )
 
     return [
         {
@@ -151,7 +398,7 @@ async def find_similar_proposals(
             "premise": row.premise[:200] + "..." if len(row.premise) > 200 else row.premise,
             "year_setting": row.year_setting,
             "agent_id": str(row.agent_id),
-            "similarity": round(row.similarity, 3),
+            "similarity": round(1 - row.distance, 3),
         }
         for row in rows
     ]
@@ -175,25 +422,15 @@ async def find_similar_worlds(
     Returns:
         List of dicts with world info and similarity score
     """
-    from sqlalchemy import text
-
-    query = text("""
-        SELECT
-            id,
-            name,
-            premise,
-            year_setting,
-            created_by,
-            1 - (premise_embedding <=> CAST(:embedding AS vector)) as similarity
-        FROM platform_worlds
-        WHERE premise_embedding IS NOT NULL
-        AND 1 - (premise_embedding <=> CAST(:embedding AS vector)) > :threshold
-        ORDER BY similarity DESC
-        LIMIT :limit
-    """)
-
-    result = await db.execute(query, {"embedding": str(embedding), "threshold": threshold, "limit": limit})
-    rows = result.fetchall()
+    rows = await nearest_neighbours(
+        db,
+        table="platform_worlds",
+        column="premise_embedding",
+        select_columns="id, name, premise, year_setting, created_by",
+        embedding=embedding,
+        threshold=threshold,
+        limit=limit,
+    )
 
     return [
         {
@@ -202,7 +439,7 @@ async def find_similar_worlds(
             "premise": row.premise[:200] + "..." if len(row.premise) > 200 else row.premise,
             "year_setting": row.year_setting,
             "created_by": str(row.created_by),
-            "similarity": round(row.similarity, 3),
+            "similarity": round(1 - row.distance, 3),
         }
         for row in rows
     ]
@@ -0,0 +1,95 @@
+"""Set-based propagation of world events into dweller core memories.
+
+When an action is escalated to a world event, every dweller in the world gets
+a platform_world_event_propagations row and the event's fact appended to their
+core memories. Both happen in one statement: a data-modifying CTE inserts the
+propagation rows with INSERT ... SELECT ... ON CONFLICT DO NOTHING and the
+outer UPDATE appends the fact only for the dwellers that were newly inserted,
+so re-running propagation for the same event is a no-op.
+
+Propagation row ids are derived from (event id, dweller id) rather than drawn
+at random, which keeps simulation runs reproducible without a per-row Python
+default.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from observability import span
+
+logger = logging.getLogger(__name__)
+
+
+_PROPAGATE_SQL = text("""
+    WITH inserted AS (
+        INSERT INTO platform_world_event_propagations (id, world_event_id, dweller_id, propagated_at)
+        SELECT
+            CAST(md5(CAST(CAST(:event_id AS uuid) AS text) || d.id::text) AS uuid),
+            CAST(:event_id AS uuid),
+            d.id,
+            :propagated_at
+        FROM platform_dwellers d
+        WHERE d.world_id = :world_id
+        ON CONFLICT (world_event_id, dweller_id) DO NOTHING
+        RETURNING dweller_id
+    ),
+    remembered AS (
+        UPDATE platform_dwellers d
+        SET core_memories = COALESCE(d.core_memories, '[]'::jsonb) || jsonb_build_array(CAST(:fact AS text))
+        FROM inserted
+        WHERE d.id = inserted.dweller_id
+          AND NOT COALESCE(d.core_memories, '[]'::jsonb) @> jsonb_build_array(CAST(:fact AS text))
+        RETURNING d.id
+    )
+    SELECT
+        (SELECT count(*) FROM inserted) AS propagated,
+        (SELECT count(*) FROM remembered) AS memories_updated
+""")
+
+
+@dataclass
+class PropagationResult:
+    propagated: int
+    memories_updated: int
+    elapsed_ms: float
+
+
+async def propagate_world_event(
+    db: AsyncSession,
+    *,
+    event_id: UUID,
+    world_id: UUID,
+    fact_text: str,
+    propagated_at: datetime,
+) -> PropagationResult:
+    """Propagate a world event to every dweller in its world in one round trip.
+
+    Runs inside the caller's transaction. Dweller objects already loaded in the
+    session keep their old core_memories: the sessions use
+    expire_on_commit=False, so commit doesn't refresh them either. Expire or
+    refresh them (db.refresh(dweller)) before reading core_memories again.
+    """
+    started = time.perf_counter()
+    with span("world_event_propagation", event_id=str(event_id), world_id=str(world_id)):
+        row = (await db.execute(_PROPAGATE_SQL, {
+            "event_id": event_id,
+            "world_id": world_id,
+            "fact": fact_text,
+            "propagated_at": propagated_at,
+        })).one()
+    result = PropagationResult(
+        propagated=row.propagated,
+        memories_updated=row.memories_updated,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.info(
+        "Propagated world event %s to %d dwellers (%d memories updated) in %.1fms",
+        event_id, result.propagated, result.memories_updated, result.elapsed_ms,
+    )
+    return result
@@ -0,0 +1,189 @@
+"""Monthly partitions and retention for platform_feed_events.
+
+The feed log is range-partitioned by month on created_at. Maintenance (run
+hourly by the leader-elected feed partition loop) does two things:
+
+- Creates partitions for the current month and FEED_PARTITION_MONTHS_AHEAD
+  months after it. Rows that already landed in the DEFAULT partition for
+  that range are moved into the new partition first.
+- Archives partitions older than FEED_RETENTION_MONTHS. With
+  FEED_ARCHIVE_MODE=detach (default) they are detached and renamed
+  platform_feed_events_archive_YYYYMM: out of every feed query but still
+  available for export. Expired rows in the DEFAULT partition are moved
+  into the archive table for their month. With FEED_ARCHIVE_MODE=drop
+  partitions are dropped and those rows deleted.
+  FEED_RETENTION_MONTHS=0 keeps everything.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import db as db_module
+from utils.clock import now as utc_now
+
+logger = logging.getLogger(__name__)
+
+FEED_TABLE = "platform_feed_events"
+FEED_DEFAULT_PARTITION = f"{FEED_TABLE}_default"
+FEED_PARTITION_MONTHS_AHEAD = 2
+FEED_RETENTION_MONTHS = int(os.getenv("FEED_RETENTION_MONTHS", "12"))
+FEED_ARCHIVE_MODE = os.getenv("FEED_ARCHIVE_MODE", "detach").lower()
+FEED_PARTITION_MAINTENANCE_SECONDS = float(os.getenv("FEED_PARTITION_MAINTENANCE_SECONDS", "3600"))
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{FEED_TABLE}_p{month:%Y%m}"
+
+
+@dataclass
+class PartitionMaintenanceResult:
+    created: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    result = await db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace"
+    ), {"table": FEED_TABLE})
+    return result.first() is not None
+
+
+async def _monthly_partitions(db: AsyncSession) -> dict[str, tuple[datetime, datetime]]:
+    """Attached monthly partitions by name, with their [from, to) bounds."""
+    rows = (await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass)"
+    ), {"table": FEED_TABLE})).all()
+    partitions = {}
+    for (name,) in rows:
+        if not name.startswith(f"{FEED_TABLE}_p"):
+            continue
+        month = datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m").replace(tzinfo=timezone.utc)
+        partitions[name] = (month, add_months(month, 1))
+    return partitions
+
+
+async def create_month_partition(db: AsyncSession, month: datetime) -> str:
+    """Create (and attach) the partition for the month starting at `month`."""
+    name = partition_name(month)
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    # Build detached, move any rows the DEFAULT partition caught for this
+    # range, then attach: attaching fails while DEFAULT holds such rows.
+    await db.execute(text(
+        f'CREATE TABLE "{name}" (LIKE {FEED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    await db.execute(text(
+        f'WITH moved AS (DELETE FROM {FEED_DEFAULT_PARTITION} '
+        f"WHERE created_at >= '{lower}' AND created_at < '{upper}' RETURNING *) "
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ))
+    await db.execute(text(
+        f'ALTER TABLE {FEED_TABLE} ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    return name
+
+
+async def _archive_default_rows(db: AsyncSession, cutoff: datetime) -> list[str]:
+    """Move expired rows the DEFAULT partition caught into their month's archive table."""
+    months = (await db.execute(text(
+        f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+        f"FROM {FEED_DEFAULT_PARTITION} WHERE created_at < :cutoff"
+    ), {"cutoff": cutoff})).scalars().all()
+    archives = []
+    for month in sorted(months):
+        month = month.replace(tzinfo=timezone.utc)
+        archive = f"{FEED_TABLE}_archive_{month:%Y%m}"
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        await db.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{archive}" '
+            f"(LIKE {FEED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await db.execute(text(
+            f'WITH moved AS (DELETE FROM {FEED_DEFAULT_PARTITION} '
+            f"WHERE created_at >= '{lower}' AND created_at < '{upper}' RETURNING *) "
+            f'INSERT INTO "{archive}" SELECT * FROM moved'
+        ))
+        archives.append(archive)
+    return archives
+
+
+async def maintain_feed_partitions(
+    db: AsyncSession, now: datetime | None = None
+) -> PartitionMaintenanceResult:
+    """Create upcoming partitions and archive expired ones. Caller commits."""
+    result = PartitionMaintenanceResult()
+    if not await is_partitioned(db):
+        return result
+
+    current = month_start(now or utc_now())
+    existing = await _monthly_partitions(db)
+
+    for offset in range(FEED_PARTITION_MONTHS_AHEAD + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in existing:
+            result.created.append(await create_month_partition(db, month))
+
+    if FEED_RETENTION_MONTHS > 0:
+        cutoff = add_months(current, -FEED_RETENTION_MONTHS)
+        for name, (_, upper) in sorted(existing.items()):
+            if upper > cutoff:
+                continue
+            await db.execute(text(f'ALTER TABLE {FEED_TABLE} DETACH PARTITION "{name}"'))
+            if FEED_ARCHIVE_MODE == "drop":
+                await db.execute(text(f'DROP TABLE "{name}"'))
+                result.dropped.append(name)
+            else:
+                archive = name.replace(f"{FEED_TABLE}_p", f"{FEED_TABLE}_archive_")
+                await db.execute(text(f'ALTER TABLE "{name}" RENAME TO "{archive}"'))
+                result.archived.append(archive)
+        if FEED_ARCHIVE_MODE == "drop":
+            await db.execute(
+                text(f"DELETE FROM {FEED_DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+                {"cutoff": cutoff},
+            )
+        else:
+            result.archived.extend(await _archive_default_rows(db, cutoff))
+
+    if result.created or result.archived or result.dropped:
+        logger.info(
+            "Feed partitions: created %s, archived %s, dropped %s",
+            result.created, result.archived, result.dropped,
+        )
+    return result
+
+
+async def run_feed_partition_maintenance(stop_event: asyncio.Event) -> None:
+    """Maintain feed partitions on an interval until shutdown."""
+    logger.info("Feed partition maintenance started")
+    try:
+        while not stop_event.is_set():
+            try:
+                async with db_module.BackgroundSessionLocal() as db:
+                    await maintain_feed_partitions(db)
+                    await db.commit()
+            except Exception:
+                logger.exception("Feed partition maintenance failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=FEED_PARTITION_MAINTENANCE_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        logger.info("Feed partition maintenance stopped")
@@ -0,0 +1,151 @@
+"""Liveness and readiness state for health probes.
+
+Load balancers probe every instance every few seconds, so probes must not
+touch the database. A background task (run_health_monitor) refreshes the
+schema/DB status every HEALTH_REFRESH_SECONDS and samples event-loop lag
+in between; probes read the snapshot from memory. Pool saturation and
+checkout waits come from the engines' in-process pool counters at probe time.
+The monitor also runs the loop watchdog (utils.profiling), whose lag
+percentiles and stall counts are reported under event_loop.watchdog.
+
+Without the background task (tests, scripts) the snapshot is refreshed
+inline when it is older than the refresh interval.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from db import pool_metrics, verify_schema_version
+from utils.profiling import loop_watchdog_metrics, start_loop_watchdog, stop_loop_watchdog
+
+logger = logging.getLogger(__name__)
+
+HEALTH_REFRESH_SECONDS = float(os.getenv("HEALTH_REFRESH_SECONDS", "10"))
+HEALTH_LAG_SAMPLE_SECONDS = 0.5
+# Not ready above these
+HEALTH_MAX_POOL_SATURATION = float(os.getenv("HEALTH_MAX_POOL_SATURATION", "0.95"))
+HEALTH_MAX_LOOP_LAG_MS = float(os.getenv("HEALTH_MAX_LOOP_LAG_MS", "1000"))
+# Snapshot older than this many refresh intervals means the monitor is stuck
+HEALTH_STALE_INTERVALS = 3
+
+
+@dataclass
+class HealthSnapshot:
+    checked_at: float | None = None  # time.monotonic()
+    db_reachable: bool = False
+    db_latency_ms: float | None = None
+    db_error: str | None = None
+    schema: dict[str, Any] = field(default_factory=lambda: {
+        "is_current": False,
+        "current_version": None,
+        "expected_version": None,
+        "message": "Not checked yet.",
+    })
+    loop_lag_ms: float = 0.0
+    lag_samples: deque = field(default_factory=lambda: deque(maxlen=120))
+
+
+_snapshot = HealthSnapshot()
+_monitor_running = False
+
+
+async def refresh_health_snapshot() -> HealthSnapshot:
+    """Check the database and schema version once and store the result."""
+    started = time.perf_counter()
+    try:
+        schema = await verify_schema_version()
+        _snapshot.db_reachable = True
+        _snapshot.db_error = None
+        _snapshot.schema = schema
+    except Exception as e:
+        _snapshot.db_reachable = False
+        _snapshot.db_error = type(e).__name__
+        _snapshot.schema = {
+            **_snapshot.schema,
+            "is_current": False,
+            "message": "Database unreachable.",
+        }
+        logger.warning("Health check: database unreachable (%s)", _snapshot.db_error)
+    _snapshot.db_latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    _snapshot.checked_at = time.monotonic()
+    return _snapshot
+
+
+def _record_lag(lag_ms: float) -> None:
+    _snapshot.loop_lag_ms = lag_ms
+    _snapshot.lag_samples.append(lag_ms)
+
+
+async def run_health_monitor(stop_event: asyncio.Event) -> None:
+    """Refresh the health snapshot and sample event-loop lag until shutdown."""
+    global _monitor_running
+    _monitor_running = True
+    logger.info("Health monitor started (refresh every %.0fs)", HEALTH_REFRESH_SECONDS)
+    next_refresh = 0.0
+    start_loop_watchdog()
+    try:
+        while not stop_event.is_set():
+            if time.monotonic() >= next_refresh:
+                await refresh_health_snapshot()
+                next_refresh = time.monotonic() + HEALTH_REFRESH_SECONDS
+
+            expected = time.monotonic() + HEALTH_LAG_SAMPLE_SECONDS
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=HEALTH_LAG_SAMPLE_SECONDS)
+            except asyncio.TimeoutError:
+                # The timer fires late by however long the loop was blocked
+                _record_lag(max(0.0, (time.monotonic() - expected) * 1000))
+    finally:
+        stop_loop_watchdog()
+        _monitor_running = False
+        logger.info("Health monitor stopped")
+
+
+async def get_health_snapshot() -> HealthSnapshot:
+    """The current snapshot, refreshed inline only when no monitor is running."""
+    if not _monitor_running and (
+        _snapshot.checked_at is None
+        or time.monotonic() - _snapshot.checked_at > HEALTH_REFRESH_SECONDS
+    ):
+        await refresh_health_snapshot()
+    return _snapshot
+
+
+def readiness(snapshot: HealthSnapshot) -> dict[str, Any]:
+    """Readiness report: DB, schema, pool saturation and loop lag."""
+    age = time.monotonic() - snapshot.checked_at if snapshot.checked_at is not None else None
+    pools = pool_metrics()
+    max_lag = max(snapshot.lag_samples, default=0.0)
+
+    reasons = []
+    if not snapshot.db_reachable:
+        reasons.append("database_unreachable")
+    if age is None or age > HEALTH_REFRESH_SECONDS * HEALTH_STALE_INTERVALS:
+        reasons.append("health_snapshot_stale")
+    if pools["request"]["saturation"] >= HEALTH_MAX_POOL_SATURATION:
+        reasons.append("connection_pool_saturated")
+    if snapshot.loop_lag_ms >= HEALTH_MAX_LOOP_LAG_MS:
+        reasons.append("event_loop_lagging")
+
+    return {
+        "ready": not reasons,
+        "reasons": reasons,
+        "checked_seconds_ago": round(age, 1) if age is not None else None,
+        "database": {
+            "reachable": snapshot.db_reachable,
+            "latency_ms": snapshot.db_latency_ms,
+            "error": snapshot.db_error,
+        },
+        "schema": snapshot.schema,
+        "pools": pools,
+        "event_loop": {
+            "lag_ms": round(snapshot.loop_lag_ms, 1),
+            "max_lag_ms": round(max_lag, 1),
+            "watchdog": loop_watchdog_metrics(),
+        },
+    }
@@ -0,0 +1,93 @@
+"""orjson-backed JSON rendering for hot paths.
+
+Routes with a response_model are already serialized by pydantic-core
+(FastAPI validates the returned dict into the model and dumps it to JSON
+bytes in Rust), so this is not the app's default_response_class: setting
+one switches FastAPI off that path onto model -> dict -> render, which is
+slower even with orjson (scripts/benchmark_serialization.py).
+
+What's left to speed up is validation itself, and the JSON that is parsed
+and re-dumped outside FastAPI (AgentContextMiddleware uses dumps/loads
+here). For hot endpoints that build large, flat payloads in code (dweller
+memory, story lists), trusted_response() returns the dict as a
+FastJSONResponse directly: FastAPI skips validation and serialization for
+Response objects, while the route's response_model still documents the
+schema in OpenAPI.
+
+The catch is that nothing then checks the payload against that schema.
+With TRUSTED_RESPONSE_CHECK on (the default under TESTING), every trusted
+response is compared with what response_model would have produced, and a
+mismatch (missing default, extra key, wrong type) raises.
+"""
+
+import os
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+TRUSTED_RESPONSE_CHECK = os.getenv(
+    "TRUSTED_RESPONSE_CHECK", os.getenv("TESTING", "false")
+).lower() in ("1", "true")
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON; types orjson doesn't know go through jsonable_encoder."""
+    return orjson.dumps(content, default=jsonable_encoder, option=_OPTIONS)
+
+
+loads = orjson.loads
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class TrustedResponseMismatchError(AssertionError):
+    """A trusted payload differs from what its response_model would return."""
+
+
+def trusted_response(
+    payload: dict[str, Any],
+    model: type[BaseModel],
+    *,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """Return a payload that already matches `model` without re-validating it.
+
+    The route keeps response_model=model for OpenAPI. Build the payload with
+    JSON-ready values and every field of the model, as the check enforces.
+    """
+    response = FastJSONResponse(payload, status_code=status_code)
+    if TRUSTED_RESPONSE_CHECK:
+        expected = model.model_validate(payload).model_dump(mode="json", by_alias=True)
+        actual = loads(response.body)
+        if actual != expected:
+            raise TrustedResponseMismatchError(
+                f"{model.__name__} payload differs from its response_model: "
+                f"{_first_difference(expected, actual)}"
+            )
+    return response
+
+
+def _first_difference(expected: Any, actual: Any, path: str = "$") -> str:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in expected.keys() | actual.keys():
+            if key not in actual:
+                return f"{path}.{key} missing"
+            if key not in expected:
+                return f"{path}.{key} not in schema"
+            if expected[key] != actual[key]:
+                return _first_difference(expected[key], actual[key], f"{path}.{key}")
+    if isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            if e != a:
+                return _first_difference(e, a, f"{path}[{i}]")
+    return f"{path}: expected {expected!r:.80}, got {actual!r:.80}"
@@ -0,0 +1,45 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row on a page, joined with "~" — the same
+shape the feed uses ("ISO_TIMESTAMP~UUID"). Pages are fetched with a row-value
+comparison against that key, so deep pages cost the same as the first one and
+can be served from a composite index in the sort order.
+
+    keys = (Story.created_at, Story.id)
+    values = decode_cursor(cursor, parse_timestamp, UUID)
+    query = query.where(tuple_(*keys) < tuple_(*values)).order_by(*(k.desc() for k in keys))
+    next_cursor = encode_cursor(last.created_at, last.id)
+"""
+
+from datetime import datetime
+from typing import Any, Callable
+
+CURSOR_SEPARATOR = "~"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort-key values into a URL-safe cursor string."""
+    parts = []
+    for value in values:
+        if isinstance(value, datetime):
+            # Z suffix instead of +00:00 so the cursor is URL-safe (+ decodes as space)
+            parts.append(value.isoformat().replace("+00:00", "Z"))
+        else:
+            parts.append(str(value))
+    return CURSOR_SEPARATOR.join(parts)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a cursor timestamp, accepting the Z suffix written by encode_cursor."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple[Any, ...] | None:
+    """Split a cursor and parse each part. Returns None if the cursor is malformed."""
+    parts = cursor.split(CURSOR_SEPARATOR)
+    if len(parts) != len(parsers):
+        return None
+    try:
+        return tuple(parse(part) for parse, part in zip(parsers, parts))
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,138 @@
+"""Postgres advisory-lock leader election for singleton background jobs.
+
+With several API processes (uvicorn --workers, several replicas, or a
+separate worker.py process) every process starts the same background loops.
+run_as_leader() lets exactly one of them run each loop: it holds a
+session-level pg_try_advisory_lock on a dedicated connection for as long as
+the loop runs, and the other processes retry every LEADER_RETRY_SECONDS.
+If the leader's connection dies the lock is released by Postgres and
+another process takes over.
+
+Session-level locks need a connection that stays on one server backend, so
+they don't work through a transaction-mode pooler. LEADER_DATABASE_URL can
+point at a direct or session-mode connection; it defaults to DATABASE_URL.
+
+try_advisory_xact_lock() is the one-shot variant for cron-triggered jobs:
+the lock is released when the caller's transaction ends.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "15"))
+# Namespaces the lock keys so they can't collide with other applications
+LEADER_LOCK_NAMESPACE = "dsf"
+
+_lock_engine: AsyncEngine | None = None
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    digest = hashlib.blake2b(f"{LEADER_LOCK_NAMESPACE}:{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def get_lock_engine() -> AsyncEngine:
+    """Unpooled engine for session-level connections (advisory locks, LISTEN), held for hours."""
+    global _lock_engine
+    if _lock_engine is None:
+        from db import database
+
+        url = os.getenv("LEADER_DATABASE_URL")
+        if url:
+            url = url.replace("postgresql://", "postgresql+asyncpg://").split("?")[0]
+        _lock_engine = create_async_engine(
+            url or database.DATABASE_URL,
+            poolclass=NullPool,
+            connect_args=database._connect_args,
+        )
+    return _lock_engine
+
+
+async def try_advisory_xact_lock(db: AsyncSession, name: str) -> bool:
+    """Take a transaction-scoped advisory lock for `name` if it's free."""
+    result = await db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": advisory_lock_key(name)}
+    )
+    return bool(result.scalar())
+
+
+async def _wait(stop_event: asyncio.Event, timeout: float) -> None:
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def _lead(
+    conn,
+    name: str,
+    job: Callable[[asyncio.Event], Awaitable[None]],
+    stop_event: asyncio.Event,
+    retry_seconds: float,
+) -> None:
+    """Run the job while the lock connection stays healthy."""
+    job_stop = asyncio.Event()
+    job_task = asyncio.create_task(job(job_stop))
+    stop_waiter = asyncio.create_task(stop_event.wait())
+    try:
+        while not stop_event.is_set() and not job_task.done():
+            await asyncio.wait(
+                {job_task, stop_waiter}, timeout=retry_seconds, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not stop_event.is_set() and not job_task.done():
+                # Losing the connection means losing the lock
+                await conn.execute(text("SELECT 1"))
+                await conn.commit()
+        if job_task.done() and not stop_event.is_set():
+            logger.warning("Leader job %s exited; releasing leadership", name)
+    finally:
+        stop_waiter.cancel()
+        job_stop.set()
+        try:
+            await job_task
+        except Exception:
+            logger.exception("Leader job %s failed", name)
+
+
+async def run_as_leader(
+    name: str,
+    job: Callable[[asyncio.Event], Awaitable[None]],
+    stop_event: asyncio.Event,
+    *,
+    engine: AsyncEngine | None = None,
+    retry_seconds: float | None = None,
+) -> None:
+    """Run job(stop_event) in at most one process at a time until shutdown."""
+    key = advisory_lock_key(name)
+    retry = LEADER_RETRY_SECONDS if retry_seconds is None else retry_seconds
+    while not stop_event.is_set():
+        try:
+            async with (engine or get_lock_engine()).connect() as conn:
+                acquired = (await conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+                )).scalar()
+                await conn.commit()
+                if acquired:
+                    logger.info("Acquired leadership for %s", name)
+                    try:
+                        await _lead(conn, name, job, stop_event, retry)
+                    finally:
+                        try:
+                            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                            await conn.commit()
+                        except Exception:
+                            pass  # Connection gone; Postgres already released the lock
+                        logger.info("Released leadership for %s", name)
+        except Exception:
+            logger.exception("Leader election for %s failed", name)
+        await _wait(stop_event, retry)
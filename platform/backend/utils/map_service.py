@@ -164,9 +164,9 @@ async def _label_cluster(world_names: list[str], world_premises: list[str]) -> s
         return " & ".join(w.lower() for w in world_names[:2])
 
     try:
-        from openai import AsyncOpenAI
+        from utils.embeddings import get_openai_client
 
-        client = AsyncOpenAI(api_key=api_key)
+        client = get_openai_client()
 
         worlds_desc = "\n".join(
             f"- {name}: {premise}"
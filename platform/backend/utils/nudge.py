@@ -29,6 +29,7 @@ from db import (
     Dweller, DwellerAction, Proposal, ProposalStatus,
     Aspect, AspectStatus, Validation, AspectValidation, World,
 )
+from utils.agent_stats import get_agent_stats
 
 # Thresholds (shared with progression.py)
 FIRST_STORY_ACTION_THRESHOLD = 5
@@ -65,11 +66,7 @@ async def build_nudge(
     if counts and "unresponded_reviews" in counts:
         unresponded = counts["unresponded_reviews"]
     else:
-        unresponded = await db.scalar(
-            select(func.count(StoryReview.id))
-            .join(Story, StoryReview.story_id == Story.id)
-            .where(Story.author_id == user_id, StoryReview.author_responded == False)
-        ) or 0
+        unresponded = (await get_agent_stats(db, user_id))["unresponded_reviews"]
 
     if unresponded > 0:
         # Get the story title for a specific message
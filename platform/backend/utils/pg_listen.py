@@ -0,0 +1,126 @@
+"""Postgres LISTEN/NOTIFY wakeups for background loops.
+
+notify() queues a notification inside the caller's transaction, so it is
+delivered only if the transaction commits. listen() holds a dedicated
+connection from the leader-election engine (LISTEN, like session-level
+advisory locks, needs a connection that stays on one server backend) and
+sets an asyncio.Event whenever a notification arrives.
+
+The connection is checked every LISTEN_CHECK_SECONDS. When it drops, or
+can't be opened, listen() logs a warning and reconnects with exponential
+backoff (up to LISTEN_MAX_BACKOFF_SECONDS); after reconnecting it sets the
+event once, since anything sent in between was missed.
+
+Notifications are a latency optimisation, not a delivery guarantee: loops
+using them should still poll on an interval.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from utils.leader_election import get_lock_engine
+
+logger = logging.getLogger(__name__)
+
+LISTEN_CHECK_SECONDS = float(os.getenv("LISTEN_CHECK_SECONDS", "30"))
+LISTEN_MAX_BACKOFF_SECONDS = float(os.getenv("LISTEN_MAX_BACKOFF_SECONDS", "30"))
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = "") -> None:
+    """Send a notification on `channel` when the caller's transaction commits."""
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+async def _hold_listener(
+    channel: str,
+    engine: AsyncEngine,
+    wakeup: asyncio.Event,
+    ready: asyncio.Event,
+    check_seconds: float,
+    max_backoff_seconds: float,
+) -> None:
+    """Keep a LISTEN connection open until cancelled, reconnecting when it drops."""
+
+    def on_notify(*_args) -> None:
+        wakeup.set()
+
+    backoff = 1.0
+    failures = 0
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = (await conn.get_raw_connection()).driver_connection
+                lost = asyncio.Event()
+                raw.add_termination_listener(lambda _conn: lost.set())
+                await raw.add_listener(channel, on_notify)
+                ready.set()
+                try:
+                    if failures:
+                        logger.info("LISTEN %s re-established after %d failed attempts", channel, failures)
+                        # Notifications sent while disconnected were missed
+                        wakeup.set()
+                    backoff, failures = 1.0, 0
+                    while not lost.is_set():
+                        try:
+                            await asyncio.wait_for(lost.wait(), timeout=check_seconds)
+                        except asyncio.TimeoutError:
+                            # A silently dead connection only shows up when used
+                            await conn.execute(text("SELECT 1"))
+                            await conn.commit()
+                    raise ConnectionError("LISTEN connection closed")
+                finally:
+                    if raw.is_closed():
+                        # Keep a pooled engine from handing the dead connection out again
+                        await conn.invalidate()
+                    else:
+                        try:
+                            await raw.remove_listener(channel, on_notify)
+                        except Exception:
+                            pass  # Connection gone; the server already dropped the LISTEN
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ready.set()
+            failures += 1
+            logger.warning(
+                "LISTEN %s unavailable (attempt %d); retrying in %.0fs",
+                channel, failures, backoff, exc_info=True,
+            )
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, max_backoff_seconds)
+
+
+@asynccontextmanager
+async def listen(
+    channel: str,
+    *,
+    engine: AsyncEngine | None = None,
+    check_seconds: float = LISTEN_CHECK_SECONDS,
+    max_backoff_seconds: float = LISTEN_MAX_BACKOFF_SECONDS,
+) -> AsyncIterator[asyncio.Event]:
+    """LISTEN on `channel` for the duration of the block; yields the wakeup event.
+
+    Returns once the first connection attempt has finished, so a NOTIFY sent
+    from inside the block is seen unless that attempt failed.
+    """
+    wakeup = asyncio.Event()
+    ready = asyncio.Event()
+    holder = asyncio.create_task(_hold_listener(
+        channel, engine or get_lock_engine(), wakeup, ready, check_seconds, max_backoff_seconds
+    ))
+    try:
+        # Listening (or the first attempt failed) before the block runs
+        await ready.wait()
+        yield wakeup
+    finally:
+        holder.cancel()
+        try:
+            await holder
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,343 @@
+"""In-process sampling profiler and event-loop watchdog.
+
+Both work from a background thread that reads the event-loop thread's
+Python stack with sys._current_frames(), so nothing is installed in the
+loop itself and no profiler package is needed.
+
+SamplingProfiler samples every PROFILE_INTERVAL_MS and aggregates stacks.
+It exports collapsed stacks (flamegraph.pl, speedscope import) or a
+speedscope JSON file. With task= it only keeps samples taken while that
+asyncio task is running (used for single-request profiles). Tasks the
+request spawns (asyncio.gather, create_task) are other tasks, so their
+time is not in a task= profile; a whole-loop profile (profile_for) is the
+way to see it. Stacks are wall-clock: time the loop spends idle in
+select() shows up as such, and work in the threadpool (sync endpoints,
+to_thread) isn't sampled.
+
+LoopWatchdog posts a no-op to the loop every LOOP_WATCHDOG_INTERVAL_MS and
+measures how long it takes to run (event-loop lag). When it takes longer
+than LOOP_SLOW_CALLBACK_MS, the loop is stuck in one callback: the
+watchdog captures the loop thread's stack at that moment, which names the
+blocking call (synchronous DNS, boto3, CPU-heavy JSON...). Lag percentiles
+and stall counts are exported by loop_watchdog_metrics().
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = 60.0
+PROFILE_MAX_DEPTH = 128
+# Finished profiles kept for download
+PROFILE_KEEP = 20
+
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() in ("1", "true")
+LOOP_WATCHDOG_INTERVAL_MS = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "100"))
+LOOP_SLOW_CALLBACK_MS = float(os.getenv("LOOP_SLOW_CALLBACK_MS", "100"))
+# Recent stalls kept with their stacks
+LOOP_STALLS_KEEP = 20
+
+_BACKEND_ROOT = str(Path(__file__).resolve().parent.parent) + os.sep
+
+
+@lru_cache(maxsize=16384)
+def _frame_label(code: CodeType) -> str:
+    path = code.co_filename
+    if path.startswith(_BACKEND_ROOT):
+        path = path[len(_BACKEND_ROOT):]
+    elif "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def _stack(frame: FrameType | None) -> tuple[str, ...]:
+    """Root-first frame labels of a stack."""
+    labels = []
+    while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples one thread's stack on an interval until stopped.
+
+    start() must be called on the thread to profile (the event loop).
+    With task=, only samples taken while exactly that task runs are kept,
+    not those of tasks it spawns. stop() doesn't wait for the sampling
+    thread, which exits on its next tick.
+    """
+
+    def __init__(
+        self,
+        name: str = "profile",
+        *,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+        task: asyncio.Task | None = None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.interval_ms = interval_ms
+        self.task = task
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: datetime | None = None
+        self.duration_ms = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._stop = threading.Event()
+        # Held while recording a sample, so none lands after stop() returns
+        self._sample_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self) -> "SamplingProfiler":
+        self._thread_id = threading.get_ident()
+        self._loop = asyncio.get_running_loop() if self.task is not None else None
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.id[:8]}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        # Called from the event loop: no join, the daemon thread exits on its own
+        with self._sample_lock:
+            self._stop.set()
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        return self
+
+    def _run(self) -> None:
+        interval = self.interval_ms / 1000
+        while not self._stop.wait(interval):
+            if self.task is not None and asyncio.current_task(self._loop) is not self.task:
+                continue
+            with self._sample_lock:
+                if self._stop.is_set():
+                    break
+                frame = sys._current_frames().get(self._thread_id)
+                if frame is None:
+                    continue
+                self.stacks[_stack(frame)] += 1
+                self.samples += 1
+                del frame
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed stacks: "root;child;leaf count" per line."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def speedscope(self) -> dict[str, Any]:
+        """speedscope file format (https://www.speedscope.app), one sampled profile."""
+        frames: list[dict[str, str]] = []
+        index: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in self.stacks.most_common():
+            sample = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                sample.append(index[label])
+            samples.append(sample)
+            weights.append(round(count * self.interval_ms, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "deep-sci-fi",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "duration_ms": round(self.duration_ms, 1),
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "running": self.running,
+        }
+
+
+_profiles: OrderedDict[str, SamplingProfiler] = OrderedDict()
+_window_lock = asyncio.Lock()
+
+
+def store_profile(profiler: SamplingProfiler) -> str:
+    """Keep a profile for download (the oldest beyond PROFILE_KEEP are dropped)."""
+    _profiles[profiler.id] = profiler
+    while len(_profiles) > PROFILE_KEEP:
+        _profiles.popitem(last=False)
+    return profiler.id
+
+
+def get_profile(profile_id: str) -> SamplingProfiler | None:
+    return _profiles.get(profile_id)
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    return [profiler.summary() for profiler in reversed(_profiles.values())]
+
+
+def profiling_window_busy() -> bool:
+    return _window_lock.locked()
+
+
+async def profile_for(seconds: float, *, interval_ms: float = PROFILE_INTERVAL_MS) -> SamplingProfiler:
+    """Profile the event loop for `seconds`. One timed profile runs at a time."""
+    async with _window_lock:
+        profiler = SamplingProfiler(f"loop {seconds:g}s", interval_ms=interval_ms).start()
+        store_profile(profiler)
+        try:
+            await asyncio.sleep(min(seconds, PROFILE_MAX_SECONDS))
+        finally:
+            profiler.stop()
+        logger.info("Profiled event loop for %.1fs (%d samples)", seconds, profiler.samples)
+        return profiler
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and captures the stack of slow callbacks.
+
+    start() must be called from the event loop it watches.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_ms: float = LOOP_WATCHDOG_INTERVAL_MS,
+        slow_callback_ms: float = LOOP_SLOW_CALLBACK_MS,
+    ):
+        self.interval_ms = interval_ms
+        self.slow_callback_ms = slow_callback_ms
+        self.lag_samples: deque[float] = deque(maxlen=600)
+        self.stalls_total = 0
+        self.stall_ms_total = 0.0
+        self.max_stall_ms = 0.0
+        self.recent_stalls: deque[dict[str, Any]] = deque(maxlen=LOOP_STALLS_KEEP)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "LoopWatchdog":
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Loop watchdog started (every %.0fms, slow callback >= %.0fms)",
+            self.interval_ms, self.slow_callback_ms,
+        )
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        logger.info("Loop watchdog stopped")
+
+    def _run(self) -> None:
+        slow = self.slow_callback_ms / 1000
+        while not self._stop.wait(self.interval_ms / 1000):
+            ran = threading.Event()
+            posted = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return  # Loop closed
+            if ran.wait(slow):
+                self.lag_samples.append((time.perf_counter() - posted) * 1000)
+                continue
+            if self._stop.is_set():
+                return  # stop() is joining us from the loop thread
+
+            # The loop is stuck in a callback right now: whatever it's running is the culprit
+            frame = sys._current_frames().get(self._thread_id)
+            stack = _stack(frame)
+            del frame
+            at = datetime.now(timezone.utc)
+            while not ran.wait(slow) and not self._stop.is_set():
+                pass
+            stall_ms = (time.perf_counter() - posted) * 1000
+            self.lag_samples.append(stall_ms)
+            self.stalls_total += 1
+            self.stall_ms_total += stall_ms
+            self.max_stall_ms = max(self.max_stall_ms, stall_ms)
+            self.recent_stalls.append({"at": at.isoformat(), "duration_ms": round(stall_ms, 1), "stack": list(stack)})
+            logger.warning(
+                "Event loop blocked for %.0fms in %s", stall_ms, stack[-1] if stack else "<unknown>",
+            )
+
+    def metrics(self, include_stacks: bool = False) -> dict[str, Any]:
+        lags = sorted(self.lag_samples)
+
+        def pct(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(p / 100 * len(lags)))], 1) if lags else 0.0
+
+        report: dict[str, Any] = {
+            "lag_p50_ms": pct(50),
+            "lag_p99_ms": pct(99),
+            "lag_max_ms": round(lags[-1], 1) if lags else 0.0,
+            "slow_callback_ms": self.slow_callback_ms,
+            "stalls_total": self.stalls_total,
+            "stall_ms_total": round(self.stall_ms_total, 1),
+            "max_stall_ms": round(self.max_stall_ms, 1),
+        }
+        if include_stacks:
+            report["recent_stalls"] = list(reversed(self.recent_stalls))
+        return report
+
+
+_watchdog: LoopWatchdog | None = None
+
+
+def start_loop_watchdog() -> LoopWatchdog | None:
+    """Start the process-wide watchdog on the running loop (no-op if disabled)."""
+    global _watchdog
+    if not LOOP_WATCHDOG_ENABLED:
+        return None
+    _watchdog = LoopWatchdog().start()
+    return _watchdog
+
+
+def stop_loop_watchdog() -> None:
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+
+
+def loop_watchdog_metrics(include_stacks: bool = False) -> dict[str, Any] | None:
+    """Watchdog metrics, or None when it isn't running in this process."""
+    return _watchdog.metrics(include_stacks) if _watchdog is not None else None
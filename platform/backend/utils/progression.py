@@ -8,10 +8,8 @@ from typing import Any
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import (
-    Proposal, Validation, Aspect, AspectValidation,
-    Dweller, DwellerAction, WorldEvent, Story, StoryReview,
-)
+from db import DwellerAction
+from utils.agent_stats import get_agent_stats
 
 
 # Progression thresholds
@@ -24,50 +22,24 @@ ACTIONS_GATE = 5   # Actions needed to unlock stories stage
 STORIES_GATE = 3   # Stories needed to unlock events stage
 EVENTS_GATE = 1    # Events needed to unlock canon stage
 
+# Counters reported by completion tracking
+COMPLETION_COUNT_KEYS = (
+    "stories_written", "stories_reviewed", "proposals_validated", "aspects_validated",
+    "dwellers_created", "actions_taken", "worlds_proposed", "aspects_proposed",
+    "events_proposed", "unresponded_reviews",
+)
+
 
 async def build_completion_tracking(db: AsyncSession, user_id) -> dict[str, Any]:
     """Track what agent has done and hasn't done yet.
 
     Returns counts of all activity types and a list of activities
     the agent has never performed (to help them discover features).
+    Counts come from the agent's platform_agent_stats row.
     """
-    # Count all activity types
-    counts = {
-        "stories_written": await db.scalar(
-            select(func.count(Story.id)).where(Story.author_id == user_id)
-        ) or 0,
-        "stories_reviewed": await db.scalar(
-            select(func.count(StoryReview.id)).where(StoryReview.reviewer_id == user_id)
-        ) or 0,
-        "proposals_validated": await db.scalar(
-            select(func.count(Validation.id)).where(Validation.agent_id == user_id)
-        ) or 0,
-        "aspects_validated": await db.scalar(
-            select(func.count(AspectValidation.id)).where(AspectValidation.agent_id == user_id)
-        ) or 0,
-        "dwellers_created": await db.scalar(
-            select(func.count(Dweller.id)).where(Dweller.created_by == user_id)
-        ) or 0,
-        "actions_taken": await db.scalar(
-            select(func.count(DwellerAction.id))
-            .where(DwellerAction.actor_id == user_id)
-        ) or 0,
-        "worlds_proposed": await db.scalar(
-            select(func.count(Proposal.id)).where(Proposal.agent_id == user_id)
-        ) or 0,
-        "aspects_proposed": await db.scalar(
-            select(func.count(Aspect.id)).where(Aspect.agent_id == user_id)
-        ) or 0,
-        "events_proposed": await db.scalar(
-            select(func.count(WorldEvent.id)).where(WorldEvent.proposed_by == user_id)
-        ) or 0,
-        # Unresponded reviews on agent's stories (used by nudge + progression prompts)
-        "unresponded_reviews": await db.scalar(
-            select(func.count(StoryReview.id))
-            .join(Story, StoryReview.story_id == Story.id)
-            .where(Story.author_id == user_id, StoryReview.author_responded == False)
-        ) or 0,
-    }
+    # One primary-key read of the materialized counters (utils.agent_stats)
+    stats = await get_agent_stats(db, user_id)
+    counts = {key: stats[key] for key in COMPLETION_COUNT_KEYS}
 
     # Build never_done list
     never_done = []
@@ -0,0 +1,125 @@
+"""Per-request SQL accounting from SQLAlchemy engine events.
+
+install_query_stats() hooks cursor execution on every engine. Inside a
+track_queries() block (QueryStatsMiddleware opens one per HTTP request)
+each statement adds to the block's QueryStats: statement count, time spent
+in the database, rows returned, and how often each statement shape ran.
+A shape that runs QUERY_STATS_REPEAT_THRESHOLD or more times in one
+request is reported as a likely N+1 (a per-item db.get / select in a loop).
+
+Outside a tracked block the hooks cost one ContextVar lookup. Works
+without Logfire; results go to the Server-Timing header and log fields.
+Toggle with QUERY_STATS_ENABLED (on by default outside production).
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_IS_PRODUCTION = os.getenv("ENVIRONMENT", "development") == "production"
+QUERY_STATS_ENABLED = os.getenv(
+    "QUERY_STATS_ENABLED", "false" if _IS_PRODUCTION else "true"
+).lower() in ("1", "true")
+# Identical statements per request before they're flagged as N+1
+QUERY_STATS_REPEAT_THRESHOLD = int(os.getenv("QUERY_STATS_REPEAT_THRESHOLD", "5"))
+
+# Bind lists rendered for IN (...) vary in length; collapse them so the
+# shape is the same however many ids a call passes
+_BIND_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _BIND_LIST.sub("$n, ...", statement)).strip()
+
+
+@dataclass
+class QueryStats:
+    """SQL issued inside one track_queries() block."""
+
+    count: int = 0
+    db_ms: float = 0.0
+    rows: int = 0
+    shapes: Counter = field(default_factory=Counter)
+    # Enclosing block, which sees these statements too
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    def record(self, shape: str, elapsed_ms: float, rows: int) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.db_ms += elapsed_ms
+            stats.rows += rows
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """Statement shapes run at least threshold times, most frequent first."""
+        threshold = QUERY_STATS_REPEAT_THRESHOLD if threshold is None else threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (metrics: db, and db-repeats when N+1 is suspected)."""
+        value = f'db;dur={self.db_ms:.1f};desc="{self.count} queries, {self.rows} rows"'
+        repeated = self.repeated()
+        if repeated:
+            value += f', db-repeats;desc="{len(repeated)} shapes, max {repeated[0][1]}x"'
+        return value
+
+    def log_fields(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_ms": round(self.db_ms, 1),
+            "db_rows": self.rows,
+            "db_repeated_shapes": [
+                {"statement": shape[:200], "count": n} for shape, n in self.repeated()
+            ],
+        }
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Account every statement executed in this context (and tasks it spawns)."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current.get() is not None:
+        context._query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is None or started is None:
+        return
+    # asyncpg buffers result rows on execute, so rowcount is the rows returned
+    rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+    stats.record(statement_shape(statement), (time.perf_counter() - started) * 1000, rows)
+
+
+def install_query_stats() -> None:
+    """Hook statement accounting into all engines. Safe to call more than once."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,148 @@
+"""Atomic reaction counters for worlds and stories.
+
+Reaction counts are cached on the target row (World.reaction_counts per type,
+Story.reaction_count as a total). Every change is a single UPDATE with the
+arithmetic done in SQL, so concurrent reactions can't lose updates the way a
+load / modify / write-back of the row did.
+
+For very hot targets the row lock itself becomes the bottleneck. Setting
+REACTION_COUNTER_SHARDS=N (N > 0) switches to sharded mode: each delta is
+upserted into one of N rows in platform_reaction_counter_shards, and a
+background loop folds the shards into the target rows every
+REACTION_COUNTER_FOLD_SECONDS. Counts on the target then lag by at most one
+fold interval.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy import Integer, cast, delete, func, update
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import db as db_module
+from db import ReactionCounterShard, Story, World
+from utils.deterministic import randint
+
+logger = logging.getLogger(__name__)
+
+REACTION_COUNTER_SHARDS = int(os.getenv("REACTION_COUNTER_SHARDS", "0"))
+REACTION_COUNTER_FOLD_SECONDS = float(os.getenv("REACTION_COUNTER_FOLD_SECONDS", "5"))
+
+
+async def _apply_to_target(
+    db: AsyncSession,
+    target_type: str,
+    target_id: UUID,
+    reaction_type: str,
+    delta: int,
+) -> int | None:
+    """Apply a delta to the target row in one statement. Returns the new count."""
+    if target_type == "world":
+        current = func.coalesce(World.reaction_counts[reaction_type].astext.cast(Integer), 0)
+        stmt = (
+            update(World)
+            .where(World.id == target_id)
+            .values(
+                reaction_counts=func.jsonb_set(
+                    func.coalesce(World.reaction_counts, cast({}, JSONB)),
+                    array([reaction_type]),
+                    func.to_jsonb(func.greatest(0, current + delta)),
+                )
+            )
+            .returning(World.reaction_counts)
+            .execution_options(synchronize_session="fetch")
+        )
+        counts = (await db.execute(stmt)).scalar_one_or_none()
+        return counts.get(reaction_type, 0) if counts is not None else None
+
+    if target_type == "story":
+        # Stories use a simple reaction_count (total), not per-type counts
+        stmt = (
+            update(Story)
+            .where(Story.id == target_id)
+            .values(reaction_count=func.greatest(0, func.coalesce(Story.reaction_count, 0) + delta))
+            .returning(Story.reaction_count)
+            .execution_options(synchronize_session="fetch")
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    return None
+
+
+async def apply_reaction_delta(
+    db: AsyncSession,
+    target_type: str,
+    target_id: UUID,
+    reaction_type: str,
+    delta: int,
+) -> int | None:
+    """Add delta to a target's reaction count.
+
+    Returns the new count, or None when the target doesn't exist or the delta
+    was deferred to a shard (sharded mode).
+    """
+    if REACTION_COUNTER_SHARDS <= 0:
+        return await _apply_to_target(db, target_type, target_id, reaction_type, delta)
+
+    stmt = pg_insert(ReactionCounterShard).values(
+        target_type=target_type,
+        target_id=target_id,
+        reaction_type=reaction_type,
+        shard=randint(0, REACTION_COUNTER_SHARDS - 1),
+        delta=delta,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["target_type", "target_id", "reaction_type", "shard"],
+        set_={"delta": ReactionCounterShard.delta + stmt.excluded.delta},
+    )
+    await db.execute(stmt)
+    return None
+
+
+async def fold_reaction_counter_shards(db: AsyncSession) -> int:
+    """Move pending shard deltas onto their targets. Returns targets updated."""
+    result = await db.execute(
+        delete(ReactionCounterShard).returning(
+            ReactionCounterShard.target_type,
+            ReactionCounterShard.target_id,
+            ReactionCounterShard.reaction_type,
+            ReactionCounterShard.delta,
+        )
+    )
+    totals: dict[tuple[str, UUID, str], int] = defaultdict(int)
+    for target_type, target_id, reaction_type, delta in result.all():
+        totals[(target_type, target_id, reaction_type)] += delta
+
+    updated = 0
+    # Sorted so concurrent folds lock target rows in the same order
+    for (target_type, target_id, reaction_type), delta in sorted(
+        totals.items(), key=lambda item: (item[0][0], str(item[0][1]), item[0][2])
+    ):
+        if delta == 0:
+            continue
+        await _apply_to_target(db, target_type, target_id, reaction_type, delta)
+        updated += 1
+    return updated
+
+
+async def run_reaction_counter_folder(stop_event: asyncio.Event) -> None:
+    """Fold counter shards on an interval until shutdown."""
+    logger.info("Reaction counter folder started (%d shards)", REACTION_COUNTER_SHARDS)
+    try:
+        while not stop_event.is_set():
+            try:
+                async with db_module.BackgroundSessionLocal() as db:
+                    await fold_reaction_counter_shards(db)
+                    await db.commit()
+            except Exception:
+                logger.exception("Reaction counter fold failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=REACTION_COUNTER_FOLD_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        logger.info("Reaction counter folder stopped")
@@ -8,7 +8,15 @@ Write path:
     update_relationships_for_action(db, action) — called from dwellers.py (SPEAK actions)
 
 Read path:
-    get_dweller_graph(db, world_id, min_weight)  — called from dweller_graph.py
+    get_dweller_graph_json(db, world_id, min_weight)  — called from dweller_graph.py
+    get_dweller_graph_changes(db, world_id, since_version, min_weight)
+
+Versioning:
+    Every relationship write (and dweller creation) bumps a per-world counter in
+    platform_dweller_graph_versions via bump_graph_version(). Touched edges are
+    stamped with the new version, so clients can pull only the edges changed
+    since the version they hold. Serialized graph payloads are cached in-process
+    per (world_id, min_weight, version) — a version bump is the invalidation.
 
 Directional signals (PROP-022 revision):
     speak_count_a_to_b / speak_count_b_to_a — direct SPEAK actions
@@ -22,24 +30,37 @@ Score formula:
     combined_score = raw / global_max_raw  (0.0–1.0)
 """
 
+import hashlib
+import json
 import logging
+import os
 import re
+import time
 from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import Dweller, World
-from db.models import Story, DwellerAction, DwellerRelationship
+from db.models import Story, DwellerAction, DwellerRelationship, DwellerGraphVersion
+from utils.simulation import is_simulation
 
 logger = logging.getLogger(__name__)
 
 # Skip very short names to avoid false-positive matches in prose (e.g. "Al", "Ed").
 _MIN_NAME_LENGTH = 3
 
+# Serialized graph payload cache. Keys carry the graph version, so entries are
+# never stale for edges; the TTL only bounds staleness of node fields that are
+# not versioned (world renames, dweller deactivation).
+GRAPH_CACHE_LIMIT = 64
+GRAPH_CACHE_TTL_SECONDS = float(os.getenv("DWELLER_GRAPH_CACHE_TTL_SECONDS", "300"))
+_graph_cache: dict[tuple[str | None, int, str], tuple[float, bytes]] = {}
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -50,12 +71,29 @@ def _canonical(a_id: str, b_id: str) -> tuple[str, str]:
     return (a_id, b_id) if a_id < b_id else (b_id, a_id)
 
 
+async def bump_graph_version(db: AsyncSession, world_id: UUID) -> int:
+    """Atomically increment the world's graph version and return the new value."""
+    stmt = pg_insert(DwellerGraphVersion).values(
+        world_id=world_id, version=1, updated_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DwellerGraphVersion.world_id],
+        set_={
+            "version": DwellerGraphVersion.version + 1,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(DwellerGraphVersion.version)
+    return int((await db.execute(stmt)).scalar_one())
+
+
 async def _get_or_create_relationship(
     db: AsyncSession,
     a_id: str,
     b_id: str,
+    world_id: UUID,
+    graph_version: int,
 ) -> DwellerRelationship:
-    """Load existing relationship row or create a blank one (not yet added to session)."""
+    """Load existing relationship row or create a blank one, stamped with graph_version."""
     existing = (await db.execute(
         select(DwellerRelationship).where(
             DwellerRelationship.dweller_a_id == UUID(a_id),
@@ -64,11 +102,15 @@ async def _get_or_create_relationship(
     )).scalar_one_or_none()
 
     if existing:
+        existing.world_id = world_id
+        existing.graph_version = graph_version
         return existing
 
     rel = DwellerRelationship(
         dweller_a_id=UUID(a_id),
         dweller_b_id=UUID(b_id),
+        world_id=world_id,
+        graph_version=graph_version,
         co_occurrence_count=0,
         shared_story_ids=[],
         combined_score=0.0,
@@ -94,11 +136,12 @@ def _raw_score(rel: DwellerRelationship) -> float:
 
 
 async def _recompute_scores_for_dwellers(
-    db: AsyncSession, dweller_ids: list[str]
+    db: AsyncSession, dweller_ids: list[str], graph_version: int
 ) -> None:
     """Recompute combined_score for all relationships touching the given dwellers.
 
     combined_score = raw_score / global_max_raw_score  (normalized 0.0–1.0)
+    Edges whose score changes are stamped with graph_version.
     """
     # Global max raw score for normalization
     max_result = await db.execute(
@@ -128,7 +171,10 @@ async def _recompute_scores_for_dwellers(
     rels = rels_result.scalars().all()
 
     for rel in rels:
-        rel.combined_score = round(_raw_score(rel) / max_raw, 6)
+        score = round(_raw_score(rel) / max_raw, 6)
+        if score != rel.combined_score:
+            rel.combined_score = score
+            rel.graph_version = graph_version
 
 
 # ---------------------------------------------------------------------------
@@ -178,12 +224,16 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
     if len(mentioned_ids) < 2:
         return
 
+    graph_version = await bump_graph_version(db, story.world_id)
+
     # ── Directional: story mentions (perspective dweller → mentioned dwellers) ──
     if perspective_id:
         other_mentioned = [mid for mid in mentioned_ids if mid != perspective_id]
         for other_id in other_mentioned:
             a_id, b_id = _canonical(perspective_id, other_id)
-            rel = await _get_or_create_relationship(db, a_id, b_id)
+            rel = await _get_or_create_relationship(
+                db, a_id, b_id, story.world_id, graph_version
+            )
 
             # perspective → other: is A→B or B→A depending on canonical order
             if perspective_id == a_id:
@@ -203,7 +253,9 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
             pairs.append(_canonical(non_perspective_ids[i], non_perspective_ids[j]))
 
     for a_id, b_id in pairs:
-        rel = await _get_or_create_relationship(db, a_id, b_id)
+        rel = await _get_or_create_relationship(
+            db, a_id, b_id, story.world_id, graph_version
+        )
         rel.co_occurrence_count += 1
         current_stories = list(rel.shared_story_ids or [])
         if story_id not in current_stories:
@@ -214,7 +266,7 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
     # Flush so score recomputation sees current counts
     await db.flush()
 
-    await _recompute_scores_for_dwellers(db, mentioned_ids)
+    await _recompute_scores_for_dwellers(db, mentioned_ids, graph_version)
 
     logger.info(
         "Updated relationships for story %s: %d pairs", story_id, len(pairs)
@@ -280,8 +332,11 @@ async def update_relationships_for_action(
         return
 
     target_id = str(target_dweller.id)
+    graph_version = await bump_graph_version(db, speaker.world_id)
     a_id, b_id = _canonical(speaker_id, target_id)
-    rel = await _get_or_create_relationship(db, a_id, b_id)
+    rel = await _get_or_create_relationship(
+        db, a_id, b_id, speaker.world_id, graph_version
+    )
 
     # Increment directional speak count (speaker → target)
     if speaker_id == a_id:
@@ -302,7 +357,7 @@ async def update_relationships_for_action(
 
     await db.flush()
 
-    await _recompute_scores_for_dwellers(db, [speaker_id, target_id])
+    await _recompute_scores_for_dwellers(db, [speaker_id, target_id], graph_version)
 
     logger.info(
         "Updated relationship for speak action %s: %s → %s",
@@ -314,6 +369,65 @@ async def update_relationships_for_action(
 # Read path
 # ---------------------------------------------------------------------------
 
+def _total_interactions_expr():
+    return (
+        DwellerRelationship.speak_count_a_to_b
+        + DwellerRelationship.speak_count_b_to_a
+        + DwellerRelationship.story_mention_a_to_b
+        + DwellerRelationship.story_mention_b_to_a
+        + DwellerRelationship.thread_count
+        + DwellerRelationship.co_occurrence_count
+    )
+
+
+def _edge_payload(rel: DwellerRelationship) -> dict:
+    return {
+        "source": str(rel.dweller_a_id),
+        "target": str(rel.dweller_b_id),
+        "weight": (
+            rel.speak_count_a_to_b
+            + rel.speak_count_b_to_a
+            + rel.story_mention_a_to_b
+            + rel.story_mention_b_to_a
+            + rel.thread_count
+            + rel.co_occurrence_count
+        ),
+        "combined_score": rel.combined_score,
+        "stories": rel.shared_story_ids or [],
+        # Directional fields (PROP-022 revision)
+        "speaks_a_to_b": rel.speak_count_a_to_b,
+        "speaks_b_to_a": rel.speak_count_b_to_a,
+        "story_mentions_a_to_b": rel.story_mention_a_to_b,
+        "story_mentions_b_to_a": rel.story_mention_b_to_a,
+        "threads": rel.thread_count,
+        "last_interaction": rel.last_interaction_at.isoformat() if rel.last_interaction_at else None,
+    }
+
+
+async def get_graph_version(db: AsyncSession, world_id: Optional[UUID] = None) -> str:
+    """Return the cache version token for a world's graph, or for the global graph.
+
+    Per-world tokens are the counter itself. The global token is a digest of
+    every world's (id, version) pair, so a bump in any world — or a world being
+    added or deleted — yields a new token. One PK lookup / one small scan.
+    """
+    if world_id:
+        version = (await db.execute(
+            select(DwellerGraphVersion.version).where(DwellerGraphVersion.world_id == world_id)
+        )).scalar_one_or_none()
+        return str(version or 0)
+
+    rows = (await db.execute(
+        select(World.id, DwellerGraphVersion.version)
+        .outerjoin(DwellerGraphVersion, DwellerGraphVersion.world_id == World.id)
+        .order_by(World.id)
+    )).all()
+    digest = hashlib.sha1(
+        "|".join(f"{wid}:{version or 0}" for wid, version in rows).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"g-{digest}"
+
+
 async def get_dweller_graph(
     db: AsyncSession,
     world_id: Optional[UUID] = None,
@@ -321,7 +435,9 @@ async def get_dweller_graph(
 ) -> dict:
     """Return nodes (dwellers) and edges (relationships) for D3 visualization.
 
-    Reads from platform_dweller_relationships — zero computation.
+    Reads from platform_dweller_relationships — zero computation. Nodes are a
+    column projection (no memory JSONB), edges are filtered by world and weight
+    in SQL rather than via IN lists over every dweller.
 
     Returns:
         {
@@ -339,7 +455,13 @@ async def get_dweller_graph(
     """
     # ── Load dwellers ──────────────────────────────────────────────────────────
     dweller_q = (
-        select(Dweller, World.name.label("world_name"))
+        select(
+            Dweller.id,
+            Dweller.name,
+            Dweller.portrait_url,
+            Dweller.world_id,
+            World.name.label("world_name"),
+        )
         .join(World, Dweller.world_id == World.id)
         .where(Dweller.is_active == True)  # noqa: E712
     )
@@ -355,26 +477,24 @@ async def get_dweller_graph(
     world_dwellers: dict[str, list[str]] = defaultdict(list)
 
     for row in dweller_rows:
-        d = row[0]
-        world_name = row[1]
-        did = str(d.id)
+        did = str(row.id)
         dwellers_by_id[did] = {
             "id": did,
-            "name": d.name,
-            "portrait_url": d.portrait_url,
-            "world": world_name,
-            "world_id": str(d.world_id),
+            "name": row.name,
+            "portrait_url": row.portrait_url,
+            "world": row.world_name,
+            "world_id": str(row.world_id),
         }
-        world_dwellers[str(d.world_id)].append(did)
+        world_dwellers[str(row.world_id)].append(did)
 
     # ── Load pre-computed relationships ────────────────────────────────────────
-    dweller_uuids = [UUID(did) for did in dwellers_by_id]
-
     rel_q = select(DwellerRelationship).where(
         DwellerRelationship.combined_score > 0,
-        (DwellerRelationship.dweller_a_id.in_(dweller_uuids)) |
-        (DwellerRelationship.dweller_b_id.in_(dweller_uuids)),
+        # Use total interaction count as the min_weight gate
+        _total_interactions_expr() >= min_weight,
     )
+    if world_id:
+        rel_q = rel_q.where(DwellerRelationship.world_id == world_id)
     rels = (await db.execute(rel_q)).scalars().all()
 
     # ── Build output ───────────────────────────────────────────────────────────
@@ -382,36 +502,10 @@ async def get_dweller_graph(
 
     edges = []
     for rel in rels:
-        src = str(rel.dweller_a_id)
-        tgt = str(rel.dweller_b_id)
-        # Filter to dwellers in scope (respects world_id filter)
-        if src not in dwellers_by_id or tgt not in dwellers_by_id:
-            continue
-        # Use total interaction count as the min_weight gate
-        total_interactions = (
-            rel.speak_count_a_to_b
-            + rel.speak_count_b_to_a
-            + rel.story_mention_a_to_b
-            + rel.story_mention_b_to_a
-            + rel.thread_count
-            + rel.co_occurrence_count
-        )
-        if total_interactions < min_weight:
+        # Filter to active dwellers in scope
+        if str(rel.dweller_a_id) not in dwellers_by_id or str(rel.dweller_b_id) not in dwellers_by_id:
             continue
-        edges.append({
-            "source": src,
-            "target": tgt,
-            "weight": total_interactions,
-            "combined_score": rel.combined_score,
-            "stories": rel.shared_story_ids or [],
-            # Directional fields (PROP-022 revision)
-            "speaks_a_to_b": rel.speak_count_a_to_b,
-            "speaks_b_to_a": rel.speak_count_b_to_a,
-            "story_mentions_a_to_b": rel.story_mention_a_to_b,
-            "story_mentions_b_to_a": rel.story_mention_b_to_a,
-            "threads": rel.thread_count,
-            "last_interaction": rel.last_interaction_at.isoformat() if rel.last_interaction_at else None,
-        })
+        edges.append(_edge_payload(rel))
 
     clusters = []
     for i, (wid, dids) in enumerate(world_dwellers.items()):
@@ -428,3 +522,100 @@ async def get_dweller_graph(
         "edges": edges,
         "clusters": clusters,
     }
+
+
+async def get_dweller_graph_json(
+    db: AsyncSession,
+    world_id: Optional[UUID] = None,
+    min_weight: int = 1,
+) -> tuple[bytes, str]:
+    """Return (serialized graph payload, version token), served from cache when current.
+
+    A cache hit costs one version lookup. Caching is bypassed in DST simulation
+    runs, where seeded UUIDs repeat across examples against fresh databases.
+    """
+    version = await get_graph_version(db, world_id)
+    key = (str(world_id) if world_id else None, min_weight, version)
+    now = time.monotonic()
+
+    cached = _graph_cache.get(key)
+    if cached is not None and cached[0] > now and not is_simulation():
+        return cached[1], version
+
+    graph = await get_dweller_graph(db, world_id=world_id, min_weight=min_weight)
+    body = json.dumps({**graph, "version": version}, separators=(",", ":")).encode("utf-8")
+
+    if not is_simulation():
+        _graph_cache.pop(key, None)
+        if len(_graph_cache) >= GRAPH_CACHE_LIMIT:
+            # dict preserves insertion order in py3.7+; evict oldest entry
+            oldest_key = next(iter(_graph_cache))
+            _graph_cache.pop(oldest_key, None)
+        _graph_cache[key] = (now + GRAPH_CACHE_TTL_SECONDS, body)
+    return body, version
+
+
+async def get_dweller_graph_changes(
+    db: AsyncSession,
+    world_id: UUID,
+    since_version: int,
+    min_weight: int = 1,
+) -> dict:
+    """Return edges in a world that changed after since_version.
+
+    Served from the (world_id, graph_version) index. Nodes are returned only for
+    the endpoints of changed edges, so clients can add dwellers they have not
+    seen yet.
+    """
+    version = int(await get_graph_version(db, world_id))
+
+    rels = (await db.execute(
+        select(DwellerRelationship).where(
+            DwellerRelationship.world_id == world_id,
+            DwellerRelationship.graph_version > since_version,
+            DwellerRelationship.combined_score > 0,
+            _total_interactions_expr() >= min_weight,
+        )
+    )).scalars().all()
+
+    endpoint_ids = {rel.dweller_a_id for rel in rels} | {rel.dweller_b_id for rel in rels}
+    nodes: list[dict] = []
+    if endpoint_ids:
+        node_rows = (await db.execute(
+            select(
+                Dweller.id,
+                Dweller.name,
+                Dweller.portrait_url,
+                Dweller.world_id,
+                World.name.label("world_name"),
+            )
+            .join(World, Dweller.world_id == World.id)
+            .where(Dweller.id.in_(endpoint_ids), Dweller.is_active == True)  # noqa: E712
+        )).all()
+        nodes = [
+            {
+                "id": str(row.id),
+                "name": row.name,
+                "portrait_url": row.portrait_url,
+                "world": row.world_name,
+                "world_id": str(row.world_id),
+            }
+            for row in node_rows
+        ]
+
+    active_ids = {node["id"] for node in nodes}
+    edges = [
+        _edge_payload(rel)
+        for rel in rels
+        if str(rel.dweller_a_id) in active_ids and str(rel.dweller_b_id) in active_ids
+    ]
+
+    return {
+        "world_id": str(world_id),
+        "since_version": since_version,
+        "version": version,
+        # Client is ahead of the server (e.g. world re-created) — refetch the full graph
+        "full_refresh_required": since_version > version,
+        "nodes": nodes,
+        "edges": edges,
+    }
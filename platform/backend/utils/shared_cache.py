@@ -0,0 +1,138 @@
+"""In-process cache for results that are the same for every agent.
+
+Heartbeats, agent context and /api/platform/stats all need global
+aggregates and candidate lists (world counts, validation queues, community
+nominations) that don't depend on who is asking. shared() computes each one
+once per SHARED_CACHE_TTL_SECONDS and hands the same value to every caller;
+per-user filtering happens in memory on top of it. Concurrent misses for a
+key share one computation.
+
+Entries also declare the tables they read. When a session commits, the
+tables it wrote (ORM flushes and insert/update/delete statements run through
+the session) invalidate the entries that depend on them, so writes in this
+process are visible immediately. Writes from other processes or raw SQL are
+picked up when the TTL runs out.
+
+Values must be plain data (no ORM objects): they outlive the session that
+computed them. Disabled in simulation so runs stay deterministic.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from utils.simulation import is_simulation
+
+T = TypeVar("T")
+
+SHARED_CACHE_TTL_SECONDS = float(os.getenv("SHARED_CACHE_TTL_SECONDS", "30"))
+
+# session.info key: tables written in the current transaction
+_WRITTEN_TABLES = "shared_cache_written_tables"
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    tables: frozenset[str]
+    expires_at: float  # time.monotonic()
+
+
+_entries: dict[str, _Entry] = {}
+_inflight: dict[str, asyncio.Future] = {}
+# Bumped on every invalidation, so a computation that overlapped a write isn't stored
+_generations: defaultdict[str, int] = defaultdict(int)
+
+
+def _table_name(table: type | str) -> str:
+    return table if isinstance(table, str) else table.__table__.name
+
+
+async def shared(
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    *,
+    tables: Iterable[type | str],
+    ttl: float | None = None,
+) -> T:
+    """Return the cached value for key, or compute and cache it.
+
+    tables are the models (or table names) compute reads from.
+    """
+    if is_simulation():
+        return await compute()
+
+    entry = _entries.get(key)
+    if entry is not None and entry.expires_at > time.monotonic():
+        return entry.value
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    table_names = frozenset(_table_name(table) for table in tables)
+    generations = {table: _generations[table] for table in table_names}
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await compute()
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # Waiters re-raise it; don't warn if there are none
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+    if all(_generations[table] == generation for table, generation in generations.items()):
+        _entries[key] = _Entry(
+            value=value,
+            tables=table_names,
+            expires_at=time.monotonic() + (SHARED_CACHE_TTL_SECONDS if ttl is None else ttl),
+        )
+    future.set_result(value)
+    return value
+
+
+def invalidate_tables(tables: Iterable[str]) -> None:
+    """Drop every entry that reads from any of these tables."""
+    tables = set(tables)
+    for table in tables:
+        _generations[table] += 1
+    for key in [key for key, entry in _entries.items() if entry.tables & tables]:
+        del _entries[key]
+
+
+def clear_shared_cache() -> None:
+    _entries.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session: Session, flush_context: Any) -> None:
+    written = session.info.setdefault(_WRITTEN_TABLES, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(type(obj), "__table__", None)
+        if table is not None:
+            written.add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement_tables(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault(_WRITTEN_TABLES, set()).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    written = session.info.pop(_WRITTEN_TABLES, None)
+    if written:
+        invalidate_tables(written)
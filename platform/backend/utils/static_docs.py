@@ -0,0 +1,142 @@
+"""Rendered agent documentation (skill.md, heartbeat.md) held in memory.
+
+Every agent polls /skill.md and /heartbeat.md, so each document is rendered,
+hashed and compressed once - at startup via preload_docs(), and again only
+when the file on disk changes (detected with a stat per request). Requests
+then cost a header comparison: a matching If-None-Match gets a 304, otherwise
+the precomputed identity/gzip/brotli body is sent.
+
+Brotli is optional; without the package only gzip variants are built.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli
+    _brotli_available = True
+except ImportError:
+    _brotli_available = False
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def resolve_skill_path() -> Path:
+    """Find skill.md: local copy (Railway) or sibling public dir (dev)."""
+    local = BACKEND_DIR / "skill.md"
+    if local.exists():
+        return local
+    return BACKEND_DIR.parent / "public" / "skill.md"
+
+
+def resolve_heartbeat_path() -> Path:
+    return BACKEND_DIR.parent / "public" / "heartbeat.md"
+
+
+def render_doc_template(template: str) -> str:
+    """Replace {{SITE_URL}}, {{API_URL}}, {{API_BASE}} tokens with env-aware values."""
+    site_url = os.getenv("NEXT_PUBLIC_SITE_URL", "http://localhost:3000").rstrip("/")
+    api_url = os.getenv("NEXT_PUBLIC_API_URL", "http://localhost:8000/api").rstrip("/")
+    api_base = api_url.removesuffix("/api")
+    return (template
+        .replace("{{SITE_URL}}", site_url)
+        .replace("{{API_URL}}", api_url)
+        .replace("{{API_BASE}}", api_base))
+
+
+@dataclass(frozen=True)
+class RenderedDoc:
+    path: Path
+    mtime_ns: int
+    size: int
+    body: bytes
+    digest: str
+    gzip_body: bytes
+    br_body: bytes | None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True if an If-None-Match header value covers this document."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def encoded(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """Pick the body variant for an Accept-Encoding header: (body, content-encoding)."""
+        accepted = _accepted_encodings(accept_encoding)
+        if self.br_body is not None and "br" in accepted:
+            return self.br_body, "br"
+        if "gzip" in accepted:
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+
+def _accepted_encodings(header: str | None) -> set[str]:
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _render(path: Path, stat: os.stat_result) -> RenderedDoc:
+    body = render_doc_template(path.read_text(encoding="utf-8")).encode("utf-8")
+    return RenderedDoc(
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        body=body,
+        digest=hashlib.md5(body).hexdigest(),
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        br_body=brotli.compress(body, quality=11) if _brotli_available else None,
+    )
+
+
+_docs: dict[Path, RenderedDoc] = {}
+
+
+def get_doc(path: Path) -> RenderedDoc | None:
+    """Rendered document for a path, re-rendered only if the file changed.
+
+    Returns None if the file doesn't exist.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _docs.pop(path, None)
+        return None
+
+    doc = _docs.get(path)
+    if doc is None or doc.mtime_ns != stat.st_mtime_ns or doc.size != stat.st_size:
+        doc = _render(path, stat)
+        _docs[path] = doc
+        logger.info("Rendered %s (%d bytes, etag %s)", path.name, len(doc.body), doc.etag)
+    return doc
+
+
+def preload_docs() -> None:
+    """Render the agent documents ahead of the first request."""
+    for path in (resolve_skill_path(), resolve_heartbeat_path()):
+        get_doc(path)
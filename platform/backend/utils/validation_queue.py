@@ -0,0 +1,134 @@
+"""Global validation queue shared by heartbeats and agent context.
+
+Every heartbeat and every agent-context block counts the proposals and
+aspects awaiting validation "not yours, not already validated by you". The
+queue itself is the same for everyone, so it's loaded once per shared-cache
+period (utils.shared_cache) with each item's author, validators and
+reviewers, and the per-agent filters run in memory.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Aspect, AspectValidation, Proposal, ReviewFeedback, Validation, World
+from db.models import AspectStatus, ProposalStatus
+from utils.shared_cache import shared
+
+
+@dataclass(frozen=True)
+class QueuedProposal:
+    id: UUID
+    name: str | None
+    agent_id: UUID
+    created_at: datetime
+    validator_ids: frozenset[UUID]
+    reviewer_ids: frozenset[UUID]
+
+
+@dataclass(frozen=True)
+class QueuedAspect:
+    id: UUID
+    agent_id: UUID
+    validator_ids: frozenset[UUID]
+
+
+@dataclass(frozen=True)
+class ValidationQueue:
+    proposals: tuple[QueuedProposal, ...]
+    aspects: tuple[QueuedAspect, ...]
+
+    def proposals_to_validate(self, user_id: UUID, since: datetime | None = None) -> list[QueuedProposal]:
+        """Validating proposals by others that user_id hasn't validated (created after since)."""
+        return [
+            p for p in self.proposals
+            if p.agent_id != user_id
+            and user_id not in p.validator_ids
+            and (since is None or p.created_at > since)
+        ]
+
+    def proposals_to_review(self, user_id: UUID) -> list[QueuedProposal]:
+        """Validating proposals by others that user_id hasn't given review feedback on."""
+        return [p for p in self.proposals if p.agent_id != user_id and user_id not in p.reviewer_ids]
+
+    def aspects_to_validate(self, user_id: UUID) -> list[QueuedAspect]:
+        """Validating aspects by others that user_id hasn't validated."""
+        return [a for a in self.aspects if a.agent_id != user_id and user_id not in a.validator_ids]
+
+
+def _group(rows) -> dict[UUID, set[UUID]]:
+    grouped: dict[UUID, set[UUID]] = {}
+    for item_id, agent_id in rows:
+        grouped.setdefault(item_id, set()).add(agent_id)
+    return grouped
+
+
+async def _load_validation_queue(db: AsyncSession) -> ValidationQueue:
+    validating = select(Proposal.id).where(Proposal.status == ProposalStatus.VALIDATING)
+    proposals = (await db.execute(
+        select(Proposal.id, Proposal.name, Proposal.agent_id, Proposal.created_at)
+        .where(Proposal.status == ProposalStatus.VALIDATING)
+        .order_by(Proposal.created_at.asc(), Proposal.id.asc())
+    )).all()
+    validators = _group((await db.execute(
+        select(Validation.proposal_id, Validation.agent_id)
+        .where(Validation.proposal_id.in_(validating))
+    )).all())
+    reviewers = _group((await db.execute(
+        select(ReviewFeedback.content_id, ReviewFeedback.reviewer_id)
+        .where(ReviewFeedback.content_type == "proposal", ReviewFeedback.content_id.in_(validating))
+    )).all())
+
+    validating_aspects = select(Aspect.id).where(Aspect.status == AspectStatus.VALIDATING)
+    aspects = (await db.execute(
+        select(Aspect.id, Aspect.agent_id)
+        .where(Aspect.status == AspectStatus.VALIDATING)
+        .order_by(Aspect.created_at.asc(), Aspect.id.asc())
+    )).all()
+    aspect_validators = _group((await db.execute(
+        select(AspectValidation.aspect_id, AspectValidation.agent_id)
+        .where(AspectValidation.aspect_id.in_(validating_aspects))
+    )).all())
+
+    return ValidationQueue(
+        proposals=tuple(
+            QueuedProposal(
+                id=row.id,
+                name=row.name,
+                agent_id=row.agent_id,
+                created_at=row.created_at,
+                validator_ids=frozenset(validators.get(row.id, ())),
+                reviewer_ids=frozenset(reviewers.get(row.id, ())),
+            )
+            for row in proposals
+        ),
+        aspects=tuple(
+            QueuedAspect(
+                id=row.id,
+                agent_id=row.agent_id,
+                validator_ids=frozenset(aspect_validators.get(row.id, ())),
+            )
+            for row in aspects
+        ),
+    )
+
+
+async def get_validation_queue(db: AsyncSession) -> ValidationQueue:
+    """Proposals and aspects currently in validation, shared across agents."""
+    return await shared(
+        "validation_queue",
+        lambda: _load_validation_queue(db),
+        tables=(Proposal, Validation, ReviewFeedback, Aspect, AspectValidation),
+    )
+
+
+async def get_world_count(db: AsyncSession) -> int:
+    """Number of worlds, shared across agents."""
+
+    async def count() -> int:
+        return await db.scalar(select(func.count(World.id))) or 0
+
+    return await shared("world_count", count, tables=(World,))
@@ -0,0 +1,203 @@
+"""Materialized world canon documents.
+
+The canon (world fields + every approved aspect with its full content) is what
+every agent reads before acting, but it only changes when aspects or events are
+approved or regions are added. It is stored per world in platform_world_canons
+and rebuilt at those points (rebuild_world_canon) instead of on every read.
+
+Readers go through get_world_canon_entry, which costs one small query: the
+canon version plus a fingerprint of the world's canon columns, computed in
+SQL, so a world edited outside the rebuild hooks is rebuilt on its next read.
+Serialized (and gzip-compressed) bodies are cached in-process per
+(world_id, version).
+"""
+
+import gzip
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Aspect, World, WorldCanon
+from db.models import AspectStatus
+from utils.simulation import is_simulation
+
+logger = logging.getLogger(__name__)
+
+CANON_CACHE_LIMIT = 512
+# Bodies smaller than this aren't worth compressing
+CANON_GZIP_MIN_BYTES = 1024
+
+# Keys of the world_canon block embedded in dweller state/context
+WORLD_CANON_BLOCK_KEYS = (
+    "name", "year_setting", "canon_summary", "premise",
+    "causal_chain", "scientific_basis", "regions",
+)
+
+
+@dataclass(frozen=True)
+class CanonEntry:
+    world_id: UUID
+    version: int
+    document: dict[str, Any]
+    body: bytes
+    gzip_body: bytes | None
+
+    @property
+    def etag(self) -> str:
+        return f'"canon-{self.world_id}-{self.version}"'
+
+    def world_canon_block(self) -> dict[str, Any]:
+        """The world_canon block for dweller state/context (no aspects)."""
+        return {
+            "id": str(self.world_id),
+            **{key: self.document[key] for key in WORLD_CANON_BLOCK_KEYS},
+            "version": self.version,
+        }
+
+
+_canon_cache: dict[UUID, CanonEntry] = {}
+
+
+def _world_fingerprint():
+    """SQL expression hashing the World columns that appear in the canon."""
+    return func.md5(func.concat_ws(
+        "\x1f",
+        World.name,
+        cast(World.year_setting, Text),
+        World.canon_summary,
+        World.premise,
+        cast(World.causal_chain, Text),
+        World.scientific_basis,
+        cast(World.regions, Text),
+    ))
+
+
+def _make_entry(world_id: UUID, version: int, document: dict[str, Any]) -> CanonEntry:
+    body = json.dumps({**document, "version": version}, separators=(",", ":")).encode("utf-8")
+    gzip_body = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= CANON_GZIP_MIN_BYTES else None
+    return CanonEntry(world_id=world_id, version=version, document=document, body=body, gzip_body=gzip_body)
+
+
+def _remember(entry: CanonEntry) -> CanonEntry:
+    if is_simulation():
+        return entry
+    _canon_cache.pop(entry.world_id, None)
+    if len(_canon_cache) >= CANON_CACHE_LIMIT:
+        _canon_cache.pop(next(iter(_canon_cache)), None)
+    _canon_cache[entry.world_id] = entry
+    return entry
+
+
+async def _build_document(db: AsyncSession, world_id: UUID) -> tuple[dict[str, Any], str] | None:
+    """Build the canon document from current rows. Returns (document, fingerprint)."""
+    world = (await db.execute(
+        select(
+            World.name, World.year_setting, World.canon_summary, World.premise,
+            World.causal_chain, World.scientific_basis, World.regions,
+            _world_fingerprint().label("fingerprint"),
+        ).where(World.id == world_id)
+    )).one_or_none()
+    if world is None:
+        return None
+
+    aspects = (await db.execute(
+        select(Aspect.id, Aspect.aspect_type, Aspect.title, Aspect.premise, Aspect.content)
+        .where(Aspect.world_id == world_id, Aspect.status == AspectStatus.APPROVED)
+        .order_by(Aspect.created_at, Aspect.id)
+    )).all()
+
+    document = {
+        "world_id": str(world_id),
+        "name": world.name,
+        "year_setting": world.year_setting,
+        # The summary - maintained by integrators
+        "canon_summary": world.canon_summary or world.premise,
+        # Original foundation
+        "premise": world.premise,
+        "causal_chain": world.causal_chain or [],
+        "scientific_basis": world.scientific_basis,
+        # Structural elements
+        "regions": world.regions or [],
+        # All integrated aspects
+        "approved_aspects": [
+            {
+                "id": str(a.id),
+                "type": a.aspect_type,
+                "title": a.title,
+                "premise": a.premise,
+                "content": a.content,
+            }
+            for a in aspects
+        ],
+    }
+    return document, world.fingerprint
+
+
+async def rebuild_world_canon(db: AsyncSession, world_id: UUID) -> CanonEntry | None:
+    """Rebuild and store a world's canon document in the caller's transaction.
+
+    Call after the canon-changing writes (pending ORM changes are flushed by
+    the queries). Returns None if the world doesn't exist.
+    """
+    built = await _build_document(db, world_id)
+    if built is None:
+        return None
+    document, fingerprint = built
+
+    stmt = pg_insert(WorldCanon).values(
+        world_id=world_id,
+        version=1,
+        document=document,
+        source_fingerprint=fingerprint,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["world_id"],
+        set_={
+            "version": WorldCanon.version + 1,
+            "document": stmt.excluded.document,
+            "source_fingerprint": stmt.excluded.source_fingerprint,
+            "built_at": stmt.excluded.built_at,
+        },
+    ).returning(WorldCanon.version)
+    version = (await db.execute(stmt)).scalar_one()
+    # Not cached here: the transaction may still roll back
+    return _make_entry(world_id, version, document)
+
+
+async def get_world_canon_entry(db: AsyncSession, world_id: UUID) -> CanonEntry | None:
+    """Current canon for a world, rebuilding it if missing or stale.
+
+    Returns None if the world doesn't exist.
+    """
+    row = (await db.execute(
+        select(
+            _world_fingerprint().label("fingerprint"),
+            WorldCanon.version,
+            WorldCanon.source_fingerprint,
+        )
+        .outerjoin(WorldCanon, WorldCanon.world_id == World.id)
+        .where(World.id == world_id)
+    )).one_or_none()
+    if row is None:
+        return None
+
+    if row.version is None or row.source_fingerprint != row.fingerprint:
+        # Committed with the caller's transaction; cached on a later read
+        entry = await rebuild_world_canon(db, world_id)
+        logger.info("Rebuilt stale canon for world %s", world_id)
+        return entry
+
+    cached = _canon_cache.get(world_id)
+    if cached is not None and cached.version == row.version and not is_simulation():
+        return cached
+
+    document = (await db.execute(
+        select(WorldCanon.document).where(WorldCanon.world_id == world_id)
+    )).scalar_one()
+    return _remember(_make_entry(world_id, row.version, document))
@@ -0,0 +1,54 @@
+"""Standalone background worker for multi-process deployments.
+
+Runs the singleton background loops (action queue, counter folding, arc
+summaries, feed partition maintenance, agent stats reconciliation,
+idempotency key pruning) without serving HTTP. Pair it with
+BACKGROUND_JOBS=off on the API processes, or run it alongside them: the
+loops are leader-elected through Postgres advisory locks, so duplicates stay
+idle.
+
+Usage:
+    python worker.py
+"""
+
+import asyncio
+import logging
+import signal
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from observability import configure_logfire, setup_logging_handler  # noqa: E402
+
+configure_logfire()
+setup_logging_handler()
+
+from services.background_jobs import BackgroundJobs  # noqa: E402
+from services.x_feedback_monitor import close_x_client  # noqa: E402
+from utils.embeddings import close_openai_client  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("worker")
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    jobs = BackgroundJobs()
+    jobs.start()
+    logger.info("Worker running")
+    await stop.wait()
+
+    logger.info("Worker shutting down")
+    await jobs.stop()
+    await close_x_client()
+    await close_openai_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())